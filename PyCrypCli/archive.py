@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import hashlib
+import shutil
+import zipfile
+from pathlib import Path
+from tempfile import SpooledTemporaryFile
+from types import TracebackType
+from typing import Iterable, Iterator, Type
+
+from pydantic import BaseModel
+
+from .exceptions import SnapshotAlreadyExistsError, SnapshotNotFoundError
+from .models import File
+
+SNAPSHOT_PREFIX = "snapshots/"
+BLOB_PREFIX = "blobs/"
+
+# size in bytes up to which the index of a snapshot is buffered in memory before it is moved to a temporary file
+INDEX_BUFFER_SIZE = 1 << 20
+
+
+class SnapshotEntry(BaseModel):
+    path: str
+    is_directory: bool
+    blob: str | None
+
+
+# file contents are stored once under their sha256 hash, the index of a snapshot lists its files breadth first
+class SnapshotArchive:
+    def __init__(self, path: Path, write: bool = False):
+        self.zip: zipfile.ZipFile = zipfile.ZipFile(path, "a" if write else "r", compression=zipfile.ZIP_DEFLATED)
+        self.blobs: set[str] = set()
+        self.snapshots: list[str] = []
+        for name in self.zip.namelist():
+            if name.startswith(BLOB_PREFIX):
+                self.blobs.add(name.removeprefix(BLOB_PREFIX))
+            elif name.startswith(SNAPSHOT_PREFIX):
+                self.snapshots.append(name.removeprefix(SNAPSHOT_PREFIX))
+
+    def __enter__(self) -> SnapshotArchive:
+        return self
+
+    def __exit__(
+        self, exc_type: Type[BaseException] | None, exc_val: BaseException | None, exc_tb: TracebackType | None
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.zip.close()
+
+    # returns the number of files and of newly stored blobs
+    def export(self, name: str, files: Iterable[tuple[str, File]]) -> tuple[int, int]:
+        if name in self.snapshots:
+            raise SnapshotAlreadyExistsError(name)
+
+        count: int = 0
+        new_blobs: int = 0
+        with SpooledTemporaryFile(max_size=INDEX_BUFFER_SIZE) as index:
+            for path, file in files:
+                blob: str | None = None
+                if not file.is_directory:
+                    content: bytes = file.content.encode()
+                    blob = hashlib.sha256(content).hexdigest()
+                    if blob not in self.blobs:
+                        self.zip.writestr(BLOB_PREFIX + blob, content)
+                        self.blobs.add(blob)
+                        new_blobs += 1
+
+                index.write(SnapshotEntry(path=path, is_directory=file.is_directory, blob=blob).json().encode() + b"\n")
+                count += 1
+
+            # zip archives cannot be written to while another member is open, so the index is added at the end
+            index.seek(0)
+            with self.zip.open(SNAPSHOT_PREFIX + name, "w") as member:
+                shutil.copyfileobj(index, member)
+
+        self.snapshots.append(name)
+        return count, new_blobs
+
+    def read(self, name: str) -> Iterator[SnapshotEntry]:
+        if name not in self.snapshots:
+            raise SnapshotNotFoundError(name)
+
+        with self.zip.open(SNAPSHOT_PREFIX + name) as index:
+            for line in index:
+                yield SnapshotEntry.parse_raw(line)
+
+    def read_content(self, blob: str) -> str:
+        return self.zip.read(BLOB_PREFIX + blob).decode()
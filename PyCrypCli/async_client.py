@@ -0,0 +1,78 @@
+import asyncio
+from typing import Any
+
+from .client import Client
+from .exceptions import InvalidServerResponseError, LoggedOutError, PermissionDeniedError
+from .models import HardwareConfig, StatusResponse, InfoResponse, TokenResponse
+
+
+# requests are awaited via the futures resolved by the reader thread, only connecting and closing use a worker thread
+class AsyncClient:
+    def __init__(self, server: str):
+        self.client: Client = Client(server)
+
+    @property
+    def logged_in(self) -> bool:
+        return self.client.logged_in
+
+    async def _request(self, data: dict[str, Any]) -> dict[str, Any]:
+        if self.client.websocket is None:
+            raise ConnectionError
+
+        # shielded, so cancelling the coroutine (e.g. by a timeout) never cancels the future the reader resolves
+        return await asyncio.shield(asyncio.wrap_future(self.client.submit(data)))
+
+    async def ms(self, ms: str, endpoint: list[str], *, retry: int = 0, **data: Any) -> dict[str, Any]:
+        while True:
+            response_data: dict[str, Any] = await asyncio.wrap_future(self.client.ms_submit(ms, endpoint, **data))
+            if response_data or not retry:
+                return response_data
+            retry -= 1
+
+    async def close(self) -> None:
+        await asyncio.to_thread(self.client.close)
+
+    async def register(self, username: str, password: str) -> TokenResponse:
+        return await asyncio.to_thread(self.client.register, username, password)
+
+    async def login(self, username: str, password: str) -> TokenResponse:
+        return await asyncio.to_thread(self.client.login, username, password)
+
+    async def session(self, token: str) -> TokenResponse:
+        return await asyncio.to_thread(self.client.session, token)
+
+    async def change_password(self, old_password: str, new_password: str) -> TokenResponse:
+        if not self.client.logged_in:
+            raise LoggedOutError
+
+        response: dict[str, Any] = await self._request(
+            {"action": "password", "password": old_password, "new": new_password}
+        )
+        if "error" in response:
+            error: str = response["error"]
+            if error == "permissions denied":
+                raise PermissionDeniedError
+            raise InvalidServerResponseError(response)
+
+        return TokenResponse.parse(self.client, response)
+
+    async def logout(self) -> None:
+        await asyncio.to_thread(self.client.logout)
+
+    async def status(self) -> StatusResponse:
+        return await asyncio.to_thread(self.client.status)
+
+    async def info(self) -> InfoResponse:
+        if not self.client.logged_in:
+            raise LoggedOutError
+
+        response: dict[str, Any] = await self._request({"action": "info"})
+        if "error" in response:
+            raise InvalidServerResponseError(response)
+        return InfoResponse.parse(self.client, response)
+
+    async def delete_user(self) -> None:
+        await asyncio.to_thread(self.client.delete_user)
+
+    async def get_hardware_config(self) -> HardwareConfig:
+        return HardwareConfig.parse(self.client, await self.ms("device", ["hardware", "list"]))
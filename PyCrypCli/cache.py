@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Type, TypeVar, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .models import Model
+
+CachedModel = TypeVar("CachedModel", bound="Model")
+
+
+# cached objects are updated in place, so every holder of an object sees its latest state
+class EntityCache:
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize: int = maxsize
+        self.entries: OrderedDict[tuple[Type[Model], str], tuple[float, Model]] = OrderedDict()
+        self.lock: Lock = Lock()
+
+    def get(self, model: Type[CachedModel], uuid: str) -> CachedModel | None:
+        with self.lock:
+            entry: tuple[float, Model] | None = self.entries.get((model, uuid))
+            if entry is None:
+                return None
+
+            expires, obj = entry
+            if expires < time.monotonic():
+                del self.entries[(model, uuid)]
+                return None
+
+            self.entries.move_to_end((model, uuid))
+            return obj  # type: ignore
+
+    def put(self, obj: CachedModel) -> CachedModel:
+        uuid: Any = getattr(obj, "uuid", None)
+        if not obj.cache_ttl or not isinstance(uuid, str):
+            return obj
+
+        key: tuple[Type[Model], str] = (type(obj), uuid)
+        with self.lock:
+            if (entry := self.entries.get(key)) is not None and entry[1] is not obj:
+                obj = entry[1]._update(obj)  # type: ignore
+
+            self.entries[key] = time.monotonic() + obj.cache_ttl, obj
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+        return obj
+
+    def invalidate(self, model: Type[Model] | None = None, uuid: str | None = None) -> None:
+        with self.lock:
+            for key in list(self.entries):
+                if (model is None or issubclass(key[0], model)) and (uuid is None or key[1] == uuid):
+                    del self.entries[key]
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
@@ -1,8 +1,12 @@
+from __future__ import annotations
+
 import json
 import re
 import ssl
-import time
+from collections import deque
+from concurrent.futures import Future
 from os import getenv
+from threading import Lock
 from typing import Type, Any, cast
 from uuid import uuid4
 
@@ -23,11 +27,33 @@ from .exceptions import (
     LoggedOutError,
     ClientNotReadyError,
 )
-from .models import HardwareConfig, StatusResponse, InfoResponse, TokenResponse
+from .cache import EntityCache
+from .models import (
+    HardwareConfig,
+    StatusResponse,
+    InfoResponse,
+    TokenResponse,
+    Model,
+    Device,
+    File,
+    Service,
+    Network,
+    Wallet,
+)
+from .notifications import NotificationStream
+from .reader import Reader
 from .timer import Timer
 
 LOG_WS = bool(getenv("LOG_WS"))
 
+# model types whose cached objects are invalidated by notifications from the given microservice
+NOTIFICATION_INVALIDATES: dict[str, list[Type[Model]]] = {
+    "device": [Device, File],
+    "service": [Service],
+    "currency": [Wallet],
+    "network": [Network],
+}
+
 
 def uuid() -> str:
     return str(uuid4())
@@ -38,27 +64,43 @@ class Client:
         self.server: str = server
         self.websocket: WebSocket | None = None
         self.timer: Timer | None = None
-        self.waiting_for_response: bool = False
-        self.notifications: list[dict[str, Any]] = []
+        self.reader: Reader | None = None
+        self.notifications: NotificationStream = NotificationStream()
+        self.cache: EntityCache = EntityCache()
+        self.notifications.subscribe(self._invalidate_cache)
         self.logged_in: bool = False
 
+        self._send_lock: Lock = Lock()
+        self._pending_lock: Lock = Lock()
+        self._pending: dict[str, Future[dict[str, Any]]] = {}
+        self._pending_untagged: deque[Future[dict[str, Any]]] = deque()
+
     def init(self) -> None:
         try:
             self.websocket = create_connection(self.server)
         except ssl.SSLCertVerificationError:
             self.websocket = create_connection(self.server, sslopt={"cert_reqs": ssl.CERT_NONE})
         self.timer = Timer(10, self.info)
+        self.reader = Reader(self._recv, self._dispatch, self._fail_pending)
+        self.reader.start()
 
     def close(self) -> None:
         if self.timer:
             self.timer.stop()
             self.timer = None
 
+        if self.reader:
+            self.reader.stop()
+            self.reader = None
+
         if self.websocket:
             self.websocket.close()
             self.websocket = None
 
         self.logged_in = False
+        self.cache.clear()
+
+        self._fail_pending(ConnectionError("Client has been closed"))
 
     def _send(self, obj: dict[str, Any]) -> None:
         if not self.websocket:
@@ -80,36 +122,110 @@ class Client:
         sentry_sdk.add_breadcrumb(category="ws", message=f"recv: {data}", level="debug")
         return cast(dict[str, Any], json.loads(data))
 
-    def request(self, data: dict[str, Any], no_response: bool = False) -> dict[str, Any]:
+    # responses to tagged requests are matched by their tag, all others by the order of the requests
+    def submit(self, data: dict[str, Any]) -> Future[dict[str, Any]]:
         if self.websocket is None:
             raise ConnectionError
 
-        while self.waiting_for_response:
-            time.sleep(0.01)
-        self.waiting_for_response = True
+        future: Future[dict[str, Any]] = Future()
+        with self._send_lock:
+            with self._pending_lock:
+                # checked under the lock, so the reader either fails this future on exit or has already exited
+                if self.reader is None or not self.reader.running:
+                    raise ConnectionError("Connection has been lost")
+                if "tag" in data:
+                    self._pending[data["tag"]] = future
+                else:
+                    self._pending_untagged.append(future)
+
+            self._send(data)
+
+        return future
+
+    def _dispatch(self, frame: dict[str, Any]) -> None:
+        if "notify-id" in frame:
+            self.notifications.push(frame)
+            return
+
+        with self._pending_lock:
+            future: Future[dict[str, Any]] | None
+            if "tag" in frame:
+                future = self._pending.pop(frame["tag"], None)
+            elif self._pending_untagged:
+                future = self._pending_untagged.popleft()
+            else:
+                future = None
+
+        # the future may have been cancelled by a caller that is no longer interested in the response
+        if future is not None and future.set_running_or_notify_cancel():
+            future.set_result(frame)
+
+    def _invalidate_cache(self, notification: dict[str, Any]) -> None:
+        for model in NOTIFICATION_INVALIDATES.get(notification.get("origin", ""), []):
+            self.cache.invalidate(model)
 
-        self._send(data)
+    def _fail_pending(self, error: Exception) -> None:
+        with self._pending_lock:
+            futures: list[Future[dict[str, Any]]] = [*self._pending.values(), *self._pending_untagged]
+            self._pending.clear()
+            self._pending_untagged.clear()
+
+        for future in futures:
+            if future.set_running_or_notify_cancel():
+                future.set_exception(error)
+
+    def request(self, data: dict[str, Any], no_response: bool = False) -> dict[str, Any]:
+        if self.websocket is None:
+            raise ConnectionError
 
         if no_response:
-            self.waiting_for_response = False
+            with self._send_lock:
+                self._send(data)
             return {}
 
-        while True:
-            response = self._recv()
-            if "notify-id" in response:
-                self.notifications.append(response)
-            else:
-                break
-
-        self.waiting_for_response = False
-        return response
+        return self.submit(data).result()
 
-    def ms(self, ms: str, endpoint: list[str], *, retry: int = 0, **data: Any) -> dict[str, Any]:
+    def ms_submit(self, ms: str, endpoint: list[str], **data: Any) -> Future[dict[str, Any]]:
         if not self.logged_in:
             raise LoggedOutError
 
-        response: dict[str, Any] = self.request({"ms": ms, "endpoint": endpoint, "data": data, "tag": uuid()})
+        result: Future[dict[str, Any]] = Future()
 
+        def handle_response(response: Future[dict[str, Any]]) -> None:
+            if not result.set_running_or_notify_cancel():
+                return
+
+            try:
+                result.set_result(self._handle_ms_response(ms, response.result()))
+            except Exception as error:  # noqa: B902
+                result.set_exception(error)
+
+        self.submit({"ms": ms, "endpoint": endpoint, "data": data, "tag": uuid()}).add_done_callback(handle_response)
+        return result
+
+    # empty responses are retried by the calling thread, as the reader thread must never send requests
+    def ms(self, ms: str, endpoint: list[str], *, retry: int = 0, **data: Any) -> dict[str, Any]:
+        while True:
+            response_data: dict[str, Any] = self.ms_submit(ms, endpoint, **data).result()
+            if response_data or not retry:
+                return response_data
+            retry -= 1
+
+    # failed requests are returned as their exception, so one failure does not discard the rest of the batch
+    def ms_many(self, requests: list[tuple[str, list[str], dict[str, Any]]]) -> list[dict[str, Any] | Exception]:
+        futures: list[Future[dict[str, Any]]] = [
+            self.ms_submit(ms, endpoint, **data) for ms, endpoint, data in requests
+        ]
+
+        results: list[dict[str, Any] | Exception] = []
+        for future in futures:
+            try:
+                results.append(future.result())
+            except Exception as error:  # noqa: B902
+                results.append(error)
+        return results
+
+    def _handle_ms_response(self, ms: str, response: dict[str, Any]) -> dict[str, Any]:
         if "error" in response:
             error: str = response["error"]
             if error == "unknown microservice":
@@ -128,9 +244,6 @@ class Client:
                     raise exception(list(match.groups()))
             raise InvalidServerResponseError(response)
 
-        if not response_data and retry:
-            return self.ms(ms, endpoint, retry=retry - 1, **data)
-
         return response_data
 
     def register(self, username: str, password: str) -> TokenResponse:
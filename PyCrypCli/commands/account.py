@@ -1,4 +1,3 @@
-import getpass
 import sys
 from typing import Any
 
@@ -15,8 +14,8 @@ def register(context: LoginContext, _: Any) -> None:
 
     try:
         username: str = context.input_no_history("Username: ")
-        password: str = getpass.getpass("Password: ")
-        confirm_password: str = getpass.getpass("Confirm Password: ")
+        password: str = context.input_password("Password: ")
+        confirm_password: str = context.input_password("Confirm Password: ")
     except (KeyboardInterrupt, EOFError):
         raise CommandError("\nAborted.")
 
@@ -39,7 +38,7 @@ def login(context: LoginContext, _: Any) -> None:
 
     try:
         username: str = context.input_no_history("Username: ")
-        password: str = getpass.getpass("Password: ")
+        password: str = context.input_password("Password: ")
     except (KeyboardInterrupt, EOFError):
         raise CommandError("\nAborted.")
 
@@ -93,9 +92,9 @@ def handle_passwd(context: MainContext, _: Any) -> None:
     Change your password
     """
 
-    old_password: str = getpass.getpass("Current password: ")
-    new_password: str = getpass.getpass("New password: ")
-    confirm_password: str = getpass.getpass("Confirm password: ")
+    old_password: str = context.input_password("Current password: ")
+    new_password: str = context.input_password("New password: ")
+    confirm_password: str = context.input_password("Confirm password: ")
 
     if new_password != confirm_password:
         raise CommandError("Passwords don't match.")
@@ -1,10 +1,18 @@
 from __future__ import annotations
 
+import readline
+import time
 from importlib import import_module
+from threading import Lock
 from typing import Callable, Type
 
 from ..context import Context, COMMAND_FUNCTION, COMPLETER_FUNCTION, ContextType
-from ..exceptions import CommandRegistrationError, NoDocStringError
+from .manifest import MANIFEST
+from ..output import capture_output
+from ..exceptions import CommandManifestError, CommandRegistrationError, NoDocStringError, NonInteractiveError
+
+# time in seconds for which the completions of a command are reused while the user keeps pressing tab
+COMPLETION_CACHE_TTL = 5
 
 
 class CommandError(Exception):
@@ -30,6 +38,7 @@ class Command:
         self.completer_func: COMPLETER_FUNCTION[ContextType] | None = None
         self.subcommands: list[Command] = []
         self.prepared_subcommands: dict[Type[Context], dict[str, Command]] = {}
+        self.completion_cache: dict[tuple[Type[Context], tuple[str, ...]], tuple[float, list[str], str]] = {}
 
     def __call__(self, context: ContextType, args: list[str]) -> None:
         self.func(context, args)
@@ -43,21 +52,59 @@ class Command:
 
         return self, args
 
-    def handle(self, context: ContextType, args: list[str]) -> None:
+    def handle(self, context: ContextType, args: list[str]) -> bool:
+        if not context.json_output or context.interactive:
+            return self.execute(context, args)
+
+        # text printed by commands without a structured result is wrapped, so every line of the output is json
+        context.root_context.json_results = []
+        try:
+            with capture_output() as output:
+                ok: bool = self.execute(context, args)
+        finally:
+            results, context.root_context.json_results = context.root_context.json_results, None
+
+        for result in results:
+            context.print_json(result)
+        if output.getvalue():
+            context.print_json({"output": output.getvalue()})
+        return ok
+
+    def execute(self, context: ContextType, args: list[str]) -> bool:
         cmd, args = self.parse_command(context, args)
         try:
             cmd.func(context, args)
         except CommandError as error:
-            print(error.msg)
+            self.print_error(context, error.msg)
+            return False
+        except NonInteractiveError as error:
+            self.print_error(context, str(error))
+            return False
+
+        return True
+
+    @staticmethod
+    def print_error(context: Context, message: str) -> None:
+        if context.json_output:
+            context.print_json({"error": message})
+        else:
+            print(message)
 
     def handle_completer(self, context: ContextType, args: list[str]) -> list[str]:
+        key: tuple[Type[Context], tuple[str, ...]] = (type(context), tuple(args))
+        if (cached := self.completion_cache.get(key)) is not None and cached[0] > time.monotonic():
+            # completers may change the completer delimiters, which has to be repeated for cached completions
+            readline.set_completer_delims(cached[2])
+            return list(cached[1])
+
         cmd, args = self.parse_command(context, args)
 
         out = list(cmd.prepared_subcommands.get(type(context), {}))
         if cmd.completer_func is not None:
             out += cmd.completer_func(context, args) or []
 
-        return out
+        self.completion_cache[key] = time.monotonic() + COMPLETION_CACHE_TTL, out, readline.get_completer_delims()
+        return list(out)
 
     def completer(self) -> Callable[[COMPLETER_FUNCTION[ContextType]], COMPLETER_FUNCTION[ContextType]]:
         def decorator(func: COMPLETER_FUNCTION[ContextType]) -> COMPLETER_FUNCTION[ContextType]:
@@ -108,29 +155,73 @@ def command(
     return decorator
 
 
-def make_commands() -> dict[Type[Context], dict[str, Command]]:
-    for module in [
-        "account",
-        "help",
-        "shell",
-        "status",
-        "device",
-        "files",
-        "morphcoin",
-        "service",
-        "miner",
-        "inventory",
-        "shop",
-        "network",
-    ]:
-        import_module(f"PyCrypCli.commands.{module}")
+# command modules may be loaded concurrently by multiple sessions (see fleet.py)
+load_lock: Lock = Lock()
+
+
+# placeholder for a command of the manifest, its module is imported when the command is first used
+class LazyCommand(Command):
+    def __init__(self, module: str, name: str, description: str, contexts: list[Type[Context]], aliases: list[str]):
+        super().__init__(name, self._call, description, contexts, aliases)
+        self.module: str = module
+        self.command: Command | None = None
+
+    def _call(self, context: Context, args: list[str]) -> None:
+        self.load()(context, args)
+
+    def load(self) -> Command:
+        if self.command is not None:
+            return self.command
+
+        with load_lock:
+            if self.command is not None:
+                return self.command
+
+            for cmd in load_module(self.module):
+                if cmd.name == self.name and cmd.contexts == self.contexts:
+                    break
+            else:
+                raise CommandManifestError(self.name)
 
+            if not cmd.prepared_subcommands:
+                cmd.make_subcommands()
+            self.completion_cache = cmd.completion_cache
+            self.command = cmd
+            return cmd
+
+    def parse_command(self, context: Context, args: list[str]) -> tuple[Command, list[str]]:
+        return self.load().parse_command(context, args)
+
+    def handle(self, context: ContextType, args: list[str]) -> bool:
+        return self.load().handle(context, args)
+
+    def handle_completer(self, context: ContextType, args: list[str]) -> list[str]:
+        return self.load().handle_completer(context, args)
+
+
+def load_module(module: str) -> list[Command]:
+    name: str = f"PyCrypCli.commands.{module}"
+    import_module(name)
+
+    registered: list[Command] = [cmd for cmd in commands if cmd.func.__module__ == name]
+    expected: list[tuple[str, list[Type[Context]], list[str], str]] = MANIFEST[module]
+    for cmd in registered:
+        if (cmd.name, cmd.contexts, cmd.aliases, cmd.description) not in expected:
+            raise CommandManifestError(cmd.name)
+    if len(registered) != len(expected):
+        raise CommandManifestError(module)
+
+    return registered
+
+
+def make_commands() -> dict[Type[Context], dict[str, Command]]:
     result: dict[Type[Context], dict[str, Command]] = {}
-    for cmd in commands:
-        for context in cmd.contexts:
-            for name in [cmd.name] + cmd.aliases:
-                if name in result.setdefault(context, {}):
-                    raise CommandRegistrationError(name)
-                result[context][name] = cmd
-        cmd.make_subcommands()
+    for module, entries in MANIFEST.items():
+        for name, contexts, aliases, description in entries:
+            cmd: Command = LazyCommand(module, name, description, contexts, aliases)
+            for context in contexts:
+                for alias in [name] + aliases:
+                    if alias in result.setdefault(context, {}):
+                        raise CommandRegistrationError(alias)
+                    result[context][alias] = cmd
     return result
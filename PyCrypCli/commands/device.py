@@ -57,6 +57,10 @@ def handle_device_list(context: MainContext, args: list[str]) -> None:
         raise CommandError("usage: device list")
 
     devices: list[Device] = Device.list_devices(context.client)
+    if context.json_output:
+        context.print_json(devices)
+        return
+
     if not devices:
         print("You don't have any devices.")
     else:
@@ -1,15 +1,30 @@
-from typing import Any, cast
+import shutil
+import sys
+from functools import partial
+from io import StringIO
+from typing import Any, TypeVar, cast
 
 from .command import command, CommandError
-from ..context import DeviceContext
+from ..context import Context, DeviceContext, MainContext
 from ..exceptions import (
     FileAlreadyExistsError,
+    FileTypeConflictError,
     InvalidWalletFileError,
     UnknownSourceOrDestinationError,
     PermissionDeniedError,
-    FileNotChangeableError,
+    MicroserviceException,
 )
-from ..models import File, Wallet
+from ..file_index import FileIndex, is_pattern, unescape
+from ..models import Device, File, FileInfo, Wallet
+from ..transfer import COPY_BATCH_SIZE, CopyEngine, PROGRESS_CALLBACK
+from ..util import chunks, extract_wallet, print_tree, TREE_CHILDREN
+
+
+ListedFile = TypeVar("ListedFile", bound=FileInfo)
+
+
+def sort_files(files: list[ListedFile]) -> list[ListedFile]:
+    return sorted(files, key=lambda f: [1 - f.is_directory, f.name])
 
 
 @command("ls", [DeviceContext], aliases=["l", "dir"])
@@ -22,11 +37,11 @@ def handle_ls(context: DeviceContext, args: list[str]) -> None:
     if directory is None:
         raise CommandError("No such file or directory.")
 
-    if directory.is_directory:
-        files: list[File] = context.get_files(directory.uuid)
-        files.sort(key=lambda f: [1 - f.is_directory, f.name])
-    else:
-        files = [directory]
+    files: list[FileInfo] = sort_files(context.get_listing(directory.uuid)) if directory.is_directory else [directory]
+
+    if context.json_output:
+        context.print_json([file.dict(exclude={"content"}) for file in files])
+        return
 
     for file in files:
         print(["[FILE] ", "[DIR]  "][file.is_directory] + file.name)
@@ -38,6 +53,10 @@ def handle_pwd(context: DeviceContext, _: Any) -> None:
     Print the current working directory
     """
 
+    if context.json_output:
+        context.print_json({"path": context.file_to_path(context.pwd), "uuid": context.pwd.uuid})
+        return
+
     print(context.file_to_path(context.pwd))
 
 
@@ -58,7 +77,7 @@ def handle_mkdir(context: DeviceContext, args: list[str]) -> None:
         raise CommandError("That is no directory.")
 
     try:
-        context.host.create_file(dirname, "", True, parent.uuid)
+        context.file_index.add(context.host.create_file(dirname, "", True, parent.uuid))
     except FileAlreadyExistsError:
         raise CommandError("There already exists a file with this name.")
 
@@ -90,6 +109,29 @@ def handle_dot_dot(context: DeviceContext, _: Any) -> None:
     handle_cd(context, [".."])
 
 
+# every path or pattern has to match at least one file
+def expand_paths(context: DeviceContext, patterns: list[str]) -> list[tuple[str, File]]:
+    files: dict[str | None, tuple[str, File]] = {}
+    for pattern in patterns:
+        matches: list[tuple[str, File]] = context.file_index.glob(pattern, context.pwd)
+        if not matches:
+            raise CommandError(f"File does not exist: {pattern}")
+        for path, file in matches:
+            files.setdefault(file.uuid, (path, file))
+    return list(files.values())
+
+
+# files inside one of the other given directories are handled by their parent
+def remove_nested(context: DeviceContext, files: list[tuple[str, File]]) -> list[tuple[str, File]]:
+    directories: list[str | None] = [file.uuid for _, file in files if file.is_directory]
+    return [
+        (path, file)
+        for path, file in files
+        if file.is_root_directory
+        or not any(context.file_index.is_inside(file.parent_dir_uuid, directory) for directory in directories)
+    ]
+
+
 def create_file(context: DeviceContext, filepath: str, content: str) -> None:
     *path, filename = filepath.split("/")
     parent: File | None = context.path_to_file("/".join(path))
@@ -107,7 +149,7 @@ def create_file(context: DeviceContext, filepath: str, content: str) -> None:
             raise CommandError("A directory with this name already exists.")
         file.edit(content)
     else:
-        context.host.create_file(filename, content, False, parent.uuid)
+        context.file_index.add(context.host.create_file(filename, content, False, parent.uuid))
 
 
 @command("touch", [DeviceContext])
@@ -120,7 +162,48 @@ def handle_touch(context: DeviceContext, args: list[str]) -> None:
         raise CommandError("usage: touch <filepath> [content]")
 
     filepath, *content = args
-    create_file(context, filepath, " ".join(content))
+    files: list[tuple[str, File]] = context.file_index.glob(filepath, context.pwd) if is_pattern(filepath) else []
+    if not files:
+        create_file(context, unescape(filepath), " ".join(content))
+        return
+
+    # all files matched by a pattern get the same content
+    for path, file in files:
+        if file.is_directory:
+            raise CommandError(f"'{path}' is a directory.")
+    errors: list[Exception] = []
+    for batch in chunks([(file, " ".join(content)) for _, file in files], COPY_BATCH_SIZE):
+        errors += [result for result in context.host.edit_files(batch) if isinstance(result, Exception)]
+    if errors:
+        raise CommandError(f"{len(errors)} files could not be changed: {errors[0]}")
+
+
+# similar to `more`, only used in interactive mode if stdout is a terminal
+def print_paged(context: DeviceContext, content: str) -> None:
+    if context.json_output or not context.interactive or not sys.stdout.isatty():
+        print(content)
+        return
+
+    width, height = shutil.get_terminal_size()
+    rows: int = 0
+    for line in StringIO(content):
+        # long lines are wrapped by the terminal and take up more than one row
+        line_rows: int = max(1, -(-len(line.rstrip("\n")) // width))
+        if rows + line_rows >= height:
+            try:
+                answer: str = context.input_no_history("\033[7m--More-- [Enter: next page, q: quit]\033[0m ")
+            except (KeyboardInterrupt, EOFError):
+                print()
+                return
+            if answer.strip().lower() == "q":
+                return
+            rows = 0
+
+        sys.stdout.write(line)
+        rows += line_rows
+
+    if not content.endswith("\n"):
+        sys.stdout.write("\n")
 
 
 @command("cat", [DeviceContext])
@@ -130,16 +213,17 @@ def handle_cat(context: DeviceContext, args: list[str]) -> None:
     """
 
     if not args:
-        raise CommandError("usage: cat <filepath>")
+        raise CommandError("usage: cat <filepath>...")
 
-    path: str = args[0]
-    file: File | None = context.path_to_file(path)
-    if file is None:
-        raise CommandError("File does not exist.")
-    if file.is_directory:
-        raise CommandError(f"'{path}' is a directory.")
+    directories: list[str] = []
+    for path, file in expand_paths(context, args):
+        if file.is_directory:
+            directories.append(path)
+        else:
+            print_paged(context, file.content)
 
-    print(file.content)
+    if directories:
+        raise CommandError(f"'{directories[0]}' is a directory.")
 
 
 @command("rm", [DeviceContext])
@@ -148,55 +232,76 @@ def handle_rm(context: DeviceContext, args: list[str]) -> None:
     Remove a file
     """
 
+    # -f: delete without asking for confirmation (e.g. in scripts), the wallets of deleted wallet files are kept
+    force: bool = args[:1] == ["-f"]
+    if force:
+        args = args[1:]
     if not args:
-        raise CommandError("usage: rm <filepath>")
-
-    filepath: str = args[0]
-    file: File | None = context.path_to_file(filepath)
-    if file is None:
-        raise CommandError("File does not exist.")
+        raise CommandError("usage: rm [-f] <filepath>...")
 
-    if file.is_directory:
-        pwd = context.pwd
-        while True:
-            if pwd.uuid == file.uuid:
-                raise CommandError("Refusing to delete this directory.")
-            if pwd.uuid is None:
-                break
-            pwd = context.get_parent_dir(pwd)
+    targets: list[tuple[str, File]] = remove_nested(context, expand_paths(context, args))
+    for _, file in targets:
+        if file.is_directory and context.file_index.is_inside(context.pwd.uuid, file.uuid):
+            raise CommandError("Refusing to delete this directory.")
 
-        question: str = f"Are you sure you want to delete the directory '{filepath}' including all contained files?"
-    else:
-        question = f"Are you sure you want to delete the file '{filepath}'?"
-    if context.ask(question + " [yes|no] ", ["yes", "no"]) == "no":
-        raise CommandError("File has not been deleted.")
-
-    content: str = file.content
-    try:
-        wallet: Wallet = context.extract_wallet(content)
-        choice: str = context.ask(
-            f"\033[38;2;255;51;51mThis file contains {wallet.amount} morphcoin. "
-            f"Do you want to delete the corresponding wallet? [yes|no] \033[0m",
-            ["yes", "no"],
+    question: str
+    if len(targets) > 1 and any(file.is_directory for _, file in targets):
+        question = (
+            f"Are you sure you want to delete {len(targets)} files and directories including all contained files?"
         )
+    elif len(targets) > 1:
+        question = f"Are you sure you want to delete {len(targets)} files?"
+    elif targets[0][1].is_directory:
+        question = f"Are you sure you want to delete the directory '{targets[0][0]}' including all contained files?"
+    else:
+        question = f"Are you sure you want to delete the file '{targets[0][0]}'?"
+    if not force and context.ask(question + " [yes|no] ", ["yes", "no"]) == "no":
+        raise CommandError("File has not been deleted." if len(targets) == 1 else "No files have been deleted.")
+
+    wallets: list[tuple[File, Wallet]] = []
+    for _, file in targets:
+        if file.is_directory or extract_wallet(file.content) is None:
+            continue
+        try:
+            wallets.append((file, context.extract_wallet(file.content)))
+        except (InvalidWalletFileError, UnknownSourceOrDestinationError, PermissionDeniedError):
+            pass
+
+    if wallets:
+        files_text: str = "This file contains" if len(wallets) == 1 else f"{len(wallets)} of these files contain"
+        choice: str = "no"
+        if not force:
+            choice = context.ask(
+                f"\033[38;2;255;51;51m{files_text} {sum(wallet.amount for _, wallet in wallets)} morphcoin. "
+                f"Do you want to delete the corresponding wallet{'s' * (len(wallets) > 1)}? [yes|no] \033[0m",
+                ["yes", "no"],
+            )
         if choice == "yes":
-            wallet.delete()
-            print("The wallet has been deleted.")
+            for _, wallet in wallets:
+                wallet.delete()
+            print("The wallet has been deleted." if len(wallets) == 1 else "The wallets have been deleted.")
         else:
-            print("The following key might now be the only way to access your wallet.")
-            print(content)
-    except (InvalidWalletFileError, UnknownSourceOrDestinationError, PermissionDeniedError):
-        pass
-
-    try:
-        file.delete()
-    except FileNotChangeableError:
+            print(f"The following key{'s' * (len(wallets) > 1)} might now be the only way to access your wallet.")
+            for file, _ in wallets:
+                print(file.content)
+
+    errors: list[Exception] = []
+    for batch in chunks([file for _, file in targets], COPY_BATCH_SIZE):
+        for file, error in zip(batch, context.host.delete_files(batch)):
+            if error is not None:
+                errors.append(error)
+            else:
+                context.file_index.remove(file)
+
+    if errors:
+        context.file_index.invalidate()
         raise CommandError("Some files could not be deleted.")
 
 
+# has no side effects, the file that would be replaced is returned and deleted by the caller
 def check_file_movable(
     context: DeviceContext, source: str, destination: str, move: bool
-) -> tuple[File, str, str | None] | None:
+) -> tuple[File, str, str | None, File | None] | None:
     file: File | None = context.path_to_file(source)
     if file is None:
         raise CommandError("File does not exist.")
@@ -206,64 +311,86 @@ def check_file_movable(
     dest_parent_path, _, dest_name = destination[absolute:].rpartition("/")
     dest_parent: File | None = context.path_to_file("/" * absolute + dest_parent_path)
     dest_dir: str | None
-
-    if file.is_directory:
-        if dest_file is None:
-            if dest_parent is None:
-                raise CommandError("No such file or directory.")
-            if not dest_parent.is_directory:
-                raise CommandError("Not a directory.")
-            dest_dir = dest_parent.uuid
-        elif dest_file.is_directory:
-            sub_file: File | None = context.get_file(dest_name, dest_file.uuid)
-            if sub_file is not None:
-                if sub_file.is_directory:
-                    if context.get_files(sub_file.uuid):
-                        raise CommandError("Directory is not empty.")
-                    sub_file.delete()
-                else:
-                    raise CommandError("Directory cannot replace a file.")
-            dest_name = file.name
-            dest_dir = dest_file.uuid
-        else:
-            raise CommandError("Directory cannot replace a file.")
+    replaced: File | None = None
+
+    if dest_file is None:
+        if dest_parent is None:
+            raise CommandError("No such file or directory.")
+        if not dest_parent.is_directory:
+            raise CommandError("Not a directory.")
+        dest_dir = dest_parent.uuid
+    elif dest_file.is_directory:
+        dest_name, dest_dir = file.name, dest_file.uuid
+        replaced = context.get_file(dest_name, dest_dir)
+    elif file.is_directory:
+        raise CommandError("Directory cannot replace a file.")
     else:
-        if dest_file is None:
-            if dest_parent is None:
-                raise CommandError("No such file or directory.")
-            if not dest_parent.is_directory:
-                raise CommandError("Not a directory.")
-            dest_dir = dest_parent.uuid
-        elif dest_file.is_directory:
-            sub_file = context.get_file(dest_name, dest_file.uuid)
-            if sub_file is not None:
-                if sub_file.is_directory:
-                    raise CommandError("File cannot replace a directory.")
-                sub_file.delete()
-            dest_name = file.name
-            dest_dir = dest_file.uuid
-        else:
-            dest_file.delete()
-            dest_dir = cast(File, dest_parent).uuid
+        replaced, dest_dir = dest_file, cast(File, dest_parent).uuid
 
     if dest_dir == file.parent_dir_uuid and dest_name == file.name:
         return None
 
-    if dest_dir is not None:
-        dir_to_check: File | None = File.get_file(context.client, file.device_uuid, dest_dir)
-        while True:
-            if not dir_to_check:
-                break
-            if dir_to_check.uuid == file.uuid:
-                raise CommandError(f"You cannot {['copy', 'move'][move]} a directory into itself.")
-            dir_to_check = context.get_parent_dir(dir_to_check)
+    if replaced is not None:
+        if file.is_directory and not replaced.is_directory:
+            raise CommandError("Directory cannot replace a file.")
+        if not file.is_directory and replaced.is_directory:
+            raise CommandError("File cannot replace a directory.")
+        if replaced.is_directory and context.get_listing(replaced.uuid):
+            raise CommandError("Directory is not empty.")
+
+    if file.is_directory and context.file_index.is_inside(dest_dir, file.uuid):
+        raise CommandError(f"You cannot {['copy', 'move'][move]} a directory into itself.")
 
     if not dest_name:
         raise CommandError("Destination filename cannot be empty.")
     if len(dest_name) > 64:
         raise CommandError("Destination filename cannot be longer than 64 characters.")
 
-    return file, dest_name, dest_dir
+    return file, dest_name, dest_dir, replaced
+
+
+# replaced files are only deleted once all sources have been checked
+def check_files_movable(
+    context: DeviceContext, sources: list[str], destination: str, move: bool
+) -> list[tuple[File, str, str | None]]:
+    paths: list[str] = [path for path, _ in remove_nested(context, expand_paths(context, sources))]
+    if len(paths) > 1 and not ((target := context.path_to_file(destination)) and target.is_directory):
+        raise CommandError(f"Target '{destination}' is not a directory.")
+
+    files: list[tuple[File, str, str | None]] = []
+    replaced: list[File] = []
+    for path in paths:
+        if (result := check_file_movable(context, path, destination, move)) is not None:
+            files.append(result[:3])
+            if result[3] is not None:
+                replaced.append(result[3])
+
+    targets: set[tuple[str | None, str]] = {(dest_dir, dest_name) for _, dest_name, dest_dir in files}
+    if len(targets) < len(files):
+        raise CommandError(f"Cannot {['copy', 'move'][move]} more than one file to the same destination.")
+
+    errors: list[Exception] = []
+    for batch in chunks(replaced, COPY_BATCH_SIZE):
+        for file, error in zip(batch, context.host.delete_files(batch)):
+            if error is None:
+                context.file_index.remove(file)
+            else:
+                errors.append(error)
+    if errors:
+        raise CommandError(f"{len(errors)} existing files could not be replaced: {errors[0]}")
+
+    return files
+
+
+def make_progress_printer(context: Context) -> PROGRESS_CALLBACK | None:
+    if context.json_output or not context.interactive or not sys.stdout.isatty():
+        return None
+
+    def print_progress(done: int, total: int) -> None:
+        if total > 1:
+            print(f"\rCopied {done}/{total} files", end="", flush=True)
+
+    return print_progress
 
 
 @command("cp", [DeviceContext])
@@ -272,21 +399,23 @@ def handle_cp(context: DeviceContext, args: list[str]) -> None:
     Create a copy of a file
     """
 
-    if len(args) != 2:
-        raise CommandError("usage: cp <source> <destination>")
+    if len(args) < 2:
+        raise CommandError("usage: cp <source>... <destination>")
 
-    result: tuple[File, str, str | None] | None = check_file_movable(context, args[0], args[1], move=False)
-    if result is None:
+    files: list[tuple[File, str, str | None]] = check_files_movable(context, args[:-1], args[-1], move=False)
+    if not files:
         return
 
-    file, dest_name, dest_dir = result
-    queue: list[tuple[File, str, str | None]] = [(file, dest_name, dest_dir)]
-    while queue:
-        file, dest_name, dest_dir = queue.pop(0)
-        new_file: File = context.host.create_file(dest_name, file.content, file.is_directory, dest_dir)
-        if file.is_directory:
-            for child in context.get_files(file.uuid):
-                queue.append((child, child.name, cast(str, new_file.uuid)))
+    engine: CopyEngine = CopyEngine(context.host, context.host, progress=make_progress_printer(context))
+    try:
+        engine.copy_many(files)
+    except MicroserviceException as error:
+        raise CommandError(f"Copy failed after {len(engine.created)} of {engine.total} files: {error}")
+    finally:
+        for new_file in engine.created:
+            context.file_index.add(new_file)
+        if engine.total > 1 and engine.progress is not None:
+            print()
 
 
 @command("mv", [DeviceContext])
@@ -295,21 +424,232 @@ def handle_mv(context: DeviceContext, args: list[str]) -> None:
     Rename a file
     """
 
+    if len(args) < 2:
+        raise CommandError("usage: mv <source>... <destination>")
+
+    files: list[tuple[File, str, str | None]] = check_files_movable(context, args[:-1], args[-1], move=True)
+    errors: list[Exception] = []
+    for batch in chunks(files, COPY_BATCH_SIZE):
+        for result in context.host.move_files(batch):
+            if isinstance(result, Exception):
+                errors.append(result)
+                continue
+
+            context.file_index.update(result)
+            if result.uuid == context.pwd.uuid:
+                context.pwd = result
+
+    if errors:
+        raise CommandError(f"{len(errors)} files could not be moved: {errors[0]}")
+
+
+def find_device(context: MainContext, name: str) -> Device:
+    devices: dict[str, Device] = {
+        device.uuid: device
+        for device in Device.list_devices(context.client) + context.get_hacked_devices()
+        if name in (device.name, device.uuid)
+    }
+    if not devices:
+        raise CommandError(f"There is no device with the name '{name}'.")
+    if len(devices) > 1:
+        raise CommandError(f"There is more than one device with the name '{name}'. You need to specify its UUID.")
+    return next(iter(devices.values()))
+
+
+# paths have the form `[<device>:]<path>`, paths without a device refer to the current device
+def resolve_device_path(context: MainContext, spec: str) -> tuple[FileIndex, File | None, str]:
+    if ":" in spec:
+        name, path = spec.split(":", 1)
+        device: Device = find_device(context, name)
+    elif isinstance(context, DeviceContext):
+        device, path = context.host, spec
+    else:
+        raise CommandError("You need to specify the device of a path using <device>:<path>.")
+
+    cwd: File | None = None
+    if isinstance(context, DeviceContext) and device.uuid == context.host.uuid:
+        cwd = context.pwd
+    return context.root_context.get_file_index(device), cwd, path
+
+
+@command("scp", [MainContext, DeviceContext])
+def handle_scp(context: MainContext, args: list[str]) -> None:
+    """
+    Copy files between devices
+    """
+
+    # -T: the destination is the copy itself instead of the directory to copy into (used to resume transfers)
+    no_target_directory: bool = args[:1] == ["-T"]
+    if no_target_directory:
+        args = args[1:]
     if len(args) != 2:
-        raise CommandError("usage: mv <source> <destination>")
+        raise CommandError("usage: scp [-T] [<device>:]<source> [<device>:]<destination>")
+
+    source_index, source_cwd, source = resolve_device_path(context, args[0])
+    dest_index, dest_cwd, destination = resolve_device_path(context, args[1])
+    file: File | None = source_index.resolve(source, source_cwd)
+    dest_file: File | None = dest_index.resolve(destination, dest_cwd)
+    if file is None:
+        raise CommandError("File does not exist.")
+    if file.is_root_directory:
+        raise CommandError("The root directory cannot be copied.")
+
+    # existing files are only reused with -T, so a copy never silently replaces files
+    dest_dir: str | None
+    if dest_file is not None and dest_file.is_directory and not no_target_directory:
+        dest_name, dest_dir = file.name, dest_file.uuid
+        if dest_index.find(dest_name, dest_dir) is not None:
+            raise CommandError(f"{dest_name} already exists. Use `scp -T` to resume a transfer.")
+    elif dest_file is not None:
+        if not no_target_directory:
+            raise CommandError(f"{dest_file.name} already exists. Use `scp -T` to resume a transfer.")
+        if dest_file.is_root_directory:
+            raise CommandError("The root directory cannot be replaced.")
+        if file.is_directory and not dest_file.is_directory:
+            raise CommandError("Directory cannot replace a file.")
+        if dest_file.is_directory and not file.is_directory:
+            raise CommandError("File cannot replace a directory.")
+        dest_name, dest_dir = dest_file.name, dest_file.parent_dir_uuid
+    else:
+        absolute = destination.startswith("/")
+        dest_parent_path, _, dest_name = destination[absolute:].rpartition("/")
+        dest_parent: File | None = dest_index.resolve("/" * absolute + dest_parent_path, dest_cwd)
+        if dest_parent is None:
+            raise CommandError("No such file or directory.")
+        if not dest_parent.is_directory:
+            raise CommandError("Not a directory.")
+        dest_dir = dest_parent.uuid
+
+    if source_index is dest_index and file.is_directory and dest_index.is_inside(dest_dir, file.uuid):
+        raise CommandError("A directory cannot be copied into itself.")
+
+    engine: CopyEngine = CopyEngine(
+        source_index.device, dest_index.device, progress=make_progress_printer(context), resume=no_target_directory
+    )
+    try:
+        engine.copy(file, dest_name, dest_dir)
+    except FileTypeConflictError as error:
+        raise CommandError(f"Cannot resume the transfer: {error}")
+    except MicroserviceException as error:
+        dest_parent_dir: File = (
+            dest_index.get_file(dest_dir) if dest_dir is not None else dest_index.device.get_root_directory()
+        )
+        target: str = dest_index.get_path(dest_parent_dir).rstrip("/") + "/" + dest_name
+        if ":" in args[1]:
+            target = args[1].split(":", 1)[0] + ":" + target
+        raise CommandError(
+            f"Transfer interrupted after {engine.done} of {engine.total} files: {error}\n"
+            f"Run `scp -T {args[0]} {target}` to resume the transfer."
+        )
+    finally:
+        for new_file in engine.created:
+            dest_index.add(new_file)
+        if engine.total > 1 and engine.progress is not None:
+            print()
+
+
+# the listings of the whole tree are requested in the background
+def resolve_walk_root(context: MainContext, args: list[str], usage: str, light: bool) -> tuple[FileIndex, File, str]:
+    if len(args) > 1:
+        raise CommandError(usage)
+
+    spec: str = args[0] if args else "."
+    index, cwd, path = resolve_device_path(context, spec)
+    directory: File | None = index.resolve(path, cwd)
+    if directory is None:
+        raise CommandError("No such file or directory.")
+    if not directory.is_directory:
+        raise CommandError("That is no directory.")
+
+    index.prefetch([directory.uuid], recursive=True, light=light)
+    return index, directory, spec
+
+
+@command("tree", [MainContext, DeviceContext])
+def handle_tree(context: MainContext, args: list[str]) -> None:
+    """
+    Show the tree of files below a directory
+    """
 
-    result: tuple[File, str, str | None] | None = check_file_movable(context, args[0], args[1], move=True)
-    if result is None:
+    index, directory, spec = resolve_walk_root(context, args, "usage: tree [[<device>:]<directory>]", light=True)
+
+    if context.json_output:
+
+        def make_json(parent: FileInfo) -> list[dict[str, Any]]:
+            return [
+                {"name": file.name, "is_directory": file.is_directory}
+                | ({"children": make_json(file)} if file.is_directory else {})
+                for file in sort_files(index.get_listing(parent.uuid))
+            ]
+
+        context.print_json(make_json(directory))
         return
 
-    file, dest_name, dest_dir = result
-    file.move(dest_name, dest_dir)
+    counts: list[int] = [0, 0]
+
+    # the listing of a directory is only waited for once its subtree is printed, while the rest is still loading
+    def load_children(parent: FileInfo) -> list[tuple[str, TREE_CHILDREN]]:
+        files: list[FileInfo] = sort_files(index.get_listing(parent.uuid))
+        for file in files:
+            counts[file.is_directory] += 1
+        return [(file.name, partial(load_children, file) if file.is_directory else None) for file in files]
+
+    print(spec)
+    print_tree(load_children(directory))
+    print()
+    print(f"{counts[True]} directories, {counts[False]} files")
+
+
+@command("du", [MainContext, DeviceContext])
+def handle_du(context: MainContext, args: list[str]) -> None:
+    """
+    Show the number of files and the size of their contents per directory
+    """
+
+    summary: bool = args[:1] == ["-s"]
+    if summary:
+        args = args[1:]
+    index, directory, spec = resolve_walk_root(context, args, "usage: du [-s] [[<device>:]<directory>]", light=False)
+
+    results: list[dict[str, Any]] = []
+
+    # directories are reported as soon as their subtree is complete, like du does
+    def visit(parent: File, path: str) -> tuple[int, int]:
+        count: int = 0
+        size: int = 0
+        for file in sort_files(index.get_files(parent.uuid)):
+            if file.is_directory:
+                sub_count, sub_size = visit(file, path + ("" if path.endswith(("/", ":")) else "/") + file.name)
+                count += sub_count
+                size += sub_size
+            else:
+                count += 1
+                size += len(file.content.encode())
+
+        if path == spec or not summary:
+            if context.json_output:
+                results.append({"path": path, "files": count, "bytes": size})
+            else:
+                print(f"{count:>8} files {size:>12} bytes  {path}")
+        return count, size
+
+    visit(directory, spec)
+    if context.json_output:
+        context.print_json(results)
 
 
-@handle_ls.completer()
 @handle_cat.completer()
-@handle_touch.completer()
 @handle_rm.completer()
+@handle_mv.completer()
+@handle_cp.completer()
+def multi_file_completer(context: DeviceContext, args: list[str]) -> list[str]:
+    if args:
+        return context.file_path_completer(args[-1])
+    return []
+
+
+@handle_ls.completer()
+@handle_touch.completer()
 def simple_file_completer(context: DeviceContext, args: list[str]) -> list[str]:
     if len(args) == 1:
         return context.file_path_completer(args[0])
@@ -318,15 +658,9 @@ def simple_file_completer(context: DeviceContext, args: list[str]) -> list[str]:
 
 @handle_cd.completer()
 @handle_mkdir.completer()
+@handle_tree.completer()
+@handle_du.completer()
 def simple_directory_completer(context: DeviceContext, args: list[str]) -> list[str]:
-    if len(args) == 1:
+    if len(args) == 1 and isinstance(context, DeviceContext):
         return context.file_path_completer(args[0], dirs_only=True)
     return []
-
-
-@handle_mv.completer()
-@handle_cp.completer()
-def copy_completer(context: DeviceContext, args: list[str]) -> list[str]:
-    if 1 <= len(args) <= 2:
-        return context.file_path_completer(args[-1])
-    return []
@@ -27,6 +27,10 @@ def handle_inventory_list(context: MainContext, _: Any) -> None:
     """
 
     inventory: Dict[str, int] = Counter(element.name for element in InventoryElement.list_inventory(context.client))
+    if context.json_output:
+        context.print_json(inventory)
+        return
+
     if not inventory:
         raise CommandError("Your inventory is empty.")
 
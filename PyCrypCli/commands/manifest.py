@@ -0,0 +1,78 @@
+from typing import Type
+
+from ..context import Context, LoginContext, MainContext, DeviceContext
+
+# name, contexts, aliases and description of every command, grouped by the module that implements it.
+# this allows the command modules to be imported only when one of their commands is used for the first time.
+MANIFEST: dict[str, list[tuple[str, list[Type[Context]], list[str], str]]] = {
+    "account": [
+        ("register", [LoginContext], ["signup"], "Create a new account"),
+        ("login", [LoginContext], [], "Login with an existing account"),
+        ("exit", [LoginContext], ["quit"], "Exit PyCrypCli"),
+        ("exit", [MainContext], ["quit"], "Exit PyCrypCli (session will be saved)"),
+        ("exit", [DeviceContext], ["quit", "logout"], "Disconnect from this device"),
+        ("logout", [MainContext], [], "Delete the current session and exit PyCrypCli"),
+        ("passwd", [MainContext], [], "Change your password"),
+        ("_delete_user", [MainContext], [], "Delete this account"),
+    ],
+    "help": [("help", [LoginContext, MainContext, DeviceContext], [], "Show a list of available commands")],
+    "shell": [
+        ("clear", [LoginContext, MainContext, DeviceContext], [], "Clear the console"),
+        ("history", [MainContext, DeviceContext], [], "Show the history of commands entered in this session"),
+        ("feedback", [LoginContext, MainContext, DeviceContext], [], "Send feedback to the developer"),
+    ],
+    "status": [
+        ("whoami", [MainContext, DeviceContext], [], "Print the name of the current user"),
+        ("status", [LoginContext, MainContext, DeviceContext], [], "Indicate how many players are online"),
+    ],
+    "device": [
+        ("device", [MainContext, DeviceContext], [], "Manage your devices"),
+        ("shutdown", [DeviceContext], ["poweroff", "halt"], "Shutdown this device"),
+        ("hostname", [DeviceContext], [], "Show or modify the name of the device"),
+        ("top", [DeviceContext], [], "Display the current resource usage of this device"),
+    ],
+    "files": [
+        ("ls", [DeviceContext], ["l", "dir"], "List all files"),
+        ("pwd", [DeviceContext], [], "Print the current working directory"),
+        ("mkdir", [DeviceContext], [], "Create a new directory"),
+        ("cd", [DeviceContext], [], "Change the current working directory"),
+        ("..", [DeviceContext], [], "Go to parent directory"),
+        ("touch", [DeviceContext], [], "Create a new file with given content"),
+        ("cat", [DeviceContext], [], "Print the content of a file"),
+        ("rm", [DeviceContext], [], "Remove a file"),
+        ("cp", [DeviceContext], [], "Create a copy of a file"),
+        ("mv", [DeviceContext], [], "Rename a file"),
+        ("scp", [MainContext, DeviceContext], [], "Copy files between devices"),
+        ("tree", [MainContext, DeviceContext], [], "Show the tree of files below a directory"),
+        (
+            "du",
+            [MainContext, DeviceContext],
+            [],
+            "Show the number of files and the size of their contents per directory",
+        ),
+    ],
+    "sync": [
+        ("pull", [MainContext, DeviceContext], [], "Mirror a directory of a device to a local directory"),
+        ("push", [MainContext, DeviceContext], [], "Mirror a local directory to a directory of a device"),
+    ],
+    "search": [
+        ("find", [MainContext, DeviceContext], [], "Search for files by name"),
+        ("grep", [MainContext, DeviceContext], [], "Search the content of files using a regular expression"),
+    ],
+    "snapshot": [("snapshot", [MainContext, DeviceContext], [], "Export and import snapshots of device file systems")],
+    "morphcoin": [
+        ("morphcoin", [DeviceContext], [], "Manage your Morphcoin wallet"),
+        ("pay", [DeviceContext], [], "Send Morphcoins to another wallet"),
+    ],
+    "service": [
+        ("service", [DeviceContext], [], "Create or use a service"),
+        ("spot", [DeviceContext], [], "Find a random device in the network"),
+        ("remote", [MainContext, DeviceContext], [], "Manage and connect to the devices you hacked before"),
+    ],
+    "miner": [("miner", [DeviceContext], [], "Manager your Morphcoin miners")],
+    "inventory": [
+        ("inventory", [MainContext, DeviceContext], [], "Manage your inventory and trade with other players")
+    ],
+    "shop": [("shop", [DeviceContext], [], "Buy new hardware and more in the shop")],
+    "network": [("network", [DeviceContext], [], "Manage your networks")],
+}
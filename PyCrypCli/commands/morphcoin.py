@@ -77,6 +77,10 @@ def handle_morphcoin_list(context: DeviceContext, _: Any) -> None:
     """
 
     wallets: list[PublicWallet] = PublicWallet.list_wallets(context.client)
+    if context.json_output:
+        context.print_json(wallets)
+        return
+
     if not wallets:
         print("You don't own any wallet.")
     else:
@@ -115,11 +119,17 @@ def handle_morphcoin_transactions(context: DeviceContext, args: list[str]) -> No
 
     wallet: Wallet = get_wallet_from_file(context, args[0])
 
-    if not wallet.transaction_count:
+    transactions: list[Transaction] = []
+    if wallet.transaction_count:
+        transactions = wallet.get_transactions(wallet.transaction_count, 0)
+    if context.json_output:
+        context.print_json(transactions)
+        return
+
+    if not transactions:
         print("No transactions found for this wallet.")
         return
 
-    transactions: list[Transaction] = wallet.get_transactions(wallet.transaction_count, 0)
     print("Transactions for this wallet:")
     for transaction in transactions:
         source: str = transaction.source_uuid
@@ -171,23 +181,24 @@ def handle_morphcoin_watch(context: DeviceContext, args: list[str]) -> None:
     last_update: float = 0
 
     print(f"UUID: {wallet.uuid}")
-    try:
-        while True:
-            now = time.time()
-
-            if now - last_update > 20:
-                wallet = get_wallet(context, wallet.uuid, wallet.key)
-                current_mining_rate = wallet.get_mining_rate()
-                last_update = now
-
-            current_balance: int = wallet.amount + int(current_mining_rate * 1000 * (now - last_update))
-            print(
-                end=f"\rBalance: {current_balance / 1000:.3f} morphcoin " f"(+{current_mining_rate:.6f} MC/s) ",
-                flush=False,
-            )
-            time.sleep(0.1)
-    except KeyboardInterrupt:
-        print()
+    with context.client.notifications.listen("currency") as notifications:
+        try:
+            while True:
+                now = time.time()
+
+                if notifications.poll() or now - last_update > 20:
+                    wallet = get_wallet(context, wallet.uuid, wallet.key)
+                    current_mining_rate = wallet.get_mining_rate()
+                    last_update = now
+
+                current_balance: int = wallet.amount + int(current_mining_rate * 1000 * (now - last_update))
+                print(
+                    end=f"\rBalance: {current_balance / 1000:.3f} morphcoin " f"(+{current_mining_rate:.6f} MC/s) ",
+                    flush=False,
+                )
+                time.sleep(0.1)
+        except KeyboardInterrupt:
+            print()
 
 
 @handle_morphcoin_look.completer()
@@ -14,7 +14,6 @@ from ..exceptions import (
     NoPermissionsError,
     CannotLeaveOwnNetworkError,
     CannotKickOwnerError,
-    DeviceNotFoundError,
 )
 from ..models import Network, NetworkMembership, Device, NetworkInvitation
 from ..util import is_uuid
@@ -46,12 +45,9 @@ def handle_membership_request(context: DeviceContext, args: list[str], accept: b
         else:
             raise CommandError("Invitation not found.")
     else:
-        devices: list[Device] = []
-        for request in network.get_membership_requests():
-            try:
-                devices.append(Device.get_device(context.client, request.device_uuid))
-            except DeviceNotFoundError:
-                pass
+        devices: list[Device] = Device.get_devices(
+            context.client, [request.device_uuid for request in network.get_membership_requests()], skip_missing=True
+        )
 
         device: Device = get_device(context, args[1], devices)
         try:
@@ -87,6 +83,9 @@ def handle_network_list(context: DeviceContext, _: Any) -> None:
     """
 
     networks: list[Network] = context.host.get_networks()
+    if context.json_output:
+        context.print_json(networks)
+        return
 
     if not networks:
         print("This device is not a member of any network.")
@@ -153,8 +152,7 @@ def handle_network_members(context: DeviceContext, args: list[str]) -> None:
         print("This network has no members.")
     else:
         print(f"Members of '{network.name}':")
-    for member in members:
-        device: Device = Device.get_device(context.client, member.device_uuid)
+    for device in Device.get_devices(context.client, [member.device_uuid for member in members]):
         print(f" - [{['off', 'on'][device.powered_on]}] {device.name} (UUID: {device.uuid})")
 
 
@@ -197,8 +195,7 @@ def handle_network_requests(context: DeviceContext, args: list[str]) -> None:
         print("There are no pending requests for this network.")
     else:
         print("Pending requests:")
-    for request in requests:
-        device: Device = Device.get_device(context.client, request.device_uuid)
+    for device in Device.get_devices(context.client, [request.device_uuid for request in requests]):
         print(f" - {device.name} (UUID: {device.uuid})")
 
 
@@ -253,8 +250,7 @@ def handle_network_invitations(context: DeviceContext, _: Any) -> None:
         print("There are no pending network invitations for this device.")
     else:
         print("Pending network invitations:")
-    for invitation in invitations:
-        network: Network = Network.get_by_uuid(context.client, invitation.network_uuid)
+    for network in Network.get_by_uuids(context.client, [invitation.network_uuid for invitation in invitations]):
         owner: str = " (owner)" * (network.owner_uuid == context.host.uuid)
         print(f" - [{['public', 'private'][network.hidden]}] {network.name}{owner} (UUID: {network.uuid})")
 
@@ -287,9 +283,7 @@ def handle_network_kick(context: DeviceContext, args: list[str]) -> None:
 
     network: Network = get_network(context, args[0])
 
-    devices: list[Device] = []
-    for member in network.get_members():
-        devices.append(Device.get_device(context.client, member.device_uuid))
+    devices: list[Device] = Device.get_devices(context.client, [member.device_uuid for member in network.get_members()])
 
     device: Device = get_device(context, args[1], devices)
     try:
@@ -329,8 +323,10 @@ def public_network_names(context: DeviceContext) -> list[str]:
 
 def invitation_network_names(context: DeviceContext) -> list[str]:
     return [
-        Network.get_by_uuid(context.client, invitation.network_uuid).name
-        for invitation in context.host.get_network_invitations()
+        network.name
+        for network in Network.get_by_uuids(
+            context.client, [invitation.network_uuid for invitation in context.host.get_network_invitations()]
+        )
     ]
 
 
@@ -362,12 +358,14 @@ def network_accept_deny_completer(context: DeviceContext, args: list[str]) -> li
             network: Network = get_network(context, args[0])
         except CommandError:
             return []
-        device_names: list[str] = []
-        for request in network.get_membership_requests():
-            try:
-                device_names.append(Device.get_device(context.client, request.device_uuid).name)
-            except DeviceNotFoundError:
-                pass
+        device_names: list[str] = [
+            device.name
+            for device in Device.get_devices(
+                context.client,
+                [request.device_uuid for request in network.get_membership_requests()],
+                skip_missing=True,
+            )
+        ]
         return [name for name in device_names if device_names.count(name) == 1]
     return []
 
@@ -391,8 +389,9 @@ def network_kick_completer(context: DeviceContext, args: list[str]) -> list[str]
             network: Network = get_network(context, args[0])
         except CommandError:
             return []
-        device_names: list[str] = []
-        for member in network.get_members():
-            device_names.append(Device.get_device(context.client, member.device_uuid).name)
+        device_names: list[str] = [
+            device.name
+            for device in Device.get_devices(context.client, [member.device_uuid for member in network.get_members()])
+        ]
         return [name for name in device_names if device_names.count(name) == 1]
     return []
@@ -0,0 +1,124 @@
+import re
+from fnmatch import fnmatchcase
+from typing import Iterator
+
+from .command import command, CommandError
+from .files import resolve_device_path
+from ..context import MainContext, DeviceContext
+from ..file_index import FileIndex
+from ..models import File
+
+
+def search_root(context: MainContext, spec: str) -> tuple[FileIndex, File]:
+    index, cwd, path = resolve_device_path(context, spec)
+    file: File | None = index.resolve(path, cwd)
+    if file is None:
+        raise CommandError(f"{spec}: No such file or directory.")
+    return index, file
+
+
+def walk_search_root(index: FileIndex, file: File, spec: str) -> Iterator[tuple[str, File]]:
+    yield spec, file
+    if file.is_directory:
+        separator: str = "" if spec.endswith(("/", ":")) else "/"
+        for path, child in index.walk(file):
+            yield spec + separator + path, child
+
+
+@command("find", [MainContext, DeviceContext])
+def handle_find(context: MainContext, args: list[str]) -> None:
+    """
+    Search for files by name
+    """
+
+    usage: str = "usage: find [[<device>:]<path>] [-name <pattern>] [-type f|d]"
+    spec: str = "."
+    options: list[str] = args
+    if args and not args[0].startswith("-"):
+        spec, *options = args
+    pattern: str | None = None
+    file_type: str | None = None
+    while options:
+        if len(options) < 2:
+            raise CommandError(usage)
+        option, value, *options = options
+        if option == "-name":
+            pattern = value
+        elif option == "-type" and value in ("f", "d"):
+            file_type = value
+        else:
+            raise CommandError(usage)
+
+    index, file = search_root(context, spec)
+    found: list[dict[str, str | bool | None]] = []
+    for path, result in walk_search_root(index, file, spec):
+        if result.name in (".", ".."):
+            continue
+        if pattern is not None and not fnmatchcase(result.name, pattern):
+            continue
+        if file_type is not None and result.is_directory != (file_type == "d"):
+            continue
+
+        if context.json_output:
+            found.append({"path": path, "uuid": result.uuid, "is_directory": result.is_directory})
+        else:
+            print(path)
+
+    if context.json_output:
+        context.print_json(found)
+
+
+@command("grep", [MainContext, DeviceContext])
+def handle_grep(context: MainContext, args: list[str]) -> None:
+    """
+    Search the content of files using a regular expression
+    """
+
+    flags: set[str] = set()
+    while args and args[0] in ("-i", "-l"):
+        flags.add(args.pop(0))
+    if len(args) < 2:
+        raise CommandError("usage: grep [-i] [-l] <regex> [<device>:]<path>")
+
+    *pattern, spec = args
+    try:
+        regex: re.Pattern[str] = re.compile(" ".join(pattern), re.IGNORECASE if "-i" in flags else 0)
+    except re.error as error:
+        raise CommandError(f"Invalid regular expression: {error}")
+
+    index, file = search_root(context, spec)
+    found: list[dict[str, str | int]] = []
+    for path, result in walk_search_root(index, file, spec):
+        if result.is_directory or not regex.search(result.content):
+            continue
+
+        for number, line in enumerate(result.content.splitlines(), 1):
+            if not regex.search(line):
+                continue
+
+            if context.json_output:
+                found.append({"path": path, "line": number, "text": line})
+            elif "-l" in flags:
+                print(path)
+                break
+            else:
+                print(f"{path}:{number}:{line}")
+
+    if context.json_output:
+        context.print_json(found)
+
+
+@handle_find.completer()
+def find_completer(context: MainContext, args: list[str]) -> list[str]:
+    if len(args) == 1 and isinstance(context, DeviceContext):
+        return context.file_path_completer(args[0], dirs_only=True)
+    if len(args) > 1 and len(args) % 2 == 0:
+        return ["-name", "-type"]
+    return []
+
+
+@handle_grep.completer()
+def grep_completer(context: MainContext, args: list[str]) -> list[str]:
+    if len(args) >= 2 and isinstance(context, DeviceContext) and args[-2] not in ("-i", "-l"):
+        return context.file_path_completer(args[-1])
+    return []
@@ -92,6 +92,10 @@ def handle_service_list(context: DeviceContext, _: Any) -> None:
     """
 
     services: list[Service] = context.host.get_services()
+    if context.json_output:
+        context.print_json(services)
+        return
+
     if not services:
         print("There are no services on this device.")
     else:
@@ -265,32 +269,33 @@ def handle_bruteforce(context: DeviceContext, args: list[str]) -> None:
     d = duration * steps
     i = 0
     last_check: float = 0
-    try:
-        context.update_presence(
-            state=f"Logged in: {context.username}@{context.root_context.host}",
-            details="Hacking Remote Device",
-            end=int(time.time()) + duration,
-            large_image="cryptic",
-            large_text="Cryptic",
-        )
-        for i in range(d):
-            if time.time() - last_check > 1:
-                last_check = time.time()
-                bruteforce_service.update()
-                if not bruteforce_service.running:
-                    print("\rBruteforce attack has been aborted.")
-                    return
-
-            progress: int = int(i / d * width)
-            j = i // steps
-            progress_bar = "[" + "=" * progress + ">" + " " * (width - progress) + "]"
-            text = f"\rBruteforcing {j // 60:02d}:{j % 60:02d} {progress_bar} ({i / d * 100:.1f}%) "
-            print(end=text, flush=True)
-            time.sleep(1 / steps)
-        i = (i + 1) // steps
-        print(f"\rBruteforcing {i // 60:02d}:{i % 60:02d} [" + "=" * width + ">] (100%) ")
-    except KeyboardInterrupt:
-        print()
+    with context.client.notifications.listen("service") as notifications:
+        try:
+            context.update_presence(
+                state=f"Logged in: {context.username}@{context.root_context.host}",
+                details="Hacking Remote Device",
+                end=int(time.time()) + duration,
+                large_image="cryptic",
+                large_text="Cryptic",
+            )
+            for i in range(d):
+                if notifications.poll() or time.time() - last_check > 1:
+                    last_check = time.time()
+                    bruteforce_service.update()
+                    if not bruteforce_service.running:
+                        print("\rBruteforce attack has been aborted.")
+                        return
+
+                progress: int = int(i / d * width)
+                j = i // steps
+                progress_bar = "[" + "=" * progress + ">" + " " * (width - progress) + "]"
+                text = f"\rBruteforcing {j // 60:02d}:{j % 60:02d} {progress_bar} ({i / d * 100:.1f}%) "
+                print(end=text, flush=True)
+                time.sleep(1 / steps)
+            i = (i + 1) // steps
+            print(f"\rBruteforcing {i // 60:02d}:{i % 60:02d} [" + "=" * width + ">] (100%) ")
+        except KeyboardInterrupt:
+            print()
     context.main_loop_presence()
     stop_bruteforce(context, bruteforce_service)
 
@@ -350,6 +355,9 @@ def handle_remote_list(context: MainContext, _: Any) -> None:
     """
 
     devices: list[Device] = context.get_hacked_devices()
+    if context.json_output:
+        context.print_json(devices)
+        return
 
     if not devices:
         print("You don't have access to any remote device.")
@@ -37,7 +37,7 @@ def handle_feedback(context: LoginContext, _: Any) -> None:
         feedback[0] += " from " + context.username
     while True:
         try:
-            feedback.append(input("> "))
+            feedback.append(context.input_no_history("> "))
         except (KeyboardInterrupt, EOFError):
             break
     print()
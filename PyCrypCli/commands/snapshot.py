@@ -0,0 +1,120 @@
+import time
+import zipfile
+from functools import partial
+from pathlib import Path
+from typing import Callable, Iterator
+
+from .command import command, CommandError
+from .help import print_help
+from .sync import resolve_remote_directory
+from ..archive import SnapshotArchive, SnapshotEntry
+from ..context import MainContext, DeviceContext
+from ..exceptions import SnapshotAlreadyExistsError, SnapshotNotFoundError
+from ..transfer import create_tree, walk_files
+
+
+def load_entries(archive: SnapshotArchive, name: str) -> Iterator[tuple[str, bool, Callable[[], str]]]:
+    entry: SnapshotEntry
+    for entry in archive.read(name):
+        load: Callable[[], str] = str
+        if entry.blob:
+            load = partial(archive.read_content, entry.blob)
+        yield entry.path, entry.is_directory, load
+
+
+def open_archive(path: str, write: bool = False) -> SnapshotArchive:
+    try:
+        return SnapshotArchive(Path(path).expanduser(), write)
+    except (OSError, zipfile.BadZipFile) as error:
+        raise CommandError(f"Could not open archive: {error}")
+
+
+@command("snapshot", [MainContext, DeviceContext])
+def handle_snapshot(context: MainContext, args: list[str]) -> None:
+    """
+    Export and import snapshots of device file systems
+    """
+
+    if args:
+        raise CommandError("Unknown subcommand.")
+    print_help(context, handle_snapshot)
+
+
+@handle_snapshot.subcommand("list")
+def handle_snapshot_list(context: MainContext, args: list[str]) -> None:
+    """
+    List the snapshots of an archive
+    """
+
+    if len(args) != 1:
+        raise CommandError("usage: snapshot list <archive>")
+
+    with open_archive(args[0]) as archive:
+        if context.json_output:
+            context.print_json(archive.snapshots)
+            return
+
+        if not archive.snapshots:
+            print("This archive does not contain any snapshots.")
+        else:
+            print(f"Snapshots ({len(archive.blobs)} unique file contents):")
+        for name in archive.snapshots:
+            print(f" - {name}")
+
+
+@handle_snapshot.subcommand("export")
+def handle_snapshot_export(context: MainContext, args: list[str]) -> None:
+    """
+    Add a snapshot of a directory tree to an archive
+    """
+
+    if len(args) not in (2, 3):
+        raise CommandError("usage: snapshot export <archive> [<device>:]<directory> [<name>]")
+
+    index, directory = resolve_remote_directory(context, args[1])
+    name: str = args[2] if len(args) == 3 else f"{index.device.name}-{time.strftime('%Y%m%d-%H%M%S')}"
+    if "/" in name:
+        raise CommandError("The name of a snapshot must not contain a slash.")
+
+    with open_archive(args[0], write=True) as archive:
+        try:
+            count, new_blobs = archive.export(name, walk_files(index.device, directory))
+        except SnapshotAlreadyExistsError as error:
+            raise CommandError(str(error))
+
+    if context.json_output:
+        context.print_json({"name": name, "files": count, "new_contents": new_blobs})
+    else:
+        print(f"Exported {count} files to snapshot {name} ({new_blobs} new file contents).")
+
+
+@handle_snapshot.subcommand("import")
+def handle_snapshot_import(context: MainContext, args: list[str]) -> None:
+    """
+    Recreate a snapshot of an archive in a directory
+    """
+
+    if len(args) != 3:
+        raise CommandError("usage: snapshot import <archive> <name> [<device>:]<directory>")
+
+    index, directory = resolve_remote_directory(context, args[2])
+    count: int = 0
+    errors: list[Exception] = []
+    with open_archive(args[0]) as archive:
+        try:
+            for result in create_tree(index.device, directory, load_entries(archive, args[1])):
+                if isinstance(result, Exception):
+                    errors.append(result)
+                else:
+                    count += 1
+        except SnapshotNotFoundError as error:
+            raise CommandError(str(error))
+        finally:
+            index.invalidate()
+
+    if context.json_output:
+        context.print_json({"name": args[1], "files": count, "errors": len(errors)})
+    else:
+        print(f"Imported {count} files from snapshot {args[1]}.")
+    if errors:
+        raise CommandError(f"{len(errors)} files could not be created: {errors[0]}")
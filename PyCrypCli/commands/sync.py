@@ -0,0 +1,190 @@
+import shutil
+from pathlib import Path
+
+from .command import command, CommandError
+from .files import resolve_device_path
+from ..context import MainContext, DeviceContext
+from ..file_index import FileIndex
+from ..models import File
+from ..transfer import COPY_BATCH_SIZE
+from ..util import chunks
+
+
+def parse_sync_args(args: list[str], usage: str) -> tuple[bool, list[str]]:
+    delete: bool = "--delete" in args
+    args = [arg for arg in args if arg != "--delete"]
+    if len(args) != 2:
+        raise CommandError(usage)
+    return delete, args
+
+
+def resolve_remote_directory(context: MainContext, spec: str) -> tuple[FileIndex, File]:
+    index, cwd, path = resolve_device_path(context, spec)
+    directory: File | None = index.resolve(path, cwd)
+    if directory is None:
+        raise CommandError("No such file or directory.")
+    if not directory.is_directory:
+        raise CommandError("Not a directory.")
+    return index, directory
+
+
+def is_safe_name(name: str) -> bool:
+    # file names come from the device and must not escape the local directory
+    return name not in ("", ".", "..") and "/" not in name and "\0" not in name
+
+
+def remove_local(path: Path) -> None:
+    if path.is_dir():
+        shutil.rmtree(path)
+    else:
+        path.unlink()
+
+
+def print_summary(context: MainContext, created: int, updated: int, deleted: int, unchanged: int) -> None:
+    if context.json_output:
+        context.print_json({"created": created, "updated": updated, "deleted": deleted, "unchanged": unchanged})
+    else:
+        print(f"{created} created, {updated} updated, {deleted} deleted, {unchanged} unchanged")
+
+
+@command("pull", [MainContext, DeviceContext])
+def handle_pull(context: MainContext, args: list[str]) -> None:
+    """
+    Mirror a directory of a device to a local directory
+    """
+
+    delete, args = parse_sync_args(args, "usage: pull [--delete] [<device>:]<directory> <local directory>")
+    index, directory = resolve_remote_directory(context, args[0])
+    local_root: Path = Path(args[1]).expanduser()
+    if local_root.exists() and not local_root.is_dir():
+        raise CommandError("The local path is not a directory.")
+    local_root.mkdir(parents=True, exist_ok=True)
+
+    created = updated = deleted = unchanged = 0
+    remote_paths: set[str] = set()
+    rejected: list[str] = []
+    resolved_root: Path = local_root.resolve()
+    for path, file in index.walk(directory):
+        if file.name in (".", "..") or any(path.startswith(other + "/") for other in rejected):
+            continue
+
+        local: Path = local_root / path
+        if not is_safe_name(file.name) or not local.resolve().is_relative_to(resolved_root):
+            print(f"Skipping {path} (not a valid local file name)")
+            rejected.append(path)
+            continue
+
+        remote_paths.add(path)
+        if local.exists() and local.is_dir() != file.is_directory:
+            if not delete:
+                raise CommandError(f"{local} has a different type on the device (use --delete to replace it).")
+            remove_local(local)
+            deleted += 1
+
+        if file.is_directory:
+            if not local.exists():
+                local.mkdir()
+                created += 1
+            continue
+
+        content: bytes = file.content.encode()
+        if not local.exists():
+            created += 1
+        elif local.read_bytes() == content:
+            unchanged += 1
+            continue
+        else:
+            updated += 1
+        local.write_bytes(content)
+
+    if delete:
+        for local in sorted(local_root.rglob("*"), reverse=True):
+            if local.relative_to(local_root).as_posix() not in remote_paths:
+                remove_local(local)
+                deleted += 1
+
+    print_summary(context, created, updated, deleted, unchanged)
+
+
+@command("push", [MainContext, DeviceContext])
+def handle_push(context: MainContext, args: list[str]) -> None:
+    """
+    Mirror a local directory to a directory of a device
+    """
+
+    delete, args = parse_sync_args(args, "usage: push [--delete] <local directory> [<device>:]<directory>")
+    local_root: Path = Path(args[0]).expanduser()
+    if not local_root.is_dir():
+        raise CommandError("The local directory does not exist.")
+    index, directory = resolve_remote_directory(context, args[1])
+
+    local: dict[str, Path] = {}
+    for local_path in sorted(local_root.rglob("*")):
+        if local_path.is_dir() or local_path.is_file():
+            local[local_path.relative_to(local_root).as_posix()] = local_path
+    remote: dict[str, File] = dict(index.walk(directory))
+
+    conflicts: list[str] = [
+        path for path, file in remote.items() if path in local and local[path].is_dir() != file.is_directory
+    ]
+    if conflicts and not delete:
+        raise CommandError(f"{conflicts[0]} has a different type locally (use --delete to replace it).")
+
+    # only the topmost files have to be deleted, as deleting a directory also deletes its children
+    obsolete: list[str] = [path for path in remote if path not in local or path in conflicts] if delete else []
+    obsolete = [path for path in obsolete if not any(path.startswith(other + "/") for other in obsolete)]
+    errors: list[Exception] = []
+    for batch in chunks(obsolete, COPY_BATCH_SIZE):
+        errors += [error for error in index.device.delete_files([remote[path] for path in batch]) if error is not None]
+    for path in list(remote):
+        if any(path == other or path.startswith(other + "/") for other in obsolete):
+            del remote[path]
+
+    contents: dict[str, str] = {}
+    for path, local_file in local.items():
+        if local_file.is_file():
+            try:
+                contents[path] = local_file.read_text()
+            except UnicodeDecodeError:
+                print(f"Skipping {local_file} (not a text file)")
+
+    changed: list[tuple[File, str]] = [
+        (remote[path], content)
+        for path, content in contents.items()
+        if path in remote and content != remote[path].content
+    ]
+    unchanged: int = sum(path in remote for path in contents) - len(changed)
+    for changed_batch in chunks(changed, COPY_BATCH_SIZE):
+        errors += [result for result in index.device.edit_files(changed_batch) if isinstance(result, Exception)]
+
+    # files are created level by level, so every parent directory exists before its children are created
+    missing: list[str] = [path for path in local if path not in remote and (path in contents or local[path].is_dir())]
+    created: int = 0
+    for depth in sorted({path.count("/") for path in missing}):
+        level: list[tuple[str, str | None]] = []
+        for path in missing:
+            parent_path: str = path.rpartition("/")[0]
+            if path.count("/") != depth:
+                continue
+            if parent_path and parent_path not in remote:
+                continue  # the parent directory could not be created
+            level.append((path, remote[parent_path].uuid if parent_path else directory.uuid))
+
+        for batch_paths in chunks(level, COPY_BATCH_SIZE):
+            results: list[File | Exception] = index.device.create_files(
+                [
+                    (path.rpartition("/")[2], contents.get(path, ""), local[path].is_dir(), parent)
+                    for path, parent in batch_paths
+                ]
+            )
+            for (path, _), result in zip(batch_paths, results):
+                if isinstance(result, Exception):
+                    errors.append(result)
+                else:
+                    remote[path] = result
+                    created += 1
+
+    index.invalidate()
+    print_summary(context, created, len(changed), len(obsolete), unchanged)
+    if errors:
+        raise CommandError(f"{len(errors)} changes could not be applied: {errors[0]}")
@@ -1,11 +1,19 @@
 from __future__ import annotations
 
-from typing import Callable, TYPE_CHECKING, TypeVar
+import getpass
+import json
+from typing import Any, Callable, TYPE_CHECKING, TypeVar
 
 import readline
-from pypresence import PyPresenceException
+from pydantic.json import pydantic_encoder
 
 from ..client import Client
+from ..exceptions import (
+    MicroserviceException,
+    InvalidServerResponseError,
+    UnknownMicroserviceError,
+    NonInteractiveError,
+)
 
 if TYPE_CHECKING:
     from .root_context import RootContext
@@ -19,6 +27,9 @@ class Context:
         self.override_completions: list[str] | None = None
         self.history: list[str] = []
 
+        self.refreshed: bool = False
+        self.refresh_failed: bool = False
+
     def add_to_history(self, command: str) -> None:
         if self.history[-1:] != [command]:
             self.history.append(command)
@@ -27,10 +38,28 @@ class Context:
     def prompt(self) -> str:
         return "$ "
 
+    @property
+    def stale_indicator(self) -> str:
+        return "\033[38;2;255;193;7m(stale)\033[0m " * self.refresh_failed
+
     @property
     def client(self) -> Client:
         return self.root_context.client
 
+    @property
+    def json_output(self) -> bool:
+        return self.root_context.json_output
+
+    @property
+    def interactive(self) -> bool:
+        return self.root_context.interactive
+
+    def print_json(self, data: Any) -> None:
+        if self.root_context.json_results is not None:
+            self.root_context.json_results.append(data)
+        else:
+            print(json.dumps(data, default=pydantic_encoder))
+
     def get_commands(self) -> dict[str, Command]:
         return self.root_context.get_commands()
 
@@ -59,15 +88,9 @@ class Context:
         large_image: str | None = None,
         large_text: str | None = None,
     ) -> None:
-        if self.root_context.presence is None:
-            return
-
-        try:
-            self.root_context.presence.update(
-                state=state, details=details, start=start, end=end, large_image=large_image, large_text=large_text
-            )
-        except PyPresenceException:
-            pass
+        self.root_context.update_presence(
+            state=state, details=details, start=start, end=end, large_image=large_image, large_text=large_text
+        )
 
     def enter_context(self) -> None:
         readline.clear_history()
@@ -79,6 +102,9 @@ class Context:
         self.restore_history()
 
     def input_no_history(self, prompt: str, override_completions: list[str] | None = None) -> str:
+        if not self.interactive:
+            raise NonInteractiveError(prompt)
+
         readline.clear_history()
         old_override = self.override_completions
         self.override_completions = override_completions or []
@@ -88,6 +114,12 @@ class Context:
             self.restore_history()
             self.override_completions = old_override
 
+    def input_password(self, prompt: str) -> str:
+        if not self.interactive:
+            raise NonInteractiveError(prompt)
+
+        return getpass.getpass(prompt)
+
     def restore_history(self) -> None:
         readline.clear_history()
         for command in self.history:
@@ -99,10 +131,21 @@ class Context:
     def close(self) -> None:
         self.root_context.close()
 
-    def loop_tick(self) -> None:
+    def refresh(self) -> None:
         pass
 
+    def update_state(self) -> None:
+        # only errors of single requests mark the state as stale, losing the session or the connection is not
+        try:
+            self.refresh()
+        except (MicroserviceException, InvalidServerResponseError, UnknownMicroserviceError):
+            self.refresh_failed = True
+        else:
+            self.refresh_failed = False
+        self.refreshed = True
+
     def before_command(self) -> bool:
+        self.root_context.invalidate_stale_file_indices()
         return True
 
 
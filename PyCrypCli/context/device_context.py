@@ -1,47 +1,71 @@
 import readline
+import time
+from typing import Any
 
 from .context import Context
 from .main_context import MainContext
 from .root_context import RootContext
 from ..exceptions import InvalidWalletFileError
-from ..models import Device, File, Service, PublicService
+from ..file_index import FileIndex
+from ..models import Device, File, FileInfo, Service, PublicService
 from ..util import extract_wallet
 
+# maximum time in seconds between two refreshes of the device state if no notification has been received
+REFRESH_INTERVAL = 60
+
 
 class DeviceContext(MainContext):
     def __init__(self, root_context: RootContext, session_token: str, device: Device):
         super().__init__(root_context, session_token)
 
         self.host: Device = device
+        self.file_index: FileIndex = root_context.get_file_index(device)
         self.pwd: File = self.get_root_dir()
         self.last_portscan: tuple[str, list[PublicService]] | None = None
 
+        self.has_access: bool = True
+        self.stale: bool = True
+        self.last_refresh: float = 0
+
     def update_pwd(self) -> None:
-        if self.pwd.uuid:
-            self.pwd = self.host.get_file(self.pwd.uuid)
+        self.pwd = self.pwd.update()
 
     def is_localhost(self) -> bool:
         return self.user_uuid == self.host.owner_uuid
 
     @property
     def prompt(self) -> str:
-        self.update_pwd()
         if self.is_localhost():
             color = "\033[38;2;100;221;23m"
         else:
             color = "\033[38;2;255;64;23m"
-        return f"{color}[{self.username}@{self.host.name}:{self.file_to_path(self.pwd)}]$\033[0m "
+        return f"{self.stale_indicator}{color}[{self.username}@{self.host.name}:{self.file_to_path(self.pwd)}]$\033[0m "
+
+    def handle_notification(self, notification: dict[str, Any]) -> None:
+        self.stale = True
+
+    def refresh(self) -> None:
+        super().refresh()
+
+        if self.stale or self.refresh_failed or time.time() - self.last_refresh > REFRESH_INTERVAL:
+            self.refresh_device()
 
-    def loop_tick(self) -> None:
-        super().loop_tick()
+    def refresh_device(self) -> None:
+        self.stale = False
+        self.last_refresh = time.time()
 
         self.host.update()
-        self.check_device_permission()
+        self.file_index.stale = True
+        self.update_pwd()
+        self.update_device_permission()
+
+    def update_device_permission(self) -> None:
+        self.has_access = self.host.owner_uuid == self.user_uuid or any(
+            service.device_uuid == self.host.uuid for service in Service.list_part_owner(self.client)
+        )
 
     def check_device_permission(self) -> bool:
-        if self.host.owner_uuid != self.user_uuid and all(
-            service.device_uuid != self.host.uuid for service in Service.list_part_owner(self.client)
-        ):
+        if not self.has_access:
             print("You don't have access to this device anymore.")
             self.close()
             return False
@@ -57,37 +81,37 @@ class DeviceContext(MainContext):
         return True
 
     def before_command(self) -> bool:
-        return self.check_device_permission() and self.check_powered_on()
+        return super().before_command() and self.check_device_permission() and self.check_powered_on()
 
     def enter_context(self) -> None:
         Context.enter_context(self)
 
+        self.client.notifications.subscribe(self.handle_notification, "device")
+        self.client.notifications.subscribe(self.handle_notification, "service")
+
     def leave_context(self) -> None:
-        pass
+        self.client.notifications.unsubscribe(self.handle_notification)
 
     def reenter_context(self) -> None:
         Context.reenter_context(self)
 
     def get_files(self, parent_dir_uuid: str | None) -> list[File]:
-        return self.host.get_files(parent_dir_uuid)
+        return self.file_index.get_files(parent_dir_uuid)
+
+    def get_listing(self, parent_dir_uuid: str | None) -> list[FileInfo]:
+        return self.file_index.get_listing(parent_dir_uuid)
 
     def get_parent_dir(self, file: File) -> File:
-        if file.parent_dir_uuid is None:
-            return self.get_root_dir()
-        return self.host.get_file(file.parent_dir_uuid)
+        return self.file_index.get_parent_dir(file)
 
     def get_root_dir(self) -> File:
-        return File.get_root_directory(self.client, self.host.uuid)
+        return self.host.get_root_directory()
 
     def get_file(self, filename: str, directory_uuid: str | None) -> File | None:
-        files: list[File] = self.get_files(directory_uuid)
-        for file in files:
-            if file.name == filename:
-                return file
-        return None
+        return self.file_index.find(filename, directory_uuid)
 
     def get_filenames(self, directory: str) -> list[str]:
-        return [file.name for file in self.get_files(directory)]
+        return [file.name for file in self.get_listing(directory)]
 
     def get_wallet_credentials_from_file(self, filepath: str) -> tuple[str, str]:
         file: File | None = self.path_to_file(filepath)
@@ -111,28 +135,12 @@ class DeviceContext(MainContext):
             readline.set_completer_delims("/")
         return [
             file.name + "/\0" * file.is_directory
-            for file in self.get_files(base_dir.uuid)
+            for file in self.get_listing(base_dir.uuid)
             if file.is_directory or not dirs_only
         ] + ["./\0", "../\0"] * path.split("/")[-1].startswith(".")
 
     def path_to_file(self, path: str) -> File | None:
-        pwd: File = self.get_root_dir() if path.startswith("/") else self.pwd
-        for file_name in path.split("/"):
-            if not file_name or file_name == ".":
-                continue
-            if file_name == "..":
-                pwd = self.get_parent_dir(pwd)
-            else:
-                if not (file := self.get_file(file_name, pwd.uuid)):
-                    return None
-                pwd = file
-        return pwd
+        return self.file_index.resolve(path, self.pwd)
 
     def file_to_path(self, file: File) -> str:
-        if file.is_root_directory:
-            return "/"
-
-        path: list[File] = [file]
-        while path[-1].parent_dir_uuid is not None:
-            path.append(self.host.get_file(path[-1].parent_dir_uuid))
-        return "/" + "/".join(f.name for f in path[::-1])
+        return self.file_index.get_path(file)
@@ -18,14 +18,14 @@ class MainContext(LoginContext):
 
     @property
     def prompt(self) -> str:
-        return f"\033[38;2;53;160;171m[{self.username}]$\033[0m "
+        return f"{self.stale_indicator}\033[38;2;53;160;171m[{self.username}]$\033[0m "
 
     def update_user_info(self) -> None:
         info: InfoResponse = self.root_context.client.info()
         self.username = info.name
         self.user_uuid = info.uuid
 
-    def loop_tick(self) -> None:
+    def refresh(self) -> None:
         self.update_user_info()
 
     def enter_context(self) -> None:
@@ -77,6 +77,5 @@ class MainContext(LoginContext):
         return Wallet.get_wallet(self.client, *wallet)
 
     def get_hacked_devices(self) -> list[Device]:
-        return list(
-            {Device.get_device(self.client, service.device_uuid) for service in Service.list_part_owner(self.client)}
-        )
+        device_uuids: list[str] = [service.device_uuid for service in Service.list_part_owner(self.client)]
+        return Device.get_devices(self.client, list(dict.fromkeys(device_uuids)))
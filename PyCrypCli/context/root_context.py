@@ -1,22 +1,33 @@
 from __future__ import annotations
 
+import asyncio
 import re
 from pathlib import Path
-from typing import Type, TYPE_CHECKING
+from threading import Lock, Thread
+from typing import Any, Type, TYPE_CHECKING
 
 from pypresence import Presence, PyPresenceException
 
 from .context import Context
 from ..client import Client
 from ..exceptions import InvalidServerURLError
-from ..models import Config
+from ..file_index import FileIndex
+from ..models import Config, Device
 
 if TYPE_CHECKING:
     from ..commands import Command
 
 
 class RootContext:
-    def __init__(self, server: str, config_file: Path, commands: dict[Type[Context], dict[str, Command]]):
+    def __init__(
+        self,
+        server: str,
+        config_file: Path,
+        commands: dict[Type[Context], dict[str, Command]],
+        presence: bool = True,
+        json_output: bool = False,
+        interactive: bool = True,
+    ):
         self.client: Client = Client(server)
 
         if not (match := re.match(r"^wss?://(.+)$", server)):
@@ -30,11 +41,67 @@ class RootContext:
 
         self.commands: dict[Type[Context], dict[str, Command]] = commands
 
+        # print the results of commands as json instead of formatted text
+        self.json_output: bool = json_output
+        # json documents printed by the running command, collected while its text output is captured
+        self.json_results: list[Any] | None = None
+
+        # commands fail instead of reading from stdin if they need any input
+        self.interactive: bool = interactive
+
+        # file system indices of all devices visited in this session, dropped whenever a device reports a change
+        self.file_indices: dict[str, FileIndex] = {}
+        self.client.notifications.subscribe(self.mark_file_indices_stale, "device")
+
+        self.presence: Presence | None = None
+        self.presence_state: dict[str, Any] | None = None
+        self.presence_lock: Lock = Lock()
+        if presence:
+            Thread(target=self.connect_presence, daemon=True).start()
+
+    # the most recent presence update is replayed once the connection has been established
+    def connect_presence(self) -> None:
         try:
-            self.presence: Presence = Presence(client_id="596676243144048640")
-            self.presence.connect()
+            # this thread has no event loop, so pypresence needs its own
+            presence: Presence = Presence(client_id="596676243144048640", loop=asyncio.new_event_loop())
+            presence.connect()
         except (PyPresenceException, FileNotFoundError, ConnectionRefusedError):
-            self.presence = None
+            return
+
+        with self.presence_lock:
+            self.presence = presence
+            if self.presence_state is not None:
+                self._send_presence(self.presence_state)
+
+    def update_presence(self, **state: Any) -> None:
+        with self.presence_lock:
+            self.presence_state = state
+            if self.presence is not None:
+                self._send_presence(state)
+
+    def _send_presence(self, state: dict[str, Any]) -> None:
+        if self.presence is None:
+            return
+
+        try:
+            self.presence.update(**state)
+        except PyPresenceException:
+            pass
+
+    def get_file_index(self, device: Device) -> FileIndex:
+        if (index := self.file_indices.get(device.uuid)) is None:
+            index = self.file_indices[device.uuid] = FileIndex(device)
+        return index
+
+    def mark_file_indices_stale(self, _: Any = None) -> None:
+        # notifications are handled on the reader thread, which must not clear an index that is being used
+        for index in list(self.file_indices.values()):
+            index.stale = True
+
+    def invalidate_stale_file_indices(self) -> None:
+        for index in self.file_indices.values():
+            if index.stale:
+                index.invalidate()
 
     def open(self, context: Context) -> None:
         self.context_stack.append(context)
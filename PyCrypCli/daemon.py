@@ -0,0 +1,173 @@
+import json
+import os
+import socket
+import sys
+from pathlib import Path
+from socketserver import StreamRequestHandler, ThreadingUnixStreamServer
+from threading import Lock, Thread
+from typing import Any, Iterable
+
+from .commands import Command
+from .context import Context, RootContext
+from .exceptions import DaemonError, MicroserviceException
+from .output import capture_output, install_thread_output
+from .script import ScriptRunner
+
+
+# one json request and one json response per line
+class DaemonRequestHandler(StreamRequestHandler):
+    server: "Daemon"
+
+    def handle(self) -> None:
+        session: list[Context] = self.server.open_session()
+        try:
+            self.handle_requests(session)
+        finally:
+            self.server.close_session(session)
+
+    def handle_requests(self, session: list[Context]) -> None:
+        for line in self.rfile:
+            response: dict[str, Any]
+            try:
+                response = self.server.process(json.loads(line), session)
+            except MicroserviceException as error:
+                response = {"error": type(error).__name__, "message": str(error), "params": error.params}
+            except Exception as error:  # noqa: B902
+                response = {"error": type(error).__name__, "message": str(error)}
+
+            self.wfile.write(json.dumps(response).encode() + b"\n")
+            if response.get("closed"):
+                return
+
+
+# every connection gets its own context stack starting at the logged in session, commands run one at a time
+class Daemon(ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path: Path, root_context: RootContext):
+        if path.exists():
+            try:
+                DaemonClient(path).close()
+            except OSError:
+                path.unlink()
+            else:
+                raise DaemonError("AlreadyRunning", f"Another daemon is already listening on {path}")
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        super().__init__(str(path), DaemonRequestHandler)
+        os.chmod(path, 0o600)
+
+        self.path: Path = path
+        self.root_context: RootContext = root_context
+        self.runner: ScriptRunner = ScriptRunner(root_context)
+        self.command_lock: Lock = Lock()
+        self.base_stack: list[Context] = root_context.context_stack
+        install_thread_output()
+
+    def open_session(self) -> list[Context]:
+        return list(self.base_stack)
+
+    def close_session(self, session: list[Context]) -> None:
+        with self.command_lock:
+            self.root_context.context_stack = session
+            try:
+                while len(session) > len(self.base_stack):
+                    self.root_context.close()
+            finally:
+                self.root_context.context_stack = self.base_stack
+
+    def process(self, request: dict[str, Any], session: list[Context]) -> dict[str, Any]:
+        if "ms" in request:
+            return {
+                "result": self.root_context.client.ms_submit(
+                    request["ms"], request["endpoint"], **request.get("data", {})
+                ).result()
+            }
+
+        if "command" in request:
+            if self.is_exit(request["command"], session):
+                # only this connection is closed, the shared session is kept open for other clients
+                return {"ok": True, "output": "", "closed": True}
+
+            with self.command_lock, capture_output() as output:
+                self.root_context.context_stack = session
+                try:
+                    ok: bool = self.runner.execute(request["command"])
+                except SystemExit:
+                    ok = True
+                finally:
+                    self.root_context.context_stack = self.base_stack
+
+                if not self.root_context.client.logged_in:
+                    # the session has been closed by the command, so there is nothing left to serve
+                    Thread(target=self.shutdown, daemon=True).start()
+            return {"ok": ok, "output": output.getvalue()}
+
+        raise ValueError("Request must contain either `ms` or `command`")
+
+    def is_exit(self, line: str, session: list[Context]) -> bool:
+        cmd: str = line.strip().split(" ")[0]
+        command: Command | None = session[-1].get_commands().get(cmd)
+        return len(session) == len(self.base_stack) and command is not None and command.name == "exit"
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.path.unlink(missing_ok=True)
+
+
+class DaemonClient:
+    def __init__(self, path: Path):
+        self.socket: socket.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            self.socket.connect(str(path))
+        except OSError:
+            self.socket.close()
+            raise
+        self.file = self.socket.makefile("rwb")
+        self.closed: bool = False
+
+    def request(self, request: dict[str, Any]) -> dict[str, Any]:
+        self.file.write(json.dumps(request).encode() + b"\n")
+        self.file.flush()
+
+        line: bytes = self.file.readline()
+        if not line:
+            raise ConnectionError("Daemon closed the connection")
+
+        response: dict[str, Any] = json.loads(line)
+        if "error" in response:
+            for exception in MicroserviceException.__subclasses__():
+                if exception.__name__ == response["error"]:
+                    raise exception(response.get("params"))
+            raise DaemonError(response["error"], response["message"])
+
+        return response
+
+    def ms(self, ms: str, endpoint: list[str], **data: Any) -> dict[str, Any]:
+        result: dict[str, Any] = self.request({"ms": ms, "endpoint": endpoint, "data": data})["result"]
+        return result
+
+    def command(self, line: str) -> tuple[bool, str]:
+        response: dict[str, Any] = self.request({"command": line})
+        self.closed = response.get("closed", False)
+        return response["ok"], response["output"]
+
+    def close(self) -> None:
+        self.file.close()
+        self.socket.close()
+
+
+def run_remote_script(path: Path, lines: Iterable[str]) -> int:
+    client: DaemonClient = DaemonClient(path)
+    failed: int = 0
+    try:
+        for line in lines:
+            ok, output = client.command(line)
+            sys.stdout.write(output)
+            failed += not ok
+            if client.closed:
+                break
+    finally:
+        client.close()
+
+    return 1 if failed else 0
@@ -20,6 +20,38 @@ class NoDocStringError(Exception):
         super().__init__(f"The {'sub' * subcommand}command {name} is missing a docstring.")
 
 
+class CommandManifestError(Exception):
+    def __init__(self, name: str):
+        super().__init__(f"The command {name} does not match its entry in the command manifest.")
+
+
+class NonInteractiveError(Exception):
+    def __init__(self, prompt: str):
+        super().__init__(f"Cannot ask for input in non-interactive mode: {prompt.strip()}")
+
+
+class FileTypeConflictError(Exception):
+    def __init__(self, name: str, is_directory: bool):
+        super().__init__(f"{name} already exists as a {'directory' if is_directory else 'file'}.")
+        self.name: str = name
+
+
+class DaemonError(Exception):
+    def __init__(self, error: str, message: str):
+        super().__init__(message)
+        self.error: str = error
+
+
+class SnapshotAlreadyExistsError(Exception):
+    def __init__(self, name: str):
+        super().__init__(f"The snapshot {name} already exists.")
+
+
+class SnapshotNotFoundError(Exception):
+    def __init__(self, name: str):
+        super().__init__(f"The snapshot {name} does not exist.")
+
+
 class LoggedInError(Exception):
     def __init__(self) -> None:
         super().__init__("Endpoint cannot be used while client is logged in.")
@@ -0,0 +1,318 @@
+from __future__ import annotations
+
+import re
+from collections import deque
+from concurrent.futures import Future
+from fnmatch import fnmatchcase
+from functools import partial
+from threading import RLock
+from typing import Iterator, Sequence, cast
+
+from .models import Device, File, FileInfo
+
+# maximum number of directories that are listed with one pipelined batch of requests
+LIST_BATCH_SIZE = 256
+
+GLOB_CHARACTERS = "*?["
+
+
+def join_path(path: str, name: str) -> str:
+    return path + name if not path or path.endswith("/") else f"{path}/{name}"
+
+
+# a backslash makes the following character literal, e.g. `a\[1\].txt`
+def is_pattern(path: str) -> bool:
+    escaped: bool = False
+    for c in path:
+        if escaped:
+            escaped = False
+        elif c == "\\":
+            escaped = True
+        elif c in GLOB_CHARACTERS:
+            return True
+    return False
+
+
+def unescape(path: str) -> str:
+    return re.sub(r"\\(.)", r"\1", path)
+
+
+def to_fnmatch(name: str) -> str:
+    return re.sub(r"\\(.)", lambda match: f"[{match[1]}]" if match[1] in GLOB_CHARACTERS else match[1], name)
+
+
+# listings are kept until the index is invalidated, commands report their changes via add, update and remove
+# listings for browsing (get_listing) do not keep the content of files
+class FileIndex:
+    def __init__(self, device: Device):
+        self.device: Device = device
+        self.files: dict[str, FileInfo] = {}
+        self.children: dict[str | None, dict[str, str]] = {}
+        self.pending: dict[str | None, Future[list[FileInfo]]] = {}
+        # directories to prefetch as (uuid, recursive, light), sent while fewer than LIST_BATCH_SIZE are in flight
+        self.queued: deque[tuple[str | None, bool, bool]] = deque()
+        self.in_flight: int = 0
+        self.generation: int = 0
+        self.lock: RLock = RLock()
+        # set by other threads (e.g. for notifications), the index is only cleared by the thread executing commands
+        self.stale: bool = False
+
+    def invalidate(self) -> None:
+        with self.lock:
+            self.stale = False
+            self.files.clear()
+            self.children.clear()
+            self.pending.clear()
+            self.queued.clear()
+            self.in_flight = 0
+            self.generation += 1
+
+    def load_directory(self, parent_dir_uuid: str | None, light: bool = False) -> dict[str, str]:
+        self.send_prefetches()
+        with self.lock:
+            future: Future[list[FileInfo]] | None = self.pending.pop(parent_dir_uuid, None)
+        if future is not None:
+            children: dict[str, str] = self.store_directory(parent_dir_uuid, future.result())
+            if light or self.is_complete(children):
+                return children
+
+        if light:
+            return self.store_directory(parent_dir_uuid, self.device.get_listing(parent_dir_uuid))
+        return self.store_directory(parent_dir_uuid, self.device.get_files(parent_dir_uuid))
+
+    def submit(self, parent_dir_uuid: str | None, light: bool) -> Future[list[FileInfo]]:
+        if light:
+            return self.device.submit_get_listing(parent_dir_uuid)
+        return cast(Future[list[FileInfo]], self.device.submit_get_files(parent_dir_uuid))
+
+    # with `recursive`, subdirectories are queued once their listing arrives and requested by later operations
+    def prefetch(self, parent_dir_uuids: list[str | None], recursive: bool = False, light: bool = False) -> None:
+        with self.lock:
+            self.queued.extend((uuid, recursive, light) for uuid in parent_dir_uuids)
+        self.send_prefetches()
+
+    def send_prefetches(self) -> None:
+        # requests are never sent while holding the lock, which is also needed by the reader thread (see prefetched)
+        while True:
+            with self.lock:
+                if not self.queued or self.in_flight >= LIST_BATCH_SIZE:
+                    return
+
+                uuid, recursive, light = self.queued.popleft()
+                if (children := self.children.get(uuid)) is not None and (light or self.is_complete(children)):
+                    if recursive:
+                        self.queued.extend((c, True, light) for c in children.values() if self.files[c].is_directory)
+                    continue
+                if uuid in self.pending:
+                    continue
+
+                self.in_flight += 1
+                generation: int = self.generation
+
+            future: Future[list[FileInfo]] = self.submit(uuid, light)
+            with self.lock:
+                if generation == self.generation:
+                    self.pending[uuid] = future
+            future.add_done_callback(partial(self.prefetched, generation, recursive, light))
+
+    def prefetched(self, generation: int, recursive: bool, light: bool, response: Future[list[FileInfo]]) -> None:
+        # called on the reader thread, so the subdirectories are only queued and sent by the next index operation
+        with self.lock:
+            if generation != self.generation:
+                return  # the index has been invalidated
+
+            self.in_flight -= 1
+            if recursive and not response.cancelled() and response.exception() is None:
+                self.queued.extend((file.uuid, True, light) for file in response.result() if file.is_directory)
+
+    def load_directories(self, parent_dir_uuids: list[str | None]) -> None:
+        self.send_prefetches()
+        missing: list[str | None] = [
+            uuid
+            for uuid in dict.fromkeys(parent_dir_uuids)
+            if (children := self.children.get(uuid)) is None
+            or not self.is_consistent(uuid, children)
+            or not self.is_complete(children)
+        ]
+        while missing:
+            batch: list[str | None] = missing[:LIST_BATCH_SIZE]
+            missing = missing[LIST_BATCH_SIZE:]
+            with self.lock:
+                prefetched: list[Future[list[FileInfo]] | None] = [self.pending.pop(uuid, None) for uuid in batch]
+            futures: list[Future[list[FileInfo]]] = [
+                future or self.submit(uuid, light=False) for uuid, future in zip(batch, prefetched)
+            ]
+            for uuid, future in zip(batch, futures):
+                if not self.is_complete(self.store_directory(uuid, future.result())):
+                    missing.append(uuid)  # a listing without contents has been prefetched
+
+    def store_directory(self, parent_dir_uuid: str | None, files: Sequence[FileInfo]) -> dict[str, str]:
+        children: dict[str, str] = {}
+        for file in files:
+            self.files[file.uuid] = file  # type: ignore
+            children[file.name] = file.uuid  # type: ignore
+        self.children[parent_dir_uuid] = children
+        return children
+
+    # breadth first, the listings of one level are fetched at once
+    def walk(self, directory: File) -> Iterator[tuple[str, File]]:
+        level: list[tuple[str, File]] = [("", directory)]
+        while level:
+            self.load_directories([file.uuid for _, file in level])
+            next_level: list[tuple[str, File]] = []
+            for path, parent in level:
+                for file in self.get_files(parent.uuid):
+                    file_path: str = f"{path}/{file.name}" if path else file.name
+                    yield file_path, file
+                    if file.is_directory:
+                        next_level.append((file_path, file))
+            level = next_level
+
+    def get_files(self, parent_dir_uuid: str | None) -> list[File]:
+        children: dict[str, str] | None = self.children.get(parent_dir_uuid)
+        if children is None or not self.is_consistent(parent_dir_uuid, children) or not self.is_complete(children):
+            children = self.load_directory(parent_dir_uuid)
+        return [file for uuid in children.values() if isinstance(file := self.files[uuid], File)]
+
+    # the files may not include their content
+    def get_listing(self, parent_dir_uuid: str | None) -> list[FileInfo]:
+        children: dict[str, str] | None = self.children.get(parent_dir_uuid)
+        if children is None or not self.is_consistent(parent_dir_uuid, children):
+            children = self.load_directory(parent_dir_uuid, light=True)
+        return [self.files[uuid] for uuid in children.values()]
+
+    def get_file(self, file_uuid: str) -> File:
+        if not isinstance(file := self.files.get(file_uuid), File):
+            file = self.device.get_file(file_uuid)
+            self.files[file_uuid] = file
+        return file
+
+    def get_parent_dir(self, file: File) -> File:
+        if file.parent_dir_uuid is None:
+            return self.device.get_root_directory()
+        return self.get_file(file.parent_dir_uuid)
+
+    def resolve(self, path: str, cwd: File | None = None) -> File | None:
+        file: File = self.device.get_root_directory() if cwd is None or path.startswith("/") else cwd
+        for name in path.split("/"):
+            if not name or name == ".":
+                continue
+            if name == "..":
+                file = self.get_parent_dir(file)
+            elif (child := self.find(name, file.uuid)) is None:
+                return None
+            else:
+                file = child
+        return file
+
+    # `**` matches any number of nested directories, names starting with a dot only match patterns starting with one
+    # like in bash without nullglob, a pattern that does not match anything is used as a literal path
+    def glob(self, pattern: str, cwd: File | None = None) -> list[tuple[str, File]]:
+        if not is_pattern(pattern):
+            return self.glob_literal(pattern, cwd)
+
+        absolute: bool = pattern.startswith("/")
+        start: File = self.device.get_root_directory() if cwd is None or absolute else cwd
+        matches: list[tuple[str, File]] = [("/" if absolute else "", start)]
+        for name in pattern.split("/"):
+            if not name or name == ".":
+                continue
+
+            next_matches: list[tuple[str, File]] = []
+            if name == "..":
+                next_matches = [(join_path(path, name), self.get_parent_dir(file)) for path, file in matches]
+            elif name == "**":
+                for path, file in matches:
+                    next_matches.append((path, file))
+                    if file.is_directory:
+                        next_matches += [(join_path(path, sub_path), sub) for sub_path, sub in self.walk(file)]
+            else:
+                directories: list[File] = [file for _, file in matches if file.is_directory]
+                self.load_directories([directory.uuid for directory in directories])
+                hidden: bool = unescape(name).startswith(".")
+                name = to_fnmatch(name)
+                for path, file in matches:
+                    if not file.is_directory:
+                        continue
+                    for child in sorted(self.get_files(file.uuid), key=lambda f: f.name):
+                        if (hidden or not child.name.startswith(".")) and fnmatchcase(child.name, name):
+                            next_matches.append((join_path(path, child.name), child))
+            matches = next_matches
+
+        # `**` may match the same file more than once
+        unique: dict[str | None, tuple[str, File]] = {}
+        for path, file in matches:
+            unique.setdefault(file.uuid, (path or ".", file))
+        return list(unique.values()) or self.glob_literal(pattern, cwd)
+
+    def glob_literal(self, pattern: str, cwd: File | None) -> list[tuple[str, File]]:
+        path: str = unescape(pattern)
+        file: File | None = self.resolve(path, cwd)
+        return [(path, file)] if file is not None else []
+
+    # only files that have never been visited require a round trip
+    def is_inside(self, file_uuid: str | None, directory_uuid: str | None) -> bool:
+        while file_uuid is not None:
+            if file_uuid == directory_uuid:
+                return True
+            file_uuid = self.get_file(file_uuid).parent_dir_uuid
+        return directory_uuid is None
+
+    def get_path(self, file: File) -> str:
+        if file.is_root_directory:
+            return "/"
+
+        path: list[File] = [file]
+        while path[-1].parent_dir_uuid is not None:
+            path.append(self.get_file(path[-1].parent_dir_uuid))
+        return "/" + "/".join(f.name for f in path[::-1])
+
+    def find(self, filename: str, parent_dir_uuid: str | None) -> File | None:
+        children: dict[str, str] | None = self.children.get(parent_dir_uuid)
+        if children is None or not self.is_consistent(parent_dir_uuid, children):
+            children = self.load_directory(parent_dir_uuid)
+
+        if (file_uuid := children.get(filename)) is None:
+            return None
+        return self.get_file(file_uuid)
+
+    def is_complete(self, children: dict[str, str]) -> bool:
+        return all(isinstance(self.files[uuid], File) for uuid in children.values())
+
+    # cached files are shared with the entity cache and may have been moved by a refresh elsewhere
+    def is_consistent(self, parent_dir_uuid: str | None, children: dict[str, str]) -> bool:
+        return all(
+            (file := self.files.get(uuid)) is not None and file.name == name and file.parent_dir_uuid == parent_dir_uuid
+            for name, uuid in children.items()
+        )
+
+    def add(self, file: File) -> None:
+        if file.uuid is None:
+            return
+
+        self.files[file.uuid] = file
+        if (children := self.children.get(file.parent_dir_uuid)) is not None:
+            children[file.name] = file.uuid
+
+    def update(self, file: File) -> None:
+        if file.uuid is None:
+            return
+
+        for children in self.children.values():
+            for name, uuid in list(children.items()):
+                if uuid == file.uuid:
+                    del children[name]
+        self.add(file)
+
+    def remove(self, file: File) -> None:
+        if file.uuid is None:
+            return
+
+        if (children := self.children.get(file.parent_dir_uuid)) is not None:
+            children.pop(file.name, None)
+
+        queue: list[str] = [file.uuid]
+        while queue:
+            uuid: str = queue.pop()
+            self.files.pop(uuid, None)
+            queue += (self.children.pop(uuid, None) or {}).values()
@@ -0,0 +1,75 @@
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Type
+
+from pydantic import BaseModel
+
+from .commands import make_commands, Command
+from .context import Context, LoginContext, RootContext, MainContext
+from .output import ThreadOutput, install_thread_output
+from .script import ScriptRunner
+
+
+class CommandResult(BaseModel):
+    command: str
+    ok: bool
+    output: str
+
+
+class SessionResult(BaseModel):
+    config_file: Path
+    username: str | None
+    error: str | None
+    results: list[CommandResult]
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and all(result.ok for result in self.results)
+
+
+# every account is a config file with its session token, at most `max_concurrency` sessions are open at once
+class Fleet:
+    def __init__(self, server: str, config_files: list[Path], max_concurrency: int = 8, json_output: bool = False):
+        self.server: str = server
+        self.config_files: list[Path] = config_files
+        self.max_concurrency: int = max_concurrency
+        self.json_output: bool = json_output
+        self.commands: dict[Type[Context], dict[str, Command]] = make_commands()
+
+    def run_session(self, config_file: Path, plan: list[str], output: ThreadOutput) -> SessionResult:
+        # stdin is shared by all sessions and their prompts would not be visible, so commands must not ask for input
+        root_context: RootContext = RootContext(
+            self.server, config_file, self.commands, presence=False, json_output=self.json_output, interactive=False
+        )
+        result: SessionResult = SessionResult(config_file=config_file, username=None, error=None, results=[])
+        try:
+            with output.capture():
+                root_context.open(LoginContext(root_context))
+            if not isinstance(context := root_context.get_context(), MainContext):
+                result.error = "Not logged in"
+                return result
+            result.username = context.username
+
+            runner: ScriptRunner = ScriptRunner(root_context)
+            for line in plan:
+                with output.capture() as buffer:
+                    try:
+                        ok: bool = runner.execute(line)
+                    except SystemExit:
+                        # the session has been closed by the command (e.g. `exit`)
+                        result.results.append(CommandResult(command=line, ok=True, output=buffer.getvalue()))
+                        break
+                result.results.append(CommandResult(command=line, ok=ok, output=buffer.getvalue()))
+        except Exception as error:  # noqa: B902
+            result.error = f"{type(error).__name__}: {error}"
+        finally:
+            root_context.client.close()
+
+        return result
+
+    def run(self, plan: list[str]) -> list[SessionResult]:
+        plan = [line.strip() for line in plan if line.strip() and not line.strip().startswith("#")]
+
+        output: ThreadOutput = install_thread_output()
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            return list(executor.map(lambda file: self.run_session(file, plan, output), self.config_files))
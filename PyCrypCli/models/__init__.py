@@ -1,7 +1,7 @@
 from .config import Config, ServerConfig
 from .device import Device
 from .device_hardware import DeviceHardware
-from .file import File
+from .file import File, FileInfo
 from .hardware_config import HardwareConfig
 from .inventory_element import InventoryElement
 from .model import Model
@@ -18,6 +18,7 @@ __all__ = [
     "Device",
     "DeviceHardware",
     "File",
+    "FileInfo",
     "HardwareConfig",
     "InventoryElement",
     "Model",
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
-from typing import Any, cast, TYPE_CHECKING
+from concurrent.futures import Future
+from typing import Any, Callable, ClassVar, cast, TYPE_CHECKING, TypeVar
 
 from pydantic import Field
 
 from .device_hardware import DeviceHardware
-from .file import File
+from ..exceptions import DeviceNotFoundError
+from .file import File, FileInfo
 from .model import Model
 from .network import Network, NetworkInvitation
 from .resource_usage import ResourceUsage
@@ -14,6 +16,8 @@ from .service import PublicService, Service, Miner
 if TYPE_CHECKING:
     from ..client import Client
 
+Listed = TypeVar("Listed", bound=FileInfo)
+
 
 class Device(Model):
     uuid: str
@@ -21,19 +25,46 @@ class Device(Model):
     owner_uuid: str = Field(alias="owner")
     powered_on: bool
 
+    cache_ttl: ClassVar[float] = 10
+
     def __hash__(self) -> int:
         return hash(self.uuid)
 
     @staticmethod
     def get_device(client: Client, device_uuid: str) -> Device:
-        return Device.parse(client, client.ms("device", ["device", "info"], device_uuid=device_uuid))
+        if (device := client.cache.get(Device, device_uuid)) is not None:
+            return device
+
+        return Device.fetch_device(client, device_uuid)
+
+    @staticmethod
+    def fetch_device(client: Client, device_uuid: str) -> Device:
+        return client.cache.put(Device.parse(client, client.ms("device", ["device", "info"], device_uuid=device_uuid)))
+
+    @staticmethod
+    def get_devices(client: Client, device_uuids: list[str], *, skip_missing: bool = False) -> list[Device]:
+        cached: dict[str, Device | None] = {uuid: client.cache.get(Device, uuid) for uuid in device_uuids}
+        missing: list[str] = [uuid for uuid, device in cached.items() if device is None]
+        for uuid, response in zip(
+            missing, client.ms_many([("device", ["device", "info"], {"device_uuid": uuid}) for uuid in missing])
+        ):
+            if isinstance(response, DeviceNotFoundError) and skip_missing:
+                continue
+            if isinstance(response, Exception):
+                raise response
+            cached[uuid] = client.cache.put(Device.parse(client, response))
+
+        return [device for uuid in device_uuids if (device := cached[uuid]) is not None]
 
     @staticmethod
     def list_devices(client: Client) -> list[Device]:
-        return [Device.parse(client, device) for device in client.ms("device", ["device", "all"])["devices"]]
+        return [
+            client.cache.put(Device.parse(client, device))
+            for device in client.ms("device", ["device", "all"])["devices"]
+        ]
 
     def update(self) -> Device:
-        return self._update(Device.get_device(self._client, self.uuid))
+        return self._update(Device.fetch_device(self._client, self.uuid))
 
     @staticmethod
     def build(client: Client, mainboard: str, cpu: str, gpu: str, ram: list[str], disk: list[str]) -> Device:
@@ -51,38 +82,157 @@ class Device(Model):
         return Device.parse(client, client.ms("device", ["device", "spot"]))
 
     def power(self) -> Device:
-        return self._update(self._ms("device", ["device", "power"], device_uuid=self.uuid))
+        return self._client.cache.put(self._update(self._ms("device", ["device", "power"], device_uuid=self.uuid)))
 
     def change_name(self, name: str) -> Device:
-        return self._update(self._ms("device", ["device", "change_name"], device_uuid=self.uuid, name=name))
+        return self._client.cache.put(
+            self._update(self._ms("device", ["device", "change_name"], device_uuid=self.uuid, name=name))
+        )
 
     def delete(self) -> None:
         self._ms("device", ["device", "delete"], device_uuid=self.uuid)
+        self._client.cache.invalidate(uuid=self.uuid)
 
     def get_files(self, parent_dir_uuid: str | None) -> list[File]:
         return [
-            File.parse(self._client, file)
+            self._client.cache.put(File.parse(self._client, file))
             for file in self._ms("device", ["file", "all"], device_uuid=self.uuid, parent_dir_uuid=parent_dir_uuid)[
                 "files"
             ]
         ]
 
+    def get_files_many(self, parent_dir_uuids: list[str | None]) -> list[list[File]]:
+        futures: list[Future[list[File]]] = [self.submit_get_files(uuid) for uuid in parent_dir_uuids]
+        return [future.result() for future in futures]
+
+    def get_listing(self, parent_dir_uuid: str | None) -> list[FileInfo]:
+        return self.submit_get_listing(parent_dir_uuid).result()
+
+    def submit_get_files(self, parent_dir_uuid: str | None) -> Future[list[File]]:
+        return self._submit_listing(
+            parent_dir_uuid, lambda file: self._client.cache.put(File.parse(self._client, file))
+        )
+
+    # file contents are dropped, so listings of directories with large files do not stay in memory
+    def submit_get_listing(self, parent_dir_uuid: str | None) -> Future[list[FileInfo]]:
+        def parse(file: dict[str, Any]) -> FileInfo:
+            if file["is_directory"]:
+                return self._client.cache.put(File.parse(self._client, file))
+            return FileInfo.parse(self._client, file)
+
+        return self._submit_listing(parent_dir_uuid, parse)
+
+    def _submit_listing(
+        self, parent_dir_uuid: str | None, parse: Callable[[dict[str, Any]], Listed]
+    ) -> Future[list[Listed]]:
+        result: Future[list[Listed]] = Future()
+
+        def handle_response(response: Future[dict[str, Any]]) -> None:
+            try:
+                files: list[Listed] = [parse(file) for file in response.result()["files"]]
+            except Exception as error:  # noqa: B902
+                result.set_exception(error)
+            else:
+                result.set_result(files)
+
+        self._client.ms_submit(
+            "device", ["file", "all"], device_uuid=self.uuid, parent_dir_uuid=parent_dir_uuid
+        ).add_done_callback(handle_response)
+        return result
+
+    def get_root_directory(self) -> File:
+        return File.get_root_directory(self._client, self.uuid)
+
     def get_file(self, file_uuid: str) -> File:
         return File.get_file(self._client, self.uuid, file_uuid)
 
     def create_file(self, filename: str, content: str, is_directory: bool, parent_dir_uuid: str | None) -> File:
-        return File.parse(
-            self._client,
-            self._ms(
-                "device",
-                ["file", "create"],
-                device_uuid=self.uuid,
-                filename=filename,
-                content=content,
-                is_directory=is_directory,
-                parent_dir_uuid=parent_dir_uuid,
-            ),
+        return self._client.cache.put(
+            File.parse(
+                self._client,
+                self._ms(
+                    "device",
+                    ["file", "create"],
+                    device_uuid=self.uuid,
+                    filename=filename,
+                    content=content,
+                    is_directory=is_directory,
+                    parent_dir_uuid=parent_dir_uuid,
+                ),
+            )
+        )
+
+    # files are given as (filename, content, is_directory, parent_dir_uuid)
+    def create_files(self, files: list[tuple[str, str, bool, str | None]]) -> list[File | Exception]:
+        return [
+            response if isinstance(response, Exception) else self._client.cache.put(File.parse(self._client, response))
+            for response in self._client.ms_many(
+                [
+                    (
+                        "device",
+                        ["file", "create"],
+                        {
+                            "device_uuid": self.uuid,
+                            "filename": filename,
+                            "content": content,
+                            "is_directory": is_directory,
+                            "parent_dir_uuid": parent_dir_uuid,
+                        },
+                    )
+                    for filename, content, is_directory, parent_dir_uuid in files
+                ]
+            )
+        ]
+
+    # files are given as (file, new_content)
+    def edit_files(self, files: list[tuple[File, str]]) -> list[File | Exception]:
+        return [
+            response if isinstance(response, Exception) else self._client.cache.put(file._update(response))
+            for (file, _), response in zip(
+                files,
+                self._client.ms_many(
+                    [
+                        (
+                            "device",
+                            ["file", "update"],
+                            {"device_uuid": self.uuid, "file_uuid": file.uuid, "content": content},
+                        )
+                        for file, content in files
+                    ]
+                ),
+            )
+        ]
+
+    # files are given as (file, new_filename, new_parent_dir_uuid)
+    def move_files(self, files: list[tuple[File, str, str | None]]) -> list[File | Exception]:
+        return [
+            response if isinstance(response, Exception) else self._client.cache.put(file._update(response))
+            for (file, _, _), response in zip(
+                files,
+                self._client.ms_many(
+                    [
+                        (
+                            "device",
+                            ["file", "move"],
+                            {
+                                "device_uuid": self.uuid,
+                                "file_uuid": file.uuid,
+                                "new_filename": new_filename,
+                                "new_parent_dir_uuid": new_parent_dir_uuid,
+                            },
+                        )
+                        for file, new_filename, new_parent_dir_uuid in files
+                    ]
+                ),
+            )
+        ]
+
+    def delete_files(self, files: list[File]) -> list[Exception | None]:
+        responses: list[dict[str, Any] | Exception] = self._client.ms_many(
+            [("device", ["file", "delete"], {"device_uuid": self.uuid, "file_uuid": file.uuid}) for file in files]
         )
+        self._client.cache.invalidate(File)
+        return [response if isinstance(response, Exception) else None for response in responses]
 
     def get_public_service(self, service_uuid: str) -> PublicService:
         return PublicService.get_public_service(self._client, self.uuid, service_uuid)
@@ -116,7 +266,8 @@ class Device(Model):
 
     def get_networks(self) -> list[Network]:
         return [
-            Network.parse(self._client, net) for net in self._ms("network", ["member"], device=self.uuid)["networks"]
+            self._client.cache.put(Network.parse(self._client, net))
+            for net in self._ms("network", ["member"], device=self.uuid)["networks"]
         ]
 
     def create_network(self, name: str, hidden: bool) -> Network:
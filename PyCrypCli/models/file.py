@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import ClassVar, TYPE_CHECKING
 
 from pydantic import Field
 
@@ -10,11 +10,11 @@ if TYPE_CHECKING:
     from ..client import Client
 
 
-class File(Model):
+# file without its content, for listings that only need the names and types of files
+class FileInfo(Model):
     uuid: str | None
     device_uuid: str = Field(alias="device")
     name: str = Field(alias="filename")
-    content: str
     is_directory: bool
     parent_dir_uuid: str | None
 
@@ -22,6 +22,12 @@ class File(Model):
     def is_root_directory(self) -> bool:
         return self.uuid is None
 
+
+class File(FileInfo):
+    content: str
+
+    cache_ttl: ClassVar[float] = 10
+
     @staticmethod
     def get_root_directory(client: Client, device_uuid: str) -> File:
         return File.parse(
@@ -38,32 +44,49 @@ class File(Model):
 
     @staticmethod
     def get_file(client: Client, device_uuid: str, file_uuid: str) -> File:
-        return File.parse(client, client.ms("device", ["file", "info"], device_uuid=device_uuid, file_uuid=file_uuid))
+        if (file := client.cache.get(File, file_uuid)) is not None:
+            return file
+
+        return File.fetch_file(client, device_uuid, file_uuid)
+
+    @staticmethod
+    def fetch_file(client: Client, device_uuid: str, file_uuid: str) -> File:
+        return client.cache.put(
+            File.parse(client, client.ms("device", ["file", "info"], device_uuid=device_uuid, file_uuid=file_uuid))
+        )
 
     def update(self) -> File:
         if not self.uuid:
             return self
 
-        return self._update(File.get_file(self._client, self.device_uuid, self.uuid))
+        return self._update(File.fetch_file(self._client, self.device_uuid, self.uuid))
 
     def move(self, new_filename: str, new_parent_dir_uuid: str | None) -> File:
-        return self._update(
-            self._ms(
-                "device",
-                ["file", "move"],
-                device_uuid=self.device_uuid,
-                file_uuid=self.uuid,
-                new_filename=new_filename,
-                new_parent_dir_uuid=new_parent_dir_uuid,
+        return self._client.cache.put(
+            self._update(
+                self._ms(
+                    "device",
+                    ["file", "move"],
+                    device_uuid=self.device_uuid,
+                    file_uuid=self.uuid,
+                    new_filename=new_filename,
+                    new_parent_dir_uuid=new_parent_dir_uuid,
+                )
             )
         )
 
     def edit(self, new_content: str) -> File:
-        return self._update(
-            self._ms(
-                "device", ["file", "update"], device_uuid=self.device_uuid, file_uuid=self.uuid, content=new_content
+        return self._client.cache.put(
+            self._update(
+                self._ms(
+                    "device", ["file", "update"], device_uuid=self.device_uuid, file_uuid=self.uuid, content=new_content
+                )
             )
         )
 
     def delete(self) -> None:
         self._ms("device", ["file", "delete"], device_uuid=self.device_uuid, file_uuid=self.uuid)
+        if self.is_directory:
+            self._client.cache.invalidate(File)
+        elif self.uuid:
+            self._client.cache.invalidate(File, self.uuid)
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from typing import Type, TypeVar, Any, TYPE_CHECKING
+import asyncio
+from typing import Type, TypeVar, Any, ClassVar, TYPE_CHECKING
 
 from pydantic import BaseModel, PrivateAttr, ValidationError
 
@@ -13,6 +14,9 @@ ModelType = TypeVar("ModelType", bound="Model")
 class Model(BaseModel):
     _client: Client = PrivateAttr()
 
+    # time in seconds for which objects of this type are kept in the client's entity cache
+    cache_ttl: ClassVar[float] = 0
+
     @classmethod
     def parse(cls: Type[ModelType], client: Client, obj: dict[Any, Any]) -> ModelType:
         out = cls.parse_obj(obj)
@@ -22,6 +26,9 @@ class Model(BaseModel):
     def _ms(self, microservice: str, endpoint: list[str], **data: Any) -> dict[Any, Any]:
         return self._client.ms(microservice, endpoint, **data)
 
+    async def _ms_async(self, microservice: str, endpoint: list[str], **data: Any) -> dict[Any, Any]:
+        return await asyncio.wrap_future(self._client.ms_submit(microservice, endpoint, **data))
+
     def _update(self: ModelType, obj: ModelType | dict[Any, Any]) -> ModelType:
         if isinstance(obj, dict):
             obj = self.validate(obj)
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import ClassVar, TYPE_CHECKING
 
 from pydantic import Field
 
@@ -19,17 +19,33 @@ class Network(Model):
     owner_uuid: str = Field(alias="owner")
     name: str
 
+    cache_ttl: ClassVar[float] = 30
+
     @staticmethod
     def get_public_networks(client: Client) -> list[Network]:
-        return [Network.parse(client, net) for net in client.ms("network", ["public"])["networks"]]
+        return [client.cache.put(Network.parse(client, net)) for net in client.ms("network", ["public"])["networks"]]
 
     @staticmethod
     def get_by_uuid(client: Client, uuid: str) -> Network:
-        return Network.parse(client, client.ms("network", ["get"], uuid=uuid))
+        if (network := client.cache.get(Network, uuid)) is not None:
+            return network
+
+        return client.cache.put(Network.parse(client, client.ms("network", ["get"], uuid=uuid)))
+
+    @staticmethod
+    def get_by_uuids(client: Client, uuids: list[str]) -> list[Network]:
+        cached: dict[str, Network | None] = {uuid: client.cache.get(Network, uuid) for uuid in uuids}
+        missing: list[str] = [uuid for uuid, network in cached.items() if network is None]
+        for uuid, response in zip(missing, client.ms_many([("network", ["get"], {"uuid": uuid}) for uuid in missing])):
+            if isinstance(response, Exception):
+                raise response
+            cached[uuid] = client.cache.put(Network.parse(client, response))
+
+        return [network for uuid in uuids if (network := cached[uuid]) is not None]
 
     @staticmethod
     def get_network_by_name(client: Client, name: str) -> Network:
-        return Network.parse(client, client.ms("network", ["name"], name=name))
+        return client.cache.put(Network.parse(client, client.ms("network", ["name"], name=name)))
 
     def get_members(self) -> list[NetworkMembership]:
         return [
@@ -61,3 +77,4 @@ class Network(Model):
 
     def delete(self) -> None:
         self._ms("network", ["delete"], uuid=self.uuid)
+        self._client.cache.invalidate(Network, self.uuid)
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Any, TypeVar, TYPE_CHECKING
+from typing import Any, ClassVar, TypeVar, TYPE_CHECKING
 
 from pydantic import Field
 
@@ -19,17 +19,28 @@ class Service(PublicService):
     part_owner_uuid: str | None = Field(alias="part_owner")
     speed: float
 
+    cache_ttl: ClassVar[float] = 5
+
     @staticmethod
     def get_services(client: Client, device_uuid: str) -> list[Service]:
         return [
-            Service.parse(client, service)
+            client.cache.put(Service.parse(client, service))
             for service in client.ms("service", ["list"], device_uuid=device_uuid)["services"]
         ]
 
     @staticmethod
     def get_service(client: Client, device_uuid: str, service_uuid: str) -> Service:
-        return Service.parse(
-            client, client.ms("service", ["private_info"], device_uuid=device_uuid, service_uuid=service_uuid)
+        if (service := client.cache.get(Service, service_uuid)) is not None:
+            return service
+
+        return Service.fetch_service(client, device_uuid, service_uuid)
+
+    @staticmethod
+    def fetch_service(client: Client, device_uuid: str, service_uuid: str) -> Service:
+        return client.cache.put(
+            Service.parse(
+                client, client.ms("service", ["private_info"], device_uuid=device_uuid, service_uuid=service_uuid)
+            )
         )
 
     @staticmethod
@@ -41,16 +52,22 @@ class Service(PublicService):
 
     @staticmethod
     def list_part_owner(client: Client) -> list[Service]:
-        return [Service.parse(client, service) for service in client.ms("service", ["list_part_owner"])["services"]]
+        return [
+            client.cache.put(Service.parse(client, service))
+            for service in client.ms("service", ["list_part_owner"])["services"]
+        ]
 
     def update(self) -> Service:
-        return self._update(Service.get_service(self._client, self.device_uuid, self.uuid))
+        return self._update(Service.fetch_service(self._client, self.device_uuid, self.uuid))
 
     def use(self, **data: Any) -> dict[Any, Any]:
         return self._ms("service", ["use"], device_uuid=self.device_uuid, service_uuid=self.uuid, **data)
 
     def toggle(self) -> Service:
-        return self._update(self._ms("service", ["toggle"], device_uuid=self.device_uuid, service_uuid=self.uuid))
+        return self._client.cache.put(
+            self._update(self._ms("service", ["toggle"], device_uuid=self.device_uuid, service_uuid=self.uuid))
+        )
 
     def delete(self) -> None:
         self._ms("service", ["delete"], device_uuid=self.device_uuid, service_uuid=self.uuid)
+        self._client.cache.invalidate(uuid=self.uuid)
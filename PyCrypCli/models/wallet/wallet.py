@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import ClassVar, TYPE_CHECKING
 
 from pydantic import Field
 
@@ -18,16 +18,25 @@ class Wallet(PublicWallet):
     amount: int
     transaction_count: int = Field(alias="transactions")
 
+    cache_ttl: ClassVar[float] = 5
+
     @staticmethod
     def create_wallet(client: Client) -> Wallet:
         return Wallet.parse(client, client.ms("currency", ["create"]))
 
     @staticmethod
     def get_wallet(client: Client, uuid: str, key: str) -> Wallet:
-        return Wallet.parse(client, client.ms("currency", ["get"], source_uuid=uuid, key=key))
+        if (wallet := client.cache.get(Wallet, uuid)) is not None and wallet.key == key:
+            return wallet
+
+        return Wallet.fetch_wallet(client, uuid, key)
+
+    @staticmethod
+    def fetch_wallet(client: Client, uuid: str, key: str) -> Wallet:
+        return client.cache.put(Wallet.parse(client, client.ms("currency", ["get"], source_uuid=uuid, key=key)))
 
     def update(self) -> Wallet:
-        return self._update(Wallet.get_wallet(self._client, self.uuid, self.key))
+        return self._update(Wallet.fetch_wallet(self._client, self.uuid, self.key))
 
     def get_transactions(self, count: int, offset: int) -> list[Transaction]:
         return [
@@ -57,3 +66,4 @@ class Wallet(PublicWallet):
 
     def delete(self) -> None:
         self._ms("currency", ["delete"], source_uuid=self.uuid, key=self.key)
+        self._client.cache.invalidate(Wallet, self.uuid)
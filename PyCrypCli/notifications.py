@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+from collections import deque
+from queue import Queue, Empty, Full
+from threading import Lock
+from types import TracebackType
+from typing import Any, Callable, Iterator, Type
+
+import sentry_sdk
+
+NOTIFICATION_HANDLER = Callable[[dict[str, Any]], None]
+
+
+class Subscription:
+    def __init__(self, stream: NotificationStream, origin: str | None, maxsize: int):
+        self.stream: NotificationStream = stream
+        self.origin: str | None = origin
+        self.queue: Queue[dict[str, Any]] = Queue(maxsize)
+
+    # like the buffer of the stream, the oldest notifications are dropped if the subscriber falls behind
+    def put(self, notification: dict[str, Any]) -> None:
+        while True:
+            try:
+                self.queue.put_nowait(notification)
+                return
+            except Full:
+                pass
+
+            try:
+                self.queue.get_nowait()
+            except Empty:
+                pass
+
+    def get(self, timeout: float | None = None) -> dict[str, Any] | None:
+        try:
+            return self.queue.get(timeout=timeout)
+        except Empty:
+            return None
+
+    def poll(self) -> list[dict[str, Any]]:
+        notifications: list[dict[str, Any]] = []
+        while not self.queue.empty():
+            notifications.append(self.queue.get_nowait())
+        return notifications
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        while True:
+            yield self.queue.get()
+
+    def __enter__(self) -> Subscription:
+        return self
+
+    def __exit__(
+        self, exc_type: Type[BaseException] | None, exc_val: BaseException | None, exc_tb: TracebackType | None
+    ) -> None:
+        self.stream.unsubscribe(self.put)
+
+
+# only the most recent notifications are kept, handlers may subscribe to a single origin
+class NotificationStream:
+    def __init__(self, maxlen: int = 256):
+        self.buffer: deque[dict[str, Any]] = deque(maxlen=maxlen)
+        self.handlers: list[tuple[NOTIFICATION_HANDLER, str | None]] = []
+        self.lock: Lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self.buffer)
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        with self.lock:
+            return iter(list(self.buffer))
+
+    def push(self, notification: dict[str, Any]) -> None:
+        with self.lock:
+            self.buffer.append(notification)
+            handlers: list[tuple[NOTIFICATION_HANDLER, str | None]] = list(self.handlers)
+
+        for handler, origin in handlers:
+            if origin is not None and notification.get("origin") != origin:
+                continue
+
+            try:
+                handler(notification)
+            except Exception as error:  # noqa: B902
+                sentry_sdk.capture_exception(error)
+
+    def subscribe(self, handler: NOTIFICATION_HANDLER, origin: str | None = None) -> NOTIFICATION_HANDLER:
+        with self.lock:
+            self.handlers.append((handler, origin))
+        return handler
+
+    def unsubscribe(self, handler: NOTIFICATION_HANDLER) -> None:
+        with self.lock:
+            self.handlers = [(h, origin) for h, origin in self.handlers if h != handler]
+
+    def listen(self, origin: str | None = None, maxsize: int = 256) -> Subscription:
+        subscription: Subscription = Subscription(self, origin, maxsize)
+        self.subscribe(subscription.put, origin)
+        return subscription
@@ -0,0 +1,46 @@
+import sys
+from contextlib import contextmanager
+from io import StringIO, TextIOBase
+from threading import local
+from typing import Iterator, TextIO, cast
+
+
+# threads that are capturing their output write into their own buffer
+class ThreadOutput(TextIOBase):
+    def __init__(self, stream: TextIO):
+        self.stream: TextIO = stream
+        self.local: local = local()
+
+    @contextmanager
+    def capture(self) -> Iterator[StringIO]:
+        # captures may be nested, e.g. a command capturing its text output inside a fleet session
+        previous: StringIO | None = getattr(self.local, "buffer", None)
+        buffer: StringIO = StringIO()
+        self.local.buffer = buffer
+        try:
+            yield buffer
+        finally:
+            self.local.buffer = previous
+
+    def write(self, text: str) -> int:
+        buffer: StringIO | None = getattr(self.local, "buffer", None)
+        return (buffer or self.stream).write(text)
+
+    def flush(self) -> None:
+        self.stream.flush()
+
+
+def install_thread_output() -> ThreadOutput:
+    # must happen before any other thread starts capturing, readline is not used for prompts afterwards
+    if isinstance(sys.stdout, ThreadOutput):
+        return sys.stdout
+
+    output: ThreadOutput = ThreadOutput(sys.stdout)
+    sys.stdout = cast(TextIO, output)
+    return output
+
+
+@contextmanager
+def capture_output() -> Iterator[StringIO]:
+    with install_thread_output().capture() as buffer:
+        yield buffer
@@ -1,39 +1,96 @@
+import json
 import sys
+import time
+from argparse import ArgumentParser, Namespace
 from os import getenv
 from pathlib import Path
-from typing import NoReturn
+from threading import Thread
+from typing import NoReturn, TextIO
 
-import requests
 import sentry_sdk
+from sentry_sdk.utils import BadDsn
+from pydantic.json import pydantic_encoder
 
 from .commands import make_commands, Command
 from .context import Context, LoginContext, RootContext
+from .daemon import Daemon, run_remote_script
+from .exceptions import DaemonError
+from .fleet import Fleet, SessionResult
+from .refresher import Refresher
+from .script import ScriptRunner
 
 try:
     import readline
 except ImportError:
     import pyreadline as readline  # type: ignore
 
-if not getenv("DEBUG"):
-    response = requests.get("https://sentrydsn.defelo.de/pycrypcli")
-    if response.ok:
-        sentry_sdk.init(dsn=response.text, attach_stacktrace=True, shutdown_timeout=5)
+START_TIME: float = time.perf_counter()
+
+# time in seconds to import this module and register all commands (checked by tests/test_startup.py)
+COLD_START_BUDGET = 0.5
+
+SENTRY_DSN_URL = "https://sentrydsn.defelo.de/pycrypcli"
+SENTRY_DSN_TIMEOUT = 5
+
+
+# the dsn is cached, so sentry is also initialized if the server cannot be reached
+def init_sentry(dsn_file: Path) -> None:
+    dsn: str | None
+    try:
+        dsn = dsn_file.read_text().strip()
+    except (OSError, UnicodeDecodeError):
+        dsn = None
+
+    if dsn:
+        try:
+            sentry_sdk.init(dsn=dsn, attach_stacktrace=True, shutdown_timeout=5)
+        except BadDsn:
+            dsn = None
+
+    # requests takes a considerable part of the startup time to import and is only needed by this thread
+    import requests
+
+    try:
+        response = requests.get(SENTRY_DSN_URL, timeout=SENTRY_DSN_TIMEOUT)
+    except requests.RequestException:
+        return
+
+    if not response.ok or not response.text.strip() or response.text.strip() == dsn:
+        return
+
+    dsn = response.text.strip()
+    try:
+        dsn_file.parent.mkdir(parents=True, exist_ok=True)
+        dsn_file.write_text(dsn)
+    except OSError:
+        pass
+
+    try:
+        sentry_sdk.init(dsn=dsn, attach_stacktrace=True, shutdown_timeout=5)
+    except BadDsn:
+        pass
 
 
 class Frontend:
-    def __init__(self, server: str, config_file: Path):
+    def __init__(self, server: str, config_file: Path, json_output: bool = False):
         self.config_file: Path = config_file
 
         self.history: list[str] = []
+        self.completion_buffer: str | None = None
+        self.completion_options: list[str] = []
 
         readline.parse_and_bind("tab: complete")
         readline.set_completer(self.completer)
         readline.set_completer_delims(" ")
 
-        self.root_context: RootContext = RootContext(server, config_file, make_commands())
+        self.root_context: RootContext = RootContext(server, config_file, make_commands(), json_output=json_output)
         self.root_context.open(LoginContext(self.root_context))
 
+        self.refresher: Refresher = Refresher()
+        self.refresher.start()
+
     def complete_command(self, text: str) -> list[str]:
+        self.root_context.invalidate_stale_file_indices()
         override_completions: list[str] | None = self.root_context.get_override_completions()
         if override_completions is not None:
             return override_completions
@@ -49,9 +106,16 @@ class Frontend:
         return comp.handle_completer(self.get_context(), args) or []
 
     def completer(self, text: str, state: int) -> str | None:
-        readline.set_completer_delims(" ")
-        options: list[str] = self.complete_command(readline.get_line_buffer())
-        options = [o + " " if o[-1:] != "\0" else o[:-1] for o in sorted(options) if o.startswith(text)]
+        # readline calls the completer once per candidate, so the options are only computed for the first one
+        buffer: str = readline.get_line_buffer()
+        if state == 0 or buffer != self.completion_buffer:
+            readline.set_completer_delims(" ")
+            options: list[str] = self.complete_command(buffer)
+            self.completion_buffer = buffer
+            self.completion_options = [
+                o + " " if o[-1:] != "\0" else o[:-1] for o in sorted(options) if o.startswith(text)
+            ]
+        options = self.completion_options
 
         if state < len(options):
             return options[state]
@@ -60,11 +124,21 @@ class Frontend:
     def get_context(self) -> Context:
         return self.root_context.get_context()
 
+    def clear_completion_caches(self) -> None:
+        for commands in self.root_context.commands.values():
+            for cmd in commands.values():
+                cmd.completion_cache.clear()
+
     def mainloop(self) -> NoReturn:
         while True:
-            self.get_context().loop_tick()
             context: Context = self.get_context()
 
+            # the prompt is rendered from the last known state while the state is refreshed in the background
+            if context.refreshed:
+                self.refresher.request(context)
+            else:
+                context.update_state()
+
             try:
                 cmd, *args = input(context.prompt).strip().split(" ")
                 if not cmd:
@@ -76,11 +150,13 @@ class Frontend:
                 print("^C")
                 continue
 
-            if not context.before_command():
+            self.refresher.wait()
+            if context is not self.get_context() or not context.before_command():
                 continue
 
             context.add_to_history(cmd + " " + " ".join(args))
 
+            self.clear_completion_caches()
             if cmd in context.get_commands():
                 context.get_commands()[cmd].handle(context, args)
             else:
@@ -88,7 +164,134 @@ class Frontend:
                 print("Type `help` for a list of commands.")
 
 
+def parse_args() -> Namespace:
+    parser: ArgumentParser = ArgumentParser(prog="pycrypcli", description="Python Cryptic Game Client")
+    parser.add_argument("server", nargs="?", default="wss://ws.cryptic-game.net/", help="server to connect to")
+    parser.add_argument(
+        "--script", metavar="FILE", help="execute the commands in FILE (or stdin if FILE is -) and exit"
+    )
+    parser.add_argument("--json", action="store_true", help="print the results of commands as json")
+    parser.add_argument(
+        "--daemon", action="store_true", help="keep one session open and serve local scripts over a unix socket"
+    )
+    parser.add_argument(
+        "--socket", metavar="PATH", type=Path, help="unix socket of the daemon (--script uses the daemon if given)"
+    )
+    parser.add_argument(
+        "--fleet",
+        metavar="CONFIG",
+        nargs="+",
+        type=Path,
+        help="execute the --script for every account whose session is stored in one of the given config files",
+    )
+    parser.add_argument(
+        "--concurrency", metavar="N", type=int, default=8, help="maximum number of concurrent --fleet sessions"
+    )
+    args: Namespace = parser.parse_args()
+    if args.fleet and args.script is None:
+        parser.error("--fleet requires --script")
+
+    if args.server.lower() == "test":
+        args.server = "wss://ws.test.cryptic-game.net/"
+    elif not args.server.startswith("wss://") and not args.server.startswith("ws://"):
+        args.server = "ws://" + args.server
+
+    return args
+
+
+def run_script(server: str, config_file: Path, script: str, json_output: bool, socket: Path | None) -> NoReturn:
+    try:
+        file: TextIO = sys.stdin if script == "-" else open(script)
+    except OSError as error:
+        print(f"Could not read script: {error}", file=sys.stderr)
+        sys.exit(2)
+
+    if socket is not None:
+        with file:
+            try:
+                sys.exit(run_remote_script(socket, file))
+            except OSError as error:
+                print(f"Could not connect to daemon: {error}", file=sys.stderr)
+                sys.exit(2)
+
+    # prompts fail instead of consuming the following lines of the script as answers
+    root_context: RootContext = RootContext(
+        server, config_file, make_commands(), presence=False, json_output=json_output, interactive=False
+    )
+    root_context.open(LoginContext(root_context))
+
+    with file:
+        sys.exit(ScriptRunner(root_context).run(file))
+
+
+def run_fleet(server: str, config_files: list[Path], script: str, concurrency: int, json_output: bool) -> NoReturn:
+    try:
+        file: TextIO = sys.stdin if script == "-" else open(script)
+    except OSError as error:
+        print(f"Could not read script: {error}", file=sys.stderr)
+        sys.exit(2)
+
+    with file:
+        plan: list[str] = file.readlines()
+
+    results: list[SessionResult] = Fleet(server, config_files, concurrency, json_output).run(plan)
+    if json_output:
+        print(json.dumps([result.dict() for result in results], default=pydantic_encoder))
+    else:
+        for result in results:
+            print(f"=== {result.config_file} ({result.username or 'not logged in'}) ===")
+            if result.error:
+                print(result.error)
+            for command_result in result.results:
+                sys.stdout.write(command_result.output)
+
+    sys.exit(0 if all(result.ok for result in results) else 1)
+
+
+def run_daemon(server: str, config_file: Path, socket: Path, json_output: bool) -> NoReturn:
+    # commands that ask for input fail instead of blocking the daemon
+    root_context: RootContext = RootContext(
+        server, config_file, make_commands(), presence=False, json_output=json_output, interactive=False
+    )
+    root_context.open(LoginContext(root_context))
+    if not root_context.client.logged_in:
+        print("The daemon needs a saved session, please login interactively first.", file=sys.stderr)
+        sys.exit(1)
+
+    try:
+        daemon: Daemon = Daemon(socket, root_context)
+    except DaemonError as error:
+        root_context.client.close()
+        print(error, file=sys.stderr)
+        sys.exit(1)
+
+    print(f"Listening on {socket}")
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        daemon.server_close()
+        root_context.client.close()
+    sys.exit(0)
+
+
 def main() -> NoReturn:
+    args: Namespace = parse_args()
+
+    config_file: Path = Path("~/.config/PyCrypCli/config.json").expanduser()
+    if not getenv("DEBUG"):
+        Thread(target=init_sentry, args=(config_file.parent / "sentry_dsn",), daemon=True).start()
+
+    if args.daemon:
+        run_daemon(args.server, config_file, args.socket or config_file.parent / "daemon.sock", args.json)
+
+    if args.fleet:
+        run_fleet(args.server, args.fleet, args.script, args.concurrency, args.json)
+
+    if args.script is not None:
+        run_script(args.server, config_file, args.script, args.json, args.socket)
+
     print(
         "\033[32m\033[1m"
         r"""
@@ -104,15 +307,9 @@ def main() -> NoReturn:
     print("Python Cryptic Game Client (https://github.com/Defelo/PyCrypCli)")
     print("You can always type `help` for a list of available commands.")
 
-    server = "wss://ws.cryptic-game.net/"
-    if len(sys.argv) > 1:
-        server = sys.argv[1]
-        if server.lower() == "test":
-            server = "wss://ws.test.cryptic-game.net/"
-        elif not server.startswith("wss://") and not server.startswith("ws://"):
-            server = "ws://" + server
-
-    frontend: Frontend = Frontend(server, Path("~/.config/PyCrypCli/config.json").expanduser())
+    frontend: Frontend = Frontend(args.server, config_file, args.json)
+    if getenv("DEBUG"):
+        print(f"Startup took {time.perf_counter() - START_TIME:.3f}s (budget: {COLD_START_BUDGET}s)")
     frontend.mainloop()
 
 
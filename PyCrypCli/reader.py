@@ -0,0 +1,39 @@
+from threading import Thread
+from typing import Callable, Any
+
+import sentry_sdk
+
+
+class Reader(Thread):
+    def __init__(
+        self,
+        recv: Callable[[], dict[str, Any]],
+        dispatch: Callable[[dict[str, Any]], None],
+        on_error: Callable[[Exception], None],
+    ):
+        super().__init__(daemon=True)
+
+        self.recv: Callable[[], dict[str, Any]] = recv
+        self.dispatch: Callable[[dict[str, Any]], None] = dispatch
+        self.on_error: Callable[[Exception], None] = on_error
+        # set before the thread is started, so requests submitted right after start() are accepted
+        self.running: bool = True
+
+    def run(self) -> None:
+        while self.running:
+            try:
+                frame: dict[str, Any] = self.recv()
+            except Exception as error:  # noqa: B902
+                if self.running:
+                    self.running = False
+                    self.on_error(error)
+                return
+
+            # a failing handler must not stop the thread, as no other response could be received anymore
+            try:
+                self.dispatch(frame)
+            except Exception as error:  # noqa: B902
+                sentry_sdk.capture_exception(error)
+
+    def stop(self) -> None:
+        self.running = False
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from threading import Thread, Condition
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .context import Context
+
+
+class Refresher(Thread):
+    def __init__(self) -> None:
+        super().__init__(daemon=True)
+
+        self.context: Context | None = None
+        # every request gets a generation, wait() returns once a refresh started after the last request has finished
+        self.condition: Condition = Condition()
+        self.requested: int = 0
+        self.completed: int = 0
+        self.error: Exception | None = None
+        self.running: bool = False
+
+    def run(self) -> None:
+        self.running = True
+        while True:
+            with self.condition:
+                self.condition.wait_for(lambda: self.completed < self.requested or not self.running)
+                if not self.running:
+                    return
+                generation: int = self.requested
+                context: Context | None = self.context
+
+            error: Exception | None = None
+            if context is not None:
+                try:
+                    context.update_state()
+                except Exception as exception:  # noqa: B902
+                    error = exception
+
+            with self.condition:
+                self.completed = generation
+                self.error = error or self.error
+                self.condition.notify_all()
+
+    def request(self, context: Context) -> None:
+        with self.condition:
+            self.context = context
+            self.requested += 1
+            self.condition.notify_all()
+
+    def wait(self) -> None:
+        # errors of background refreshes (e.g. a lost session) are raised in the waiting thread
+        with self.condition:
+            self.condition.wait_for(lambda: self.completed >= self.requested)
+            error, self.error = self.error, None
+
+        if error is not None:
+            raise error
+
+    def stop(self) -> None:
+        with self.condition:
+            self.running = False
+            self.condition.notify_all()
@@ -0,0 +1,50 @@
+from typing import Iterable
+
+from .commands import Command
+from .context import Context, RootContext
+from .output import capture_output
+
+
+# the context state is only refreshed before a command if a notification has marked it as stale
+class ScriptRunner:
+    def __init__(self, root_context: RootContext):
+        self.root_context: RootContext = root_context
+        self.failed: int = 0
+
+    def execute(self, line: str) -> bool:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            return True
+
+        cmd, *args = line.split(" ")
+        context: Context = self.root_context.get_context()
+        if getattr(context, "stale", False):
+            context.update_state()
+        if not self.before_command(context):
+            return False
+
+        if cmd not in context.get_commands():
+            Command.print_error(context, f"Command could not be found: {cmd}")
+            return False
+
+        return context.get_commands()[cmd].handle(context, args)
+
+    def before_command(self, context: Context) -> bool:
+        if not context.json_output:
+            return context.before_command()
+
+        with capture_output() as output:
+            ready: bool = context.before_command()
+        if not ready:
+            Command.print_error(context, output.getvalue().strip())
+        return ready
+
+    def run(self, lines: Iterable[str]) -> int:
+        try:
+            for line in lines:
+                if not self.execute(line):
+                    self.failed += 1
+        finally:
+            self.root_context.client.close()
+
+        return 1 if self.failed else 0
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+from collections import deque
+from typing import Callable, Iterable, Iterator
+
+from .exceptions import FileTypeConflictError, ParentDirectoryNotFoundError
+from .file_index import LIST_BATCH_SIZE
+from .models import Device, File
+from .util import chunks
+
+# number of files that are created with one pipelined batch of requests
+COPY_BATCH_SIZE = 64
+
+PROGRESS_CALLBACK = Callable[[int, int], None]
+
+
+# unlike FileIndex.walk, only the directories of one level are kept in memory
+def walk_files(device: Device, directory: File) -> Iterator[tuple[str, File]]:
+    level: list[tuple[str, File]] = [("", directory)]
+    while level:
+        next_level: list[tuple[str, File]] = []
+        for batch in chunks(level, LIST_BATCH_SIZE):
+            for (path, _), files in zip(batch, device.get_files_many([file.uuid for _, file in batch])):
+                for file in files:
+                    file_path: str = f"{path}/{file.name}" if path else file.name
+                    yield file_path, file
+                    if file.is_directory:
+                        next_level.append((file_path, file))
+        level = next_level
+
+
+# entries are (path, is_directory, content loader) with every directory before its children
+def create_tree(
+    device: Device, directory: File, entries: Iterable[tuple[str, bool, Callable[[], str]]]
+) -> Iterator[File | Exception]:
+    directories: dict[str, str | None] = {"": directory.uuid}
+    batch: list[tuple[str, bool, Callable[[], str]]] = []
+
+    def flush() -> Iterator[File | Exception]:
+        results: list[File | Exception] = device.create_files(
+            [
+                (path.rpartition("/")[2], load(), is_directory, directories[path.rpartition("/")[0]])
+                for path, is_directory, load in batch
+            ]
+        )
+        for (path, is_directory, _), result in zip(batch, results):
+            if is_directory and not isinstance(result, Exception):
+                directories[path] = result.uuid
+            yield result
+        batch.clear()
+
+    for entry in entries:
+        parent: str = entry[0].rpartition("/")[0]
+        if parent not in directories and any(path == parent for path, _, _ in batch):
+            yield from flush()
+        if parent not in directories:
+            yield ParentDirectoryNotFoundError([entry[0]])
+            continue
+        batch.append(entry)
+        if len(batch) >= COPY_BATCH_SIZE:
+            yield from flush()
+
+    if batch:
+        yield from flush()
+
+
+# parents are always created before their children, with `resume` existing files at the destination are reused
+class CopyEngine:
+    def __init__(
+        self,
+        source: Device,
+        destination: Device,
+        batch_size: int = COPY_BATCH_SIZE,
+        progress: PROGRESS_CALLBACK | None = None,
+        resume: bool = False,
+    ):
+        self.source: Device = source
+        self.destination: Device = destination
+        self.batch_size: int = batch_size
+        self.progress: PROGRESS_CALLBACK | None = progress
+        self.resume: bool = resume
+
+        self.created: list[File] = []
+        self.skipped: int = 0
+        self.total: int = 0
+
+    @property
+    def done(self) -> int:
+        return len(self.created) + self.skipped
+
+    def copy(self, file: File, dest_name: str, dest_dir: str | None) -> list[File]:
+        return self.copy_many([(file, dest_name, dest_dir)])
+
+    # files are given as (file, dest_name, dest_dir)
+    def copy_many(self, files: list[tuple[File, str, str | None]]) -> list[File]:
+        queue: deque[tuple[File, str, str | None]] = deque(files)
+        self.total += len(files)
+        while queue:
+            batch: list[tuple[File, str, str | None]] = [
+                queue.popleft() for _ in range(min(self.batch_size, len(queue)))
+            ]
+
+            existing: dict[tuple[str | None, str], File] = self.find_existing(batch)
+            results: Iterator[File | Exception] = iter(
+                self.destination.create_files(
+                    [
+                        (name, source.content, source.is_directory, parent)
+                        for source, name, parent in batch
+                        if (parent, name) not in existing
+                    ]
+                )
+            )
+
+            error: Exception | None = None
+            directories: list[tuple[File, File]] = []
+            for source, name, parent in batch:
+                target: File | None = existing.get((parent, name))
+                if target is not None:
+                    self.reuse(source, target)
+                else:
+                    result: File | Exception = next(results)
+                    if isinstance(result, Exception):
+                        error = error or result
+                        continue
+                    target = result
+                    self.created.append(target)
+
+                if source.is_directory:
+                    directories.append((source, target))
+
+            if error is not None:
+                raise error
+
+            listings: list[list[File]] = self.source.get_files_many([source.uuid for source, _ in directories])
+            for (_, target), children in zip(directories, listings):
+                self.total += len(children)
+                queue.extend((child, child.name, target.uuid) for child in children)
+
+            if self.progress is not None:
+                self.progress(self.done, self.total)
+
+        return self.created
+
+    def find_existing(self, batch: list[tuple[File, str, str | None]]) -> dict[tuple[str | None, str], File]:
+        if not self.resume:
+            return {}
+
+        # directories created by this engine are empty, so only directories that existed before have to be listed
+        created: set[str | None] = {file.uuid for file in self.created}
+        parents: list[str | None] = list(dict.fromkeys(parent for _, _, parent in batch if parent not in created))
+        return {
+            (parent, file.name): file
+            for parent, files in zip(parents, self.destination.get_files_many(parents))
+            for file in files
+        }
+
+    def reuse(self, source: File, target: File) -> None:
+        if source.is_directory != target.is_directory:
+            raise FileTypeConflictError(target.name, target.is_directory)
+
+        if not source.is_directory and source.content != target.content:
+            target.edit(source.content)
+        self.skipped += 1
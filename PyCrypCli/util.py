@@ -1,6 +1,8 @@
 import re
 from datetime import datetime, timezone
-from typing import Any, Sequence
+from typing import Any, Callable, Iterator, Sequence, TypeVar
+
+T = TypeVar("T")
 
 
 def is_uuid(x: str) -> bool:
@@ -14,6 +16,11 @@ def extract_wallet(content: str) -> tuple[str, str] | None:
     return None
 
 
+def chunks(items: list[T], size: int) -> Iterator[list[T]]:
+    for i in range(0, len(items), size):
+        yield items[i : i + size]  # noqa: E203
+
+
 def utc_to_local(timestamp: datetime) -> datetime:
     return timestamp.replace(tzinfo=timezone.utc).astimezone().replace(tzinfo=None)
 
@@ -22,11 +29,17 @@ def strip_float(num: float, precision: int) -> str:
     return f"{num:.{precision}f}".rstrip("0").rstrip(".")
 
 
-def print_tree(items: Sequence[tuple[str, Sequence[Any] | None]], indent: list[bool] | None = None) -> None:
+TREE_CHILDREN = Sequence[Any] | Callable[[], Sequence[Any]] | None
+
+
+def print_tree(items: Sequence[tuple[str, TREE_CHILDREN]], indent: list[bool] | None = None) -> None:
     if not indent:
         indent = []
     for i, (item, children) in enumerate(items):
         branch = "└├"[i < len(items) - 1]
         print("".join(" │"[ind] + "   " for ind in indent) + branch + "── " + item)
+        if callable(children):
+            # children are only loaded once their parent has been printed, so large trees are printed incrementally
+            children = children()
         if children is not None:
             print_tree(children, indent + [i < len(items) - 1])
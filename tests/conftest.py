@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from queue import Queue
+from typing import Any, Iterator, cast
+from uuid import uuid4
+
+import pytest
+
+from PyCrypCli.client import Client
+from PyCrypCli.commands import make_commands
+from PyCrypCli.context import DeviceContext, MainContext, RootContext
+from PyCrypCli.models import Device
+from PyCrypCli.reader import Reader
+from PyCrypCli.script import ScriptRunner
+
+DEVICE_UUID = "11111111-1111-1111-1111-111111111111"
+OTHER_DEVICE_UUID = "22222222-2222-2222-2222-222222222222"
+
+
+# stands in for the websocket connection, answers microservice requests from an in-memory file system
+class FakeServer:
+    def __init__(self) -> None:
+        self.responses: Queue[str | None] = Queue()
+        self.requests: list[tuple[str, ...]] = []
+        self.files: dict[str, dict[str, Any]] = {}
+        self.powered_on: bool = True
+        # while held, responses are kept back until they are released (e.g. in a different order)
+        self.held: list[str] | None = None
+
+    def send(self, data: str) -> None:
+        request: dict[str, Any] = json.loads(data)
+        if "action" in request:
+            self.requests.append((request["action"],))
+            if request["action"] == "info":
+                self.respond({"name": "user", "uuid": "user", "created": 0, "last": 0, "online": 1})
+            else:
+                self.respond({"action": request["action"]})
+            return
+
+        self.requests.append(tuple(request["endpoint"]))
+        try:
+            response: dict[str, Any] = self.handle(request["endpoint"], request["data"])
+        except KeyError as error:
+            response = {"error": error.args[0]}
+        self.respond({"tag": request["tag"], "data": response})
+
+    def respond(self, frame: dict[str, Any]) -> None:
+        if self.held is not None:
+            self.held.append(json.dumps(frame))
+        else:
+            self.responses.put(json.dumps(frame))
+
+    def hold(self) -> None:
+        self.held = []
+
+    def release(self, order: list[int] | None = None) -> None:
+        held: list[str] = self.held or []
+        self.held = None
+        for i in order if order is not None else range(len(held)):
+            self.responses.put(held[i])
+
+    def recv(self) -> str:
+        data: str | None = self.responses.get()
+        if data is None:
+            raise ConnectionError("Connection has been closed")
+        return data
+
+    def close(self) -> None:
+        self.responses.put(None)
+
+    def count(self, *endpoint: str) -> int:
+        return self.requests.count(endpoint)
+
+    def add_file(self, device: str, filename: str, content: str, is_directory: bool, parent: str | None) -> str:
+        if parent is not None and parent not in self.files:
+            raise KeyError("parent_directory_not_found")
+        if any(
+            f["device"] == device and f["parent_dir_uuid"] == parent and f["filename"] == filename
+            for f in self.files.values()
+        ):
+            raise KeyError("file_already_exists")
+
+        uuid: str = str(uuid4())
+        self.files[uuid] = {
+            "uuid": uuid,
+            "device": device,
+            "filename": filename,
+            "content": content,
+            "is_directory": is_directory,
+            "parent_dir_uuid": parent,
+        }
+        return uuid
+
+    def children(self, device: str, parent: str | None) -> list[dict[str, Any]]:
+        return [f for f in self.files.values() if f["device"] == device and f["parent_dir_uuid"] == parent]
+
+    def handle(self, endpoint: list[str], data: dict[str, Any]) -> dict[str, Any]:
+        device: str = data.get("device_uuid", "")
+        if endpoint == ["device", "info"]:
+            return {"uuid": device, "name": device[:5], "owner": "user", "powered_on": self.powered_on, "hardware": []}
+        if endpoint == ["device", "all"]:
+            return {
+                "devices": [
+                    {"uuid": uuid, "name": uuid[:5], "owner": "user", "powered_on": self.powered_on}
+                    for uuid in (DEVICE_UUID, OTHER_DEVICE_UUID)
+                ]
+            }
+        if endpoint == ["file", "all"]:
+            if data["parent_dir_uuid"] is not None and data["parent_dir_uuid"] not in self.files:
+                raise KeyError("file_not_found")
+            return {"files": self.children(device, data["parent_dir_uuid"])}
+        if endpoint == ["file", "info"]:
+            if data["file_uuid"] not in self.files:
+                raise KeyError("file_not_found")
+            return self.files[data["file_uuid"]]
+        if endpoint == ["file", "create"]:
+            uuid: str = self.add_file(
+                device, data["filename"], data["content"], data["is_directory"], data["parent_dir_uuid"]
+            )
+            return self.files[uuid]
+        if endpoint == ["file", "update"]:
+            self.files[data["file_uuid"]]["content"] = data["content"]
+            return self.files[data["file_uuid"]]
+        if endpoint == ["file", "move"]:
+            self.files[data["file_uuid"]]["filename"] = data["new_filename"]
+            self.files[data["file_uuid"]]["parent_dir_uuid"] = data["new_parent_dir_uuid"]
+            return self.files[data["file_uuid"]]
+        if endpoint == ["file", "delete"]:
+            queue: list[str] = [data["file_uuid"]]
+            while queue:
+                self.files.pop(file_uuid := queue.pop(), None)
+                queue += [f["uuid"] for f in self.files.values() if f["parent_dir_uuid"] == file_uuid]
+            return {"ok": True}
+        if endpoint == ["list_part_owner"]:
+            return {"services": []}
+        raise KeyError("unknown")
+
+
+@pytest.fixture
+def server() -> FakeServer:
+    return FakeServer()
+
+
+def connect(client: Client, server: FakeServer) -> None:
+    client.websocket = server  # type: ignore
+    client.logged_in = True
+    client.reader = Reader(client._recv, client._dispatch, client._fail_pending)
+    client.reader.start()
+
+
+@pytest.fixture
+def client(server: FakeServer) -> Iterator[Client]:
+    client: Client = Client("ws://localhost")
+    connect(client, server)
+    yield client
+    client.close()
+
+
+@pytest.fixture
+def device(client: Client) -> Device:
+    return Device.get_device(client, DEVICE_UUID)
+
+
+@pytest.fixture
+def other_device(client: Client) -> Device:
+    return Device.get_device(client, OTHER_DEVICE_UUID)
+
+
+# a non-interactive session (like in script mode) which is logged in and connected to the device
+@pytest.fixture
+def root_context(tmp_path: Path, server: FakeServer) -> Iterator[RootContext]:
+    root_context: RootContext = RootContext(
+        "ws://localhost", tmp_path / "config.json", make_commands(), presence=False, interactive=False
+    )
+    connect(root_context.client, server)
+    main_context: MainContext = MainContext(root_context, "token")
+    root_context.open(main_context)
+    device_context: DeviceContext = DeviceContext(
+        root_context, "token", Device.get_device(root_context.client, DEVICE_UUID)
+    )
+    device_context.username, device_context.user_uuid = main_context.username, main_context.user_uuid
+    root_context.open(device_context)
+    yield root_context
+    root_context.client.close()
+
+
+@pytest.fixture
+def context(root_context: RootContext) -> DeviceContext:
+    return cast(DeviceContext, root_context.get_context())
+
+
+@pytest.fixture
+def script(root_context: RootContext) -> ScriptRunner:
+    return ScriptRunner(root_context)
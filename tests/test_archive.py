@@ -0,0 +1,57 @@
+from pathlib import Path
+
+import pytest
+
+from PyCrypCli.archive import SnapshotArchive
+from PyCrypCli.exceptions import SnapshotAlreadyExistsError, SnapshotNotFoundError
+from PyCrypCli.file_index import FileIndex
+from PyCrypCli.models import Device
+from .conftest import DEVICE_UUID, FakeServer
+
+
+@pytest.fixture
+def index(server: FakeServer, device: Device) -> FileIndex:
+    home = server.add_file(DEVICE_UUID, "home", "", True, None)
+    server.add_file(DEVICE_UUID, "a.txt", "same", False, home)
+    server.add_file(DEVICE_UUID, "b.txt", "same", False, home)
+    server.add_file(DEVICE_UUID, "wallet", "äöü\n", False, None)
+    return FileIndex(device)
+
+
+def test_round_trip(tmp_path: Path, index: FileIndex, device: Device) -> None:
+    files = list(index.walk(device.get_root_directory()))
+    with SnapshotArchive(tmp_path / "backup.zip", write=True) as archive:
+        assert archive.export("first", files) == (4, 2)
+
+    with SnapshotArchive(tmp_path / "backup.zip") as archive:
+        assert archive.snapshots == ["first"]
+        entries = list(archive.read("first"))
+        assert [(entry.path, entry.is_directory) for entry in entries] == [
+            (path, file.is_directory) for path, file in files
+        ]
+        for entry, (_, file) in zip(entries, files):
+            if entry.blob is None:
+                assert file.is_directory
+            else:
+                assert archive.read_content(entry.blob) == file.content
+
+
+def test_blobs_are_stored_once(tmp_path: Path, index: FileIndex, device: Device) -> None:
+    files = list(index.walk(device.get_root_directory()))
+    with SnapshotArchive(tmp_path / "backup.zip", write=True) as archive:
+        archive.export("first", files)
+
+    with SnapshotArchive(tmp_path / "backup.zip", write=True) as archive:
+        assert archive.export("second", files) == (4, 0)
+        assert archive.snapshots == ["first", "second"]
+        assert len(archive.blobs) == 2
+
+
+def test_snapshot_names_are_unique(tmp_path: Path) -> None:
+    with SnapshotArchive(tmp_path / "backup.zip", write=True) as archive:
+        archive.export("first", [])
+
+        with pytest.raises(SnapshotAlreadyExistsError):
+            archive.export("first", [])
+        with pytest.raises(SnapshotNotFoundError):
+            list(archive.read("second"))
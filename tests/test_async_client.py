@@ -0,0 +1,52 @@
+import asyncio
+from typing import Iterator
+
+import pytest
+
+from PyCrypCli.async_client import AsyncClient
+from PyCrypCli.models import Device
+from .conftest import DEVICE_UUID, FakeServer, connect
+
+
+@pytest.fixture
+def async_client(server: FakeServer) -> Iterator[AsyncClient]:
+    async_client = AsyncClient("ws://localhost")
+    connect(async_client.client, server)
+    yield async_client
+    async_client.client.close()
+
+
+def test_concurrent_requests(server: FakeServer, async_client: AsyncClient) -> None:
+    files = [server.add_file(DEVICE_UUID, f"file{i}", str(i), False, None) for i in range(50)]
+
+    async def run() -> list[str]:
+        responses = await asyncio.gather(
+            *(async_client.ms("device", ["file", "info"], device_uuid=DEVICE_UUID, file_uuid=f) for f in files)
+        )
+        return [response["content"] for response in responses]
+
+    assert asyncio.run(run()) == [str(i) for i in range(50)]
+
+
+def test_info(async_client: AsyncClient) -> None:
+    info = asyncio.run(async_client.info())
+    assert (info.name, info.uuid) == ("user", "user")
+
+
+def test_timeout_does_not_affect_other_requests(server: FakeServer, async_client: AsyncClient) -> None:
+    async def run() -> None:
+        server.hold()
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(async_client.info(), 0.01)
+        server.release()
+        assert (await async_client.info()).name == "user"
+
+    asyncio.run(run())
+    assert async_client.client.reader is not None and async_client.client.reader.is_alive()
+
+
+def test_models_can_be_awaited(server: FakeServer, device: Device) -> None:
+    server.powered_on = False
+
+    response = asyncio.run(device._ms_async("device", ["device", "info"], device_uuid=device.uuid))
+    assert response["powered_on"] is False
@@ -0,0 +1,97 @@
+from typing import Any
+
+import pytest
+
+from PyCrypCli import cache
+from PyCrypCli.cache import EntityCache
+from PyCrypCli.models import Device, File
+from PyCrypCli.models.model import Model
+
+
+def make_file(uuid: str, name: str = "file", content: str = "") -> File:
+    return File.parse_obj(
+        {
+            "uuid": uuid,
+            "device": "device",
+            "filename": name,
+            "content": content,
+            "is_directory": False,
+            "parent_dir_uuid": None,
+        }
+    )
+
+
+@pytest.fixture
+def now(monkeypatch: pytest.MonkeyPatch) -> list[float]:
+    clock: list[float] = [1000.0]
+    monkeypatch.setattr(cache.time, "monotonic", lambda: clock[0])
+    return clock
+
+
+def test_get_returns_cached_object() -> None:
+    entity_cache = EntityCache()
+    file = entity_cache.put(make_file("a"))
+
+    assert entity_cache.get(File, "a") is file
+    assert entity_cache.get(File, "b") is None
+    assert entity_cache.get(Device, "a") is None
+
+
+def test_entries_expire_after_ttl(now: list[float]) -> None:
+    entity_cache = EntityCache()
+    entity_cache.put(make_file("a"))
+
+    now[0] += File.cache_ttl - 1
+    assert entity_cache.get(File, "a") is not None
+    now[0] += 2
+    assert entity_cache.get(File, "a") is None
+    assert not entity_cache.entries
+
+
+def test_uncached_models_are_not_stored() -> None:
+    class Uncached(Model):
+        uuid: str
+
+    entity_cache = EntityCache()
+    obj: Any = Uncached(uuid="a")
+
+    assert entity_cache.put(obj) is obj
+    assert entity_cache.get(Uncached, "a") is None
+
+
+def test_least_recently_used_entry_is_evicted() -> None:
+    entity_cache = EntityCache(maxsize=2)
+    entity_cache.put(make_file("a"))
+    entity_cache.put(make_file("b"))
+    entity_cache.get(File, "a")
+    entity_cache.put(make_file("c"))
+
+    assert entity_cache.get(File, "a") is not None
+    assert entity_cache.get(File, "b") is None
+    assert entity_cache.get(File, "c") is not None
+
+
+def test_put_updates_cached_object_in_place(now: list[float]) -> None:
+    entity_cache = EntityCache()
+    file = entity_cache.put(make_file("a", "old", "old content"))
+
+    now[0] += File.cache_ttl - 1
+    updated = entity_cache.put(make_file("a", "new", "new content"))
+
+    assert updated is file
+    assert (file.name, file.content) == ("new", "new content")
+    now[0] += 2
+    assert entity_cache.get(File, "a") is file
+
+
+def test_invalidate() -> None:
+    entity_cache = EntityCache()
+    entity_cache.put(make_file("a"))
+    entity_cache.put(make_file("b"))
+
+    entity_cache.invalidate(File, "a")
+    assert entity_cache.get(File, "a") is None
+    assert entity_cache.get(File, "b") is not None
+
+    entity_cache.invalidate(Model)
+    assert entity_cache.get(File, "b") is None
@@ -0,0 +1,90 @@
+import time
+from threading import current_thread, Thread
+from typing import Any
+
+import pytest
+
+from PyCrypCli import exceptions
+from PyCrypCli.client import Client
+from .conftest import DEVICE_UUID, FakeServer
+
+
+def test_empty_responses_are_retried_by_the_caller(
+    monkeypatch: pytest.MonkeyPatch, server: FakeServer, client: Client
+) -> None:
+    responses: list[dict[str, Any]] = [{}, {}, {"miners": []}]
+    monkeypatch.setattr(server, "handle", lambda endpoint, data: responses.pop(0))
+    senders: list[Thread] = []
+    send = server.send
+    monkeypatch.setattr(server, "send", lambda data: senders.append(current_thread()) or send(data))
+
+    assert client.ms("service", ["miner", "list"], retry=5) == {"miners": []}
+    assert senders == [current_thread()] * 3
+
+
+def test_retries_are_limited(monkeypatch: pytest.MonkeyPatch, server: FakeServer, client: Client) -> None:
+    monkeypatch.setattr(server, "handle", lambda endpoint, data: {})
+
+    assert client.ms("service", ["miner", "list"], retry=2) == {}
+    assert len(server.requests) == 3
+
+
+def test_responses_are_matched_by_tag(server: FakeServer, client: Client) -> None:
+    files = [server.add_file(DEVICE_UUID, f"file{i}", f"content {i}", False, None) for i in range(3)]
+    server.hold()
+    futures = [client.ms_submit("device", ["file", "info"], device_uuid=DEVICE_UUID, file_uuid=f) for f in files]
+    assert not any(future.done() for future in futures)
+
+    server.release([2, 0, 1])
+    assert [future.result(timeout=1)["content"] for future in futures] == ["content 0", "content 1", "content 2"]
+
+
+def test_untagged_responses_are_matched_by_order(server: FakeServer, client: Client) -> None:
+    server.hold()
+    futures = [client.submit({"action": action}) for action in ("status", "info", "logout")]
+    server.release()
+
+    assert [future.result(timeout=1).get("action") for future in futures] == ["status", None, "logout"]
+    assert futures[1].result()["name"] == "user"
+
+
+def test_requests_are_pipelined(server: FakeServer, client: Client) -> None:
+    server.hold()
+    futures = [client.submit({"action": "status"}) for _ in range(10)]
+
+    # all requests have been sent before the first response arrives
+    assert len(server.requests) == 10
+    server.release()
+    assert all(future.result(timeout=1) == {"action": "status"} for future in futures)
+
+
+def test_failed_requests_of_a_batch_are_returned_as_exceptions(server: FakeServer, client: Client) -> None:
+    file = server.add_file(DEVICE_UUID, "file", "content", False, None)
+    requests: list[tuple[str, list[str], dict[str, Any]]] = [
+        ("device", ["file", "info"], {"device_uuid": DEVICE_UUID, "file_uuid": file_uuid})
+        for file_uuid in (file, "missing", file)
+    ]
+
+    first, missing, last = client.ms_many(requests)
+
+    assert isinstance(first, dict) and first["content"] == "content"
+    assert isinstance(missing, exceptions.FileNotFoundError)
+    assert last == first
+
+
+def test_batches_are_sent_at_once(server: FakeServer, client: Client) -> None:
+    server.add_file(DEVICE_UUID, "file", "", False, None)
+    server.hold()
+    responses: list[dict[str, Any] | Exception] = []
+    thread = Thread(
+        target=lambda: responses.extend(
+            client.ms_many([("device", ["file", "all"], {"device_uuid": DEVICE_UUID, "parent_dir_uuid": None})] * 5)
+        )
+    )
+    thread.start()
+    while len(server.requests) < 5:
+        time.sleep(0.001)
+    server.release([4, 3, 2, 1, 0])
+    thread.join(timeout=1)
+
+    assert len(responses) == 5 and all(isinstance(r, dict) and len(r["files"]) == 1 for r in responses)
@@ -0,0 +1,37 @@
+import pkgutil
+from typing import Type
+
+import pytest
+
+import PyCrypCli.commands
+from PyCrypCli.commands import make_commands
+from PyCrypCli.commands.command import Command, LazyCommand, load_module
+from PyCrypCli.commands.manifest import MANIFEST
+from PyCrypCli.context import Context
+
+COMMAND_MODULES = sorted(
+    module.name
+    for module in pkgutil.iter_modules(PyCrypCli.commands.__path__)
+    if module.name not in ("command", "manifest")
+)
+
+
+def test_every_command_module_is_in_the_manifest() -> None:
+    assert sorted(MANIFEST) == COMMAND_MODULES
+
+
+# load_module raises CommandManifestError if the registered commands differ from the manifest
+@pytest.mark.parametrize("module", COMMAND_MODULES)
+def test_manifest_matches_the_registered_commands(module: str) -> None:
+    assert len(load_module(module)) == len(MANIFEST[module])
+
+
+def test_commands_are_loaded_on_first_use() -> None:
+    commands: dict[Type[Context], dict[str, Command]] = make_commands()
+    lazy_commands: list[Command] = [cmd for context in commands.values() for cmd in context.values()]
+    assert all(isinstance(cmd, LazyCommand) and cmd.command is None for cmd in lazy_commands)
+
+    status = next(cmd for cmd in lazy_commands if cmd.name == "status")
+    assert isinstance(status, LazyCommand)
+    assert status.load().func.__module__ == "PyCrypCli.commands.status"
+    assert status.load() is status.command
@@ -0,0 +1,71 @@
+import time
+from typing import Any
+
+import pytest
+
+from PyCrypCli.commands.command import Command, COMPLETION_CACHE_TTL
+from PyCrypCli.context import DeviceContext, RootContext
+from .conftest import DEVICE_UUID, FakeServer
+
+
+@pytest.fixture
+def completer_calls() -> list[list[str]]:
+    return []
+
+
+@pytest.fixture
+def cmd(completer_calls: list[list[str]]) -> Command:
+    cmd = Command("test", lambda context, args: None, "Test", [DeviceContext], [])
+
+    @cmd.completer()
+    def completer(_: Any, args: list[str]) -> list[str]:
+        completer_calls.append(args)
+        return ["a", "b"]
+
+    return cmd
+
+
+def test_completions_are_cached_per_line(
+    context: DeviceContext, cmd: Command, completer_calls: list[list[str]]
+) -> None:
+    assert cmd.handle_completer(context, ["x"]) == ["a", "b"]
+    assert cmd.handle_completer(context, ["x"]) == ["a", "b"]
+    assert cmd.handle_completer(context, ["y"]) == ["a", "b"]
+
+    assert completer_calls == [["x"], ["y"]]
+
+
+def test_cached_completions_cannot_be_modified(context: DeviceContext, cmd: Command) -> None:
+    cmd.handle_completer(context, ["x"]).append("c")
+    assert cmd.handle_completer(context, ["x"]) == ["a", "b"]
+
+
+def test_cached_completions_expire(
+    monkeypatch: pytest.MonkeyPatch, context: DeviceContext, cmd: Command, completer_calls: list[list[str]]
+) -> None:
+    now: list[float] = [1000.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+
+    cmd.handle_completer(context, ["x"])
+    now[0] += COMPLETION_CACHE_TTL + 1
+    cmd.handle_completer(context, ["x"])
+
+    assert len(completer_calls) == 2
+
+
+def test_lazy_commands_share_the_cache_of_the_loaded_command(
+    server: FakeServer, root_context: RootContext, context: DeviceContext
+) -> None:
+    server.add_file(DEVICE_UUID, "directory", "", True, None)
+    cd = context.get_commands()["cd"]
+
+    assert cd.handle_completer(context, ["d"]) == ["directory/\0"]
+    requests = len(server.requests)
+    assert cd.handle_completer(context, ["d"]) == ["directory/\0"]
+    assert len(server.requests) == requests
+
+    # the main loop clears the caches of the registered (lazy) commands after every command
+    cd.completion_cache.clear()
+    server.add_file(DEVICE_UUID, "docs", "", True, None)
+    context.file_index.invalidate()
+    assert cd.handle_completer(context, ["d"]) == ["directory/\0", "docs/\0"]
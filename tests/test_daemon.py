@@ -0,0 +1,58 @@
+from pathlib import Path
+from threading import Thread
+from typing import Iterator
+
+import pytest
+
+from PyCrypCli.context import RootContext
+from PyCrypCli.daemon import Daemon, DaemonClient, run_remote_script
+from .conftest import DEVICE_UUID
+
+CONNECT = f"device connect {DEVICE_UUID}"
+
+
+@pytest.fixture
+def daemon(tmp_path: Path, root_context: RootContext) -> Iterator[Daemon]:
+    # like `pycrypcli --daemon`, the daemon starts in the main context
+    root_context.close()
+    daemon = Daemon(tmp_path / "daemon.sock", root_context)
+    thread = Thread(target=daemon.serve_forever, daemon=True)
+    thread.start()
+    yield daemon
+    daemon.shutdown()
+    daemon.server_close()
+    thread.join()
+
+
+def test_connections_have_their_own_context_stack(daemon: Daemon) -> None:
+    first, second = DaemonClient(daemon.path), DaemonClient(daemon.path)
+    try:
+        assert first.command(CONNECT)[0] and second.command(CONNECT)[0]
+        assert first.command("mkdir test") == (True, "")
+        assert first.command("cd test")[0]
+        assert first.command("pwd") == (True, "/test\n")
+        assert second.command("pwd") == (True, "/\n")
+    finally:
+        first.close()
+        second.close()
+
+
+def test_exit_only_closes_the_connection(daemon: Daemon, root_context: RootContext) -> None:
+    assert run_remote_script(daemon.path, [CONNECT, "exit", "exit", "device connect nope"]) == 0
+
+    client = DaemonClient(daemon.path)
+    try:
+        assert client.command(CONNECT)[0]
+        # leaving the device context does not end the connection
+        assert client.command("exit")[0] and not client.closed
+        assert client.command("quit")[0] and client.closed
+    finally:
+        client.close()
+
+    assert root_context.client.logged_in
+    client = DaemonClient(daemon.path)
+    try:
+        assert client.command(CONNECT)[0]
+        assert client.command("pwd") == (True, "/\n")
+    finally:
+        client.close()
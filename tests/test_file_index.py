@@ -0,0 +1,124 @@
+import pytest
+
+from PyCrypCli.file_index import FileIndex
+from PyCrypCli.models import Device
+from .conftest import DEVICE_UUID, FakeServer
+
+
+@pytest.fixture
+def index(server: FakeServer, device: Device) -> FileIndex:
+    home = server.add_file(DEVICE_UUID, "home", "", True, None)
+    user = server.add_file(DEVICE_UUID, "user", "", True, home)
+    server.add_file(DEVICE_UUID, "notes.txt", "notes", False, user)
+    server.add_file(DEVICE_UUID, ".hidden.txt", "hidden", False, user)
+    docs = server.add_file(DEVICE_UUID, "docs", "", True, user)
+    server.add_file(DEVICE_UUID, "readme.txt", "readme", False, docs)
+    server.add_file(DEVICE_UUID, "readme.md", "readme", False, docs)
+    server.add_file(DEVICE_UUID, "etc", "", True, None)
+    return FileIndex(device)
+
+
+def test_resolve(index: FileIndex) -> None:
+    user = index.resolve("/home/user")
+    assert user is not None and user.name == "user"
+
+    notes = index.resolve("docs/../notes.txt", user)
+    assert notes is not None and notes.content == "notes"
+
+    root = index.resolve("/home/user/../..")
+    assert root is not None and root.is_root_directory
+    assert index.resolve("../../..", user) == root
+
+    assert index.resolve("/home/missing") is None
+    assert index.resolve("/etc", user) is not None
+
+
+def test_listings_are_cached(server: FakeServer, index: FileIndex) -> None:
+    index.resolve("/home/user/docs/readme.txt")
+    requests = len(server.requests)
+
+    assert index.resolve("/home/user/docs/readme.md") is not None
+    assert index.resolve("/home/user/notes.txt") is not None
+    assert len(server.requests) == requests
+
+
+def test_glob(index: FileIndex) -> None:
+    user = index.resolve("/home/user")
+
+    assert [path for path, _ in index.glob("*.txt", user)] == ["notes.txt"]
+    assert [path for path, _ in index.glob(".*", user)] == [".hidden.txt"]
+    assert [path for path, _ in index.glob("/home/*/docs/readme.*")] == [
+        "/home/user/docs/readme.md",
+        "/home/user/docs/readme.txt",
+    ]
+    assert sorted(path for path, _ in index.glob("**/*.txt", user)) == ["docs/readme.txt", "notes.txt"]
+    assert [path for path, _ in index.glob("docs/../*.txt", user)] == ["docs/../notes.txt"]
+    assert [path for path, _ in index.glob("notes.txt", user)] == ["notes.txt"]
+    assert index.glob("*.py", user) == []
+    assert index.glob("missing", user) == []
+
+
+def test_glob_returns_each_file_once(index: FileIndex) -> None:
+    matches = index.glob("/home/**/**")
+    assert len(matches) == len({file.uuid for _, file in matches})
+
+
+def test_is_inside(index: FileIndex) -> None:
+    home = index.resolve("/home")
+    readme = index.resolve("/home/user/docs/readme.txt")
+    etc = index.resolve("/etc")
+    assert home is not None and readme is not None and etc is not None
+
+    assert index.is_inside(readme.uuid, home.uuid)
+    assert index.is_inside(home.uuid, home.uuid)
+    assert index.is_inside(readme.uuid, None)
+    assert not index.is_inside(readme.uuid, etc.uuid)
+    assert not index.is_inside(home.uuid, readme.parent_dir_uuid)
+
+
+def test_invalidate(server: FakeServer, index: FileIndex) -> None:
+    user = index.resolve("/home/user")
+    assert user is not None and user.uuid is not None
+    assert index.resolve("new.txt", user) is None
+
+    server.add_file(DEVICE_UUID, "new.txt", "", False, user.uuid)
+    assert index.resolve("new.txt", user) is None
+
+    index.invalidate()
+    assert index.resolve("new.txt", user) is not None
+
+
+def test_prefetch_from_before_invalidate_is_discarded(server: FakeServer, index: FileIndex) -> None:
+    index.prefetch([None], recursive=True)
+    index.invalidate()
+    server.add_file(DEVICE_UUID, "var", "", True, None)
+
+    assert index.resolve("/var") is not None
+    assert not index.pending and index.in_flight == 0
+
+
+def test_glob_without_matches_is_a_literal_path(server: FakeServer, index: FileIndex) -> None:
+    user = index.resolve("/home/user")
+    assert user is not None and user.uuid is not None
+    server.add_file(DEVICE_UUID, "a[1].txt", "", False, user.uuid)
+    server.add_file(DEVICE_UUID, "what?", "", False, user.uuid)
+    index.invalidate()
+
+    assert [path for path, _ in index.glob("a[1].txt", user)] == ["a[1].txt"]
+    assert [path for path, _ in index.glob("/home/user/what?")] == ["/home/user/what?"]
+    assert index.glob("b[1].txt", user) == []
+
+
+def test_glob_escaped_characters_are_literal(server: FakeServer, index: FileIndex) -> None:
+    user = index.resolve("/home/user")
+    assert user is not None and user.uuid is not None
+    server.add_file(DEVICE_UUID, "a[1].txt", "", False, user.uuid)
+    server.add_file(DEVICE_UUID, "a1.txt", "", False, user.uuid)
+    server.add_file(DEVICE_UUID, "*", "", False, user.uuid)
+    index.invalidate()
+
+    assert [path for path, _ in index.glob("a[1].txt", user)] == ["a1.txt"]
+    assert [path for path, _ in index.glob("a\\[1\\].txt", user)] == ["a[1].txt"]
+    assert [path for path, _ in index.glob("a\\[*", user)] == ["a[1].txt"]
+    assert [path for path, _ in index.glob("\\*", user)] == ["*"]
+    assert [path for path, _ in index.glob("../*/\\*", user)] == ["../user/*"]
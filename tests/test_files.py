@@ -0,0 +1,112 @@
+import pytest
+
+from PyCrypCli.context import DeviceContext
+from PyCrypCli.script import ScriptRunner
+from .conftest import DEVICE_UUID, FakeServer
+
+
+def names(server: FakeServer) -> dict[str, str]:
+    return {f["filename"]: f["content"] for f in server.files.values() if f["device"] == DEVICE_UUID}
+
+
+def test_touch_with_glob_characters_creates_literal_file(
+    capsys: pytest.CaptureFixture[str], server: FakeServer, script: ScriptRunner
+) -> None:
+    assert script.execute("touch a[1].txt first")
+    assert script.execute("touch a\\[2\\].txt second")
+    assert names(server) == {"a[1].txt": "first", "a[2].txt": "second"}
+
+    assert script.execute("touch a[1].txt changed")
+    assert script.execute("touch a* all")
+    assert names(server) == {"a[1].txt": "all", "a[2].txt": "all"}
+    assert "error" not in capsys.readouterr().out.lower()
+
+
+def test_files_with_glob_characters_can_be_escaped(
+    server: FakeServer, context: DeviceContext, script: ScriptRunner
+) -> None:
+    server.add_file(DEVICE_UUID, "a[1].txt", "", False, None)
+    server.add_file(DEVICE_UUID, "a1.txt", "", False, None)
+
+    assert script.execute("cat a\\[1\\].txt")
+    assert script.execute("mv a[1].txt b.txt")
+    assert set(names(server)) == {"a[1].txt", "b.txt"}
+    assert script.execute("mv a\\[1\\].txt c.txt")
+    assert set(names(server)) == {"b.txt", "c.txt"}
+
+
+def test_cat_is_not_paged_in_script_mode(
+    monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str], server: FakeServer, script: ScriptRunner
+) -> None:
+    content = "\n".join(map(str, range(1000)))
+    server.add_file(DEVICE_UUID, "long", content, False, None)
+    monkeypatch.setattr("sys.stdout.isatty", lambda: True)
+    capsys.readouterr()
+
+    assert script.execute("cat long")
+    assert capsys.readouterr().out == content + "\n"
+
+
+def test_cp_and_mv_several_files_into_directory(server: FakeServer, script: ScriptRunner) -> None:
+    target = server.add_file(DEVICE_UUID, "target", "", True, None)
+    server.add_file(DEVICE_UUID, "a", "A", False, None)
+    server.add_file(DEVICE_UUID, "b", "B", False, None)
+
+    assert script.execute("cp a b target")
+    assert {f["filename"]: f["content"] for f in server.children(DEVICE_UUID, target)} == {"a": "A", "b": "B"}
+    assert script.execute("mv a b target/..")
+    assert script.execute("mv a b /target")
+    assert {f["filename"] for f in server.children(DEVICE_UUID, None)} == {"target"}
+    assert {f["filename"] for f in server.children(DEVICE_UUID, target)} == {"a", "b"}
+
+
+def test_several_sources_need_directory_target(
+    capsys: pytest.CaptureFixture[str], server: FakeServer, script: ScriptRunner
+) -> None:
+    server.add_file(DEVICE_UUID, "a", "A", False, None)
+    server.add_file(DEVICE_UUID, "b", "B", False, None)
+    server.add_file(DEVICE_UUID, "c", "C", False, None)
+
+    assert not script.execute("mv a b c")
+    assert "Target 'c' is not a directory." in capsys.readouterr().out
+    assert names(server) == {"a": "A", "b": "B", "c": "C"}
+
+
+def test_duplicate_destinations_are_rejected_before_replacing(
+    capsys: pytest.CaptureFixture[str], server: FakeServer, script: ScriptRunner
+) -> None:
+    target = server.add_file(DEVICE_UUID, "target", "", True, None)
+    server.add_file(DEVICE_UUID, "f", "old", False, target)
+    for name in ("x", "y"):
+        server.add_file(DEVICE_UUID, "f", name, False, server.add_file(DEVICE_UUID, name, "", True, None))
+
+    assert not script.execute("cp x/f y/f target")
+    assert "more than one file to the same destination" in capsys.readouterr().out
+    assert not script.execute("mv */f target")
+    assert [f["content"] for f in server.children(DEVICE_UUID, target)] == ["old"]
+    assert server.count("file", "delete") == 0
+
+
+def test_invalid_source_does_not_replace_files(
+    capsys: pytest.CaptureFixture[str], server: FakeServer, script: ScriptRunner
+) -> None:
+    target = server.add_file(DEVICE_UUID, "target", "", True, None)
+    server.add_file(DEVICE_UUID, "a", "old", False, target)
+    server.add_file(DEVICE_UUID, "d", "", False, target)
+    server.add_file(DEVICE_UUID, "a", "new", False, None)
+    server.add_file(DEVICE_UUID, "d", "", True, None)
+
+    assert not script.execute("cp a d target")
+    assert "Directory cannot replace a file." in capsys.readouterr().out
+    assert sorted(f["content"] for f in server.children(DEVICE_UUID, target)) == ["", "old"]
+    assert server.count("file", "delete") == 0
+
+
+def test_rm_several_files_and_globs(server: FakeServer, script: ScriptRunner) -> None:
+    for name in ("a", "b", "c.txt", "d.txt", "e"):
+        server.add_file(DEVICE_UUID, name, "", False, None)
+
+    assert script.execute("rm -f a b")
+    assert set(names(server)) == {"c.txt", "d.txt", "e"}
+    assert script.execute("rm -f *.txt")
+    assert set(names(server)) == {"e"}
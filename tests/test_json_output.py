@@ -0,0 +1,48 @@
+import json
+from typing import Any
+
+import pytest
+
+from PyCrypCli.context import RootContext
+from PyCrypCli.script import ScriptRunner
+from .conftest import DEVICE_UUID, FakeServer
+
+
+@pytest.fixture
+def run(capsys: pytest.CaptureFixture[str], root_context: RootContext, script: ScriptRunner) -> Any:
+    root_context.json_output = True
+    capsys.readouterr()
+
+    def run(line: str) -> tuple[bool, list[Any]]:
+        ok = script.execute(line)
+        return ok, [json.loads(output) for output in capsys.readouterr().out.splitlines()]
+
+    return run
+
+
+def test_results_are_printed_as_json(server: FakeServer, run: Any) -> None:
+    server.add_file(DEVICE_UUID, "notes.txt", "", False, None)
+
+    ok, output = run("find / -name *.txt")
+    assert ok
+    assert [[result["path"] for result in results] for results in output] == [["/notes.txt"]]
+
+
+def test_text_output_is_wrapped(run: Any) -> None:
+    assert run("whoami") == (True, [{"output": "user (UUID: user)\n"}])
+
+
+def test_errors_are_printed_as_json(run: Any) -> None:
+    assert run("cat missing") == (False, [{"error": "File does not exist: missing"}])
+    assert run("nope") == (False, [{"error": "Command could not be found: nope"}])
+    ok, output = run("rm")
+    assert not ok and list(output[0]) == ["error"]
+
+
+def test_notification_refreshes_are_not_printed(server: FakeServer, root_context: RootContext, run: Any) -> None:
+    root_context.client.notifications.push({"origin": "device"})
+    server.powered_on = False
+
+    ok, output = run("pwd")
+    assert not ok
+    assert output == [{"error": "This device is not powered on."}]
@@ -0,0 +1,64 @@
+from typing import Any
+
+from PyCrypCli.notifications import NotificationStream
+
+
+def test_buffer_keeps_most_recent_notifications() -> None:
+    stream = NotificationStream(maxlen=3)
+    for i in range(5):
+        stream.push({"origin": "device", "data": i})
+
+    assert len(stream) == 3
+    assert [notification["data"] for notification in stream] == [2, 3, 4]
+
+
+def test_handlers_receive_notifications_of_their_origin() -> None:
+    stream = NotificationStream()
+    received: list[dict[str, Any]] = []
+    received_device: list[dict[str, Any]] = []
+    stream.subscribe(received.append)
+    stream.subscribe(received_device.append, "device")
+
+    stream.push({"origin": "device"})
+    stream.push({"origin": "service"})
+
+    assert [notification["origin"] for notification in received] == ["device", "service"]
+    assert [notification["origin"] for notification in received_device] == ["device"]
+
+
+def test_unsubscribe() -> None:
+    stream = NotificationStream()
+    received: list[dict[str, Any]] = []
+    stream.unsubscribe(stream.subscribe(received.append))
+
+    stream.push({"origin": "device"})
+    assert not received
+
+
+def test_failing_handler_does_not_stop_others() -> None:
+    stream = NotificationStream()
+    received: list[dict[str, Any]] = []
+
+    def fail(_: dict[str, Any]) -> None:
+        raise ValueError
+
+    stream.subscribe(fail)
+    stream.subscribe(received.append)
+
+    stream.push({"origin": "device"})
+    assert len(received) == 1
+
+
+def test_subscription() -> None:
+    stream = NotificationStream()
+    with stream.listen("device", maxsize=2) as subscription:
+        for i in range(3):
+            stream.push({"origin": "device", "data": i})
+        stream.push({"origin": "service"})
+
+        assert [notification["data"] for notification in subscription.poll()] == [1, 2]
+        assert subscription.get(timeout=0) is None
+
+    stream.push({"origin": "device"})
+    assert subscription.poll() == []
+    assert not stream.handlers
@@ -0,0 +1,75 @@
+from queue import Queue
+from typing import Any
+
+import pytest
+
+from PyCrypCli.client import Client
+from PyCrypCli.reader import Reader
+from .conftest import FakeServer
+
+
+def test_pending_requests_fail_when_the_connection_is_lost(server: FakeServer, client: Client) -> None:
+    server.hold()
+    future = client.submit({"action": "status"})
+    server.close()
+
+    assert isinstance(future.exception(timeout=1), ConnectionError)
+    assert client.reader is not None
+    client.reader.join(timeout=1)
+    with pytest.raises(ConnectionError, match="Connection has been lost"):
+        client.submit({"action": "status"})
+
+
+def test_cancelled_requests_do_not_stop_the_reader(server: FakeServer, client: Client) -> None:
+    server.hold()
+    cancelled = client.submit({"action": "status"})
+    ms_cancelled = client.ms_submit("device", ["device", "info"], device_uuid="device")
+    assert cancelled.cancel() and ms_cancelled.cancel()
+    server.release()
+
+    assert client.submit({"action": "status"}).result(timeout=1) == {"action": "status"}
+    assert client.reader is not None and client.reader.is_alive()
+
+
+def test_notifications_are_pushed_to_the_stream(server: FakeServer, client: Client) -> None:
+    with client.notifications.listen("device") as subscription:
+        server.respond({"notify-id": "1", "origin": "device", "data": {}})
+        assert client.submit({"action": "status"}).result(timeout=1) == {"action": "status"}
+
+        notification = subscription.get(timeout=1)
+        assert notification is not None and notification["notify-id"] == "1"
+
+
+def test_failing_dispatch_does_not_stop_the_reader() -> None:
+    frames: Queue[dict[str, Any]] = Queue()
+    dispatched: Queue[dict[str, Any]] = Queue()
+
+    def dispatch(frame: dict[str, Any]) -> None:
+        if frame.get("fail"):
+            raise ValueError
+        dispatched.put(frame)
+
+    reader = Reader(frames.get, dispatch, lambda error: None)
+    reader.start()
+    frames.put({"fail": True})
+    frames.put({"id": 1})
+
+    assert dispatched.get(timeout=1) == {"id": 1}
+    reader.stop()
+    frames.put({})
+    reader.join(timeout=1)
+    assert not reader.is_alive()
+
+
+def test_errors_of_the_connection_are_reported_once() -> None:
+    errors: list[Exception] = []
+
+    def recv() -> dict[str, Any]:
+        raise ConnectionError
+
+    reader = Reader(recv, lambda frame: None, errors.append)
+    reader.start()
+    reader.join(timeout=1)
+
+    assert not reader.running
+    assert len(errors) == 1 and isinstance(errors[0], ConnectionError)
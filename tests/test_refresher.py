@@ -0,0 +1,76 @@
+from threading import Event, Thread
+from typing import Any, Iterator
+
+import pytest
+
+from PyCrypCli.exceptions import LoggedOutError
+from PyCrypCli.refresher import Refresher
+
+
+class FakeContext:
+    def __init__(self) -> None:
+        self.refreshes: int = 0
+        self.started: Event = Event()
+        self.proceed: Event = Event()
+        self.proceed.set()
+        self.error: Exception | None = None
+
+    def update_state(self) -> None:
+        self.started.set()
+        self.proceed.wait()
+        self.refreshes += 1
+        if self.error is not None:
+            raise self.error
+
+
+@pytest.fixture
+def refresher() -> Iterator[Refresher]:
+    refresher = Refresher()
+    refresher.start()
+    yield refresher
+    refresher.stop()
+    refresher.join(timeout=1)
+
+
+def test_wait_without_requests_returns_immediately(refresher: Refresher) -> None:
+    refresher.wait()
+
+
+def test_wait_includes_requests_made_during_a_refresh(refresher: Refresher) -> None:
+    context: Any = FakeContext()
+    context.proceed.clear()
+    refresher.request(context)
+    assert context.started.wait(timeout=1)
+
+    # the running refresh may have read the state before this request, so another one is needed
+    refresher.request(context)
+    waiter = Thread(target=refresher.wait)
+    waiter.start()
+    waiter.join(timeout=0.05)
+    assert waiter.is_alive()
+
+    context.proceed.set()
+    waiter.join(timeout=1)
+    assert not waiter.is_alive()
+    assert context.refreshes == 2
+
+
+def test_requests_are_coalesced(refresher: Refresher) -> None:
+    context: Any = FakeContext()
+    context.proceed.clear()
+    for _ in range(5):
+        refresher.request(context)
+    context.proceed.set()
+    refresher.wait()
+
+    assert context.refreshes <= 2
+
+
+def test_errors_are_raised_once_in_the_waiting_thread(refresher: Refresher) -> None:
+    context: Any = FakeContext()
+    context.error = LoggedOutError()
+    refresher.request(context)
+
+    with pytest.raises(LoggedOutError):
+        refresher.wait()
+    refresher.wait()
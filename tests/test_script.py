@@ -0,0 +1,32 @@
+import pytest
+
+from PyCrypCli.context import DeviceContext, RootContext
+from PyCrypCli.script import ScriptRunner
+from .conftest import DEVICE_UUID, FakeServer
+
+
+def test_notifications_refresh_the_context_before_the_next_command(
+    capsys: pytest.CaptureFixture[str], server: FakeServer, root_context: RootContext, script: ScriptRunner
+) -> None:
+    assert script.execute("pwd")
+    server.powered_on = False
+    assert script.execute("pwd")
+
+    root_context.client.notifications.push({"origin": "device"})
+    assert not script.execute("pwd")
+    assert capsys.readouterr().out.endswith("This device is not powered on.\n")
+    assert not isinstance(root_context.get_context(), DeviceContext)
+
+
+def test_prompts_fail_in_script_mode(
+    capsys: pytest.CaptureFixture[str], server: FakeServer, script: ScriptRunner
+) -> None:
+    server.add_file(DEVICE_UUID, "a", "", False, None)
+    server.add_file(DEVICE_UUID, "b", "", False, None)
+
+    assert not script.execute("rm a")
+    assert "Cannot ask for input in non-interactive mode" in capsys.readouterr().out
+    assert len(server.files) == 2
+
+    assert script.execute("rm -f a b")
+    assert not server.files
@@ -0,0 +1,71 @@
+import json
+from typing import Any
+
+import pytest
+
+from PyCrypCli.context import RootContext
+from PyCrypCli.script import ScriptRunner
+from .conftest import DEVICE_UUID, OTHER_DEVICE_UUID, FakeServer
+
+
+@pytest.fixture(autouse=True)
+def files(server: FakeServer) -> None:
+    home = server.add_file(DEVICE_UUID, "home", "", True, None)
+    server.add_file(DEVICE_UUID, "notes.txt", "first line\nSecret: 42\n", False, home)
+    docs = server.add_file(DEVICE_UUID, "docs", "", True, home)
+    server.add_file(DEVICE_UUID, "readme.md", "secret\n", False, docs)
+    server.add_file(DEVICE_UUID, "secret.txt", "nothing", False, None)
+    server.add_file(OTHER_DEVICE_UUID, "secret.txt", "secret", False, None)
+
+
+@pytest.fixture
+def run(capsys: pytest.CaptureFixture[str], script: ScriptRunner) -> Any:
+    capsys.readouterr()
+
+    def run(line: str) -> list[str]:
+        assert script.execute(line)
+        return capsys.readouterr().out.splitlines()
+
+    return run
+
+
+def test_find(run: Any) -> None:
+    assert run("find") == [".", "./home", "./secret.txt", "./home/notes.txt", "./home/docs", "./home/docs/readme.md"]
+    assert run("find /home -name *.md") == ["/home/docs/readme.md"]
+    assert run("find / -type d") == ["/", "/home", "/home/docs"]
+    assert run("find 22222:/ -name secret*") == ["22222:/secret.txt"]
+
+
+def test_grep(run: Any) -> None:
+    assert run("grep secret /") == ["/home/docs/readme.md:1:secret"]
+    assert run("grep -i secret /home") == ["/home/notes.txt:2:Secret: 42", "/home/docs/readme.md:1:secret"]
+    assert run("grep -l -i secret /") == ["/home/notes.txt", "/home/docs/readme.md"]
+    assert run("grep [0-9]+ 22222:/") == []
+
+
+def test_search_results_as_json(run: Any, root_context: RootContext) -> None:
+    root_context.json_output = True
+
+    assert [result["path"] for result in json.loads(run("find /home -type f")[0])] == [
+        "/home/notes.txt",
+        "/home/docs/readme.md",
+    ]
+    assert json.loads(run("grep Secret /")[0]) == [{"path": "/home/notes.txt", "line": 2, "text": "Secret: 42"}]
+
+
+def test_index_is_invalidated_by_notifications(server: FakeServer, root_context: RootContext, run: Any) -> None:
+    assert run("find / -name new") == []
+    server.add_file(DEVICE_UUID, "new", "", False, None)
+    assert run("find / -name new") == []
+
+    root_context.client.notifications.push({"origin": "device"})
+    assert run("find / -name new") == ["/new"]
+
+
+def test_listings_are_reused_between_commands(server: FakeServer, run: Any) -> None:
+    run("find /")
+    requests = len(server.requests)
+    run("grep secret /")
+    run("find /home")
+
+    assert len(server.requests) == requests
@@ -0,0 +1,29 @@
+import subprocess
+import sys
+
+from PyCrypCli.pycrypcli import COLD_START_BUDGET
+
+MEASURE = """
+import sys, time
+start = time.perf_counter()
+from PyCrypCli.pycrypcli import make_commands
+make_commands()
+print(time.perf_counter() - start, "requests" in sys.modules)
+"""
+
+
+# every run needs a new interpreter, as the import would be cached otherwise
+def measure_cold_start() -> tuple[float, bool]:
+    output: str = subprocess.run(
+        [sys.executable, "-c", MEASURE], capture_output=True, text=True, check=True
+    ).stdout.split()
+    return float(output[0]), output[1] == "True"
+
+
+def test_cold_start_is_within_budget() -> None:
+    # the fastest of a few runs, so a busy machine does not fail the test
+    assert min(measure_cold_start()[0] for _ in range(3)) < COLD_START_BUDGET
+
+
+def test_requests_is_imported_lazily() -> None:
+    assert not measure_cold_start()[1]
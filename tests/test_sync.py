@@ -0,0 +1,102 @@
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from PyCrypCli.context import RootContext
+from PyCrypCli.script import ScriptRunner
+from .conftest import DEVICE_UUID, FakeServer
+
+
+@pytest.fixture
+def run(capsys: pytest.CaptureFixture[str], root_context: RootContext, script: ScriptRunner) -> Any:
+    root_context.json_output = True
+    capsys.readouterr()
+
+    # returns the summary, skipped files are reported in the wrapped text output after it
+    def run(line: str) -> Any:
+        assert script.execute(line)
+        return json.loads(capsys.readouterr().out.splitlines()[0])
+
+    return run
+
+
+def remote_tree(server: FakeServer, parent: str | None = None) -> dict[str, Any]:
+    return {
+        f["filename"]: remote_tree(server, f["uuid"]) if f["is_directory"] else f["content"]
+        for f in server.children(DEVICE_UUID, parent)
+    }
+
+
+def local_tree(path: Path) -> dict[str, Any]:
+    return {child.name: local_tree(child) if child.is_dir() else child.read_text() for child in path.iterdir()}
+
+
+@pytest.fixture
+def remote(server: FakeServer) -> str:
+    home = server.add_file(DEVICE_UUID, "home", "", True, None)
+    server.add_file(DEVICE_UUID, "a.txt", "a", False, home)
+    docs = server.add_file(DEVICE_UUID, "docs", "", True, home)
+    server.add_file(DEVICE_UUID, "b.txt", "b", False, docs)
+    return docs
+
+
+def test_pull(tmp_path: Path, server: FakeServer, root_context: RootContext, remote: str, run: Any) -> None:
+    summary = run(f"pull /home {tmp_path}/home")
+    assert summary == {"created": 3, "updated": 0, "deleted": 0, "unchanged": 0}
+    assert local_tree(tmp_path / "home") == remote_tree(server)["home"]
+
+    server.add_file(DEVICE_UUID, "c.txt", "c", False, remote)
+    root_context.client.notifications.push({"origin": "device"})
+    (tmp_path / "home" / "a.txt").write_text("changed")
+    (tmp_path / "home" / "extra").write_text("extra")
+    summary = run(f"pull --delete /home {tmp_path}/home")
+    assert summary == {"created": 1, "updated": 1, "deleted": 1, "unchanged": 1}
+    assert local_tree(tmp_path / "home") == remote_tree(server)["home"]
+
+
+def test_pull_never_writes_outside_of_the_local_directory(tmp_path: Path, server: FakeServer, run: Any) -> None:
+    outside = tmp_path / "outside"
+    outside.mkdir()
+    (tmp_path / "home").mkdir()
+    (tmp_path / "home" / "link").symlink_to(outside, target_is_directory=True)
+
+    home = server.add_file(DEVICE_UUID, "home", "", True, None)
+    for name in ("link", "..", "a/b"):
+        directory = server.add_file(DEVICE_UUID, name, "", True, home)
+        server.add_file(DEVICE_UUID, "evil", "evil", False, directory)
+    server.add_file(DEVICE_UUID, "ok", "ok", False, home)
+
+    summary = run(f"pull /home {tmp_path}/home")
+    assert summary["created"] == 1
+    assert not list(outside.iterdir()) and not (tmp_path / "evil").exists()
+    assert (tmp_path / "home" / "ok").read_text() == "ok"
+
+
+def test_push(tmp_path: Path, server: FakeServer, remote: str, run: Any) -> None:
+    local = tmp_path / "home"
+    (local / "docs").mkdir(parents=True)
+    (local / "docs" / "b.txt").write_text("changed")
+    (local / "new").mkdir()
+    (local / "new" / "c.txt").write_text("c")
+
+    summary = run(f"push {local} /home")
+    assert summary == {"created": 2, "updated": 1, "deleted": 0, "unchanged": 0}
+    assert remote_tree(server)["home"] == {"a.txt": "a", **local_tree(local)}
+
+    summary = run(f"push --delete {local} /home")
+    assert summary == {"created": 0, "updated": 0, "deleted": 1, "unchanged": 2}
+    assert remote_tree(server)["home"] == local_tree(local)
+
+
+def test_push_type_conflicts(
+    capsys: pytest.CaptureFixture[str], tmp_path: Path, server: FakeServer, remote: str, script: ScriptRunner
+) -> None:
+    (tmp_path / "local").mkdir()
+    (tmp_path / "local" / "docs").write_text("not a directory")
+
+    assert not script.execute(f"push {tmp_path}/local /home")
+    assert "docs has a different type locally" in capsys.readouterr().out
+    assert script.execute(f"push --delete {tmp_path}/local /home")
+    assert remote_tree(server)["home"] == {"docs": "not a directory"}
@@ -0,0 +1,96 @@
+from typing import Any
+
+import pytest
+
+from PyCrypCli.exceptions import FileAlreadyExistsError, FileTypeConflictError
+from PyCrypCli.models import Device, File
+from PyCrypCli.transfer import CopyEngine
+from .conftest import DEVICE_UUID, OTHER_DEVICE_UUID, FakeServer
+
+
+@pytest.fixture
+def source(server: FakeServer, device: Device) -> File:
+    src = server.add_file(DEVICE_UUID, "src", "", True, None)
+    for i in range(3):
+        directory = server.add_file(DEVICE_UUID, f"d{i}", "", True, src)
+        for j in range(4):
+            server.add_file(DEVICE_UUID, f"f{j}", f"content {i} {j}", False, directory)
+    server.add_file(DEVICE_UUID, "top", "top", False, src)
+    return device.get_file(src)
+
+
+def tree(server: FakeServer, device: str, parent: str | None) -> dict[str, Any]:
+    return {
+        f["filename"]: tree(server, device, f["uuid"]) if f["is_directory"] else f["content"]
+        for f in server.children(device, parent)
+    }
+
+
+def record_batches(monkeypatch: pytest.MonkeyPatch) -> list[int]:
+    batches: list[int] = []
+    create_files = Device.create_files
+
+    def record(device: Device, files: list[tuple[str, str, bool, str | None]]) -> list[File | Exception]:
+        batches.append(len(files))
+        return create_files(device, files)
+
+    monkeypatch.setattr(Device, "create_files", record)
+    return batches
+
+
+def test_copy_tree(server: FakeServer, source: File, device: Device, other_device: Device) -> None:
+    progress: list[tuple[int, int]] = []
+    engine = CopyEngine(device, other_device, progress=lambda done, total: progress.append((done, total)))
+
+    created = engine.copy(source, "backup", None)
+
+    assert len(created) == engine.done == engine.total == 17
+    assert tree(server, OTHER_DEVICE_UUID, None) == {"backup": tree(server, DEVICE_UUID, None)["src"]}
+    assert progress[-1] == (17, 17)
+
+
+def test_copy_in_batches(
+    monkeypatch: pytest.MonkeyPatch, server: FakeServer, source: File, device: Device, other_device: Device
+) -> None:
+    batches = record_batches(monkeypatch)
+
+    CopyEngine(device, other_device, batch_size=5).copy(source, "backup", None)
+
+    assert batches == [1, 4, 5, 5, 2]
+    # one listing per copied directory
+    assert server.count("file", "all") == 4
+
+
+def test_resume(
+    monkeypatch: pytest.MonkeyPatch, server: FakeServer, source: File, device: Device, other_device: Device
+) -> None:
+    backup = server.add_file(OTHER_DEVICE_UUID, "backup", "", True, None)
+    d1 = server.add_file(OTHER_DEVICE_UUID, "d1", "", True, backup)
+    server.add_file(OTHER_DEVICE_UUID, "f0", "content 1 0", False, d1)
+    server.add_file(OTHER_DEVICE_UUID, "f1", "outdated", False, d1)
+    batches = record_batches(monkeypatch)
+
+    engine = CopyEngine(device, other_device, resume=True)
+    engine.copy(source, "backup", None)
+
+    assert engine.skipped == 4 and len(engine.created) == 13
+    assert sum(batches) == 13
+    assert server.count("file", "update") == 1
+    assert tree(server, OTHER_DEVICE_UUID, None) == {"backup": tree(server, DEVICE_UUID, None)["src"]}
+
+
+def test_resume_rejects_type_conflicts(server: FakeServer, source: File, device: Device, other_device: Device) -> None:
+    backup = server.add_file(OTHER_DEVICE_UUID, "backup", "", True, None)
+    server.add_file(OTHER_DEVICE_UUID, "d0", "", False, backup)
+
+    with pytest.raises(FileTypeConflictError):
+        CopyEngine(device, other_device, resume=True).copy(source, "backup", None)
+
+
+def test_existing_files_fail_without_resume(
+    server: FakeServer, source: File, device: Device, other_device: Device
+) -> None:
+    server.add_file(OTHER_DEVICE_UUID, "backup", "", True, None)
+
+    with pytest.raises(FileAlreadyExistsError):
+        CopyEngine(device, other_device).copy(source, "backup", None)
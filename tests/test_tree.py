@@ -0,0 +1,92 @@
+import json
+from concurrent.futures import Future
+from threading import current_thread, Thread
+from typing import Any
+
+import pytest
+
+from PyCrypCli import file_index
+from PyCrypCli.context import RootContext
+from PyCrypCli.file_index import FileIndex
+from PyCrypCli.models import FileInfo
+from PyCrypCli.script import ScriptRunner
+from .conftest import DEVICE_UUID, FakeServer
+
+
+@pytest.fixture(autouse=True)
+def files(server: FakeServer) -> None:
+    home = server.add_file(DEVICE_UUID, "home", "", True, None)
+    server.add_file(DEVICE_UUID, "b.txt", "12345", False, home)
+    docs = server.add_file(DEVICE_UUID, "docs", "", True, home)
+    server.add_file(DEVICE_UUID, "a.txt", "123", False, docs)
+    server.add_file(DEVICE_UUID, "empty", "", True, None)
+
+
+@pytest.fixture
+def run(capsys: pytest.CaptureFixture[str], script: ScriptRunner) -> Any:
+    capsys.readouterr()
+
+    def run(line: str) -> list[str]:
+        assert script.execute(line)
+        return capsys.readouterr().out.splitlines()
+
+    return run
+
+
+def test_tree(run: Any) -> None:
+    assert run("tree /home") == ["/home", "├── docs", "│   └── a.txt", "└── b.txt", "", "1 directories, 2 files"]
+
+
+def test_tree_as_json(run: Any, root_context: RootContext) -> None:
+    root_context.json_output = True
+
+    assert json.loads(run("tree /")[0]) == [
+        {"name": "empty", "is_directory": True, "children": []},
+        {
+            "name": "home",
+            "is_directory": True,
+            "children": [
+                {"name": "docs", "is_directory": True, "children": [{"name": "a.txt", "is_directory": False}]},
+                {"name": "b.txt", "is_directory": False},
+            ],
+        },
+    ]
+
+
+def test_du(run: Any) -> None:
+    assert [line.split() for line in run("du /")] == [
+        ["0", "files", "0", "bytes", "/empty"],
+        ["1", "files", "3", "bytes", "/home/docs"],
+        ["2", "files", "8", "bytes", "/home"],
+        ["2", "files", "8", "bytes", "/"],
+    ]
+    assert [line.split() for line in run("du -s /home")] == [["2", "files", "8", "bytes", "/home"]]
+
+
+def test_prefetched_listings_are_limited(
+    monkeypatch: pytest.MonkeyPatch, server: FakeServer, root_context: RootContext, run: Any
+) -> None:
+    parent = None
+    for depth in range(3):
+        for i in range(10):
+            directory = server.add_file(DEVICE_UUID, f"d{depth}-{i}", "", True, parent)
+        parent = directory
+    root_context.client.notifications.push({"origin": "device"})
+
+    monkeypatch.setattr(file_index, "LIST_BATCH_SIZE", 4)
+    in_flight: list[int] = []
+    submit = FileIndex.submit
+
+    def record(index: FileIndex, parent_dir_uuid: str | None, light: bool) -> Future[list[FileInfo]]:
+        in_flight.append(index.in_flight)
+        return submit(index, parent_dir_uuid, light)
+
+    monkeypatch.setattr(FileIndex, "submit", record)
+    senders: list[Thread] = []
+    send = server.send
+    monkeypatch.setattr(server, "send", lambda data: senders.append(current_thread()) or send(data))
+
+    run("tree /")
+
+    assert in_flight and max(in_flight) <= 4
+    assert root_context.client.reader not in senders